@@ -0,0 +1,61 @@
+"""
+Compares autoescaping with escaping the whole context before rendering.
+
+Pre-escaping walks every value of the context, including those the template
+never inserts; autoescape only escapes what is inserted, and every distinct
+string once per render.
+Run with: python benchmarks/bench_autoescape.py
+"""
+
+import html
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+
+TEMPLATE = (
+    "<h1>{{title}}</h1><ul>"
+    "{{#EACH rows AS row}}<li class='{{row.status}}'>{{row.name}} {{row.owner}}</li>{{/EACH}}"
+    "</ul>"
+)
+
+
+def pre_escape(value):
+    if isinstance(value, str):
+        return html.escape(value, quote=True)
+    if isinstance(value, dict):
+        return {key: pre_escape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [pre_escape(item) for item in value]
+    return value
+
+
+def main() -> None:
+    context = {
+        "title": "Tickets <open>",
+        "rows": [
+            {
+                "name": f"Ticket #{i} & co",
+                "owner": ("ada", "bob", "<eve>")[i % 3],
+                "status": ("open", "closed")[i % 2],
+                "description": "Long text that is not shown in the list. " * 10,
+            }
+            for i in range(500)
+        ],
+    }
+    print(f"{'backend':>12} {'pre-escape ms':>14} {'autoescape ms':>14}")
+    for backend in TemplateEngine.BACKENDS:
+        plain = TemplateEngine(template_string=TEMPLATE, backend=backend)
+        escaping = TemplateEngine(template_string=TEMPLATE, backend=backend, autoescape="html")
+        assert escaping.render(**context) == plain.render(**pre_escape(context))
+        number = 100
+        pre = timeit.timeit(lambda: plain.render(**pre_escape(context)), number=number)
+        auto = timeit.timeit(lambda: escaping.render(**context), number=number)
+        print(f"{backend:>12} {pre / number * 1000:>14.3f} {auto / number * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the cold start of a fresh process compiling many template files
+with and without a TemplateLoader cache directory.
+
+Run with: python benchmarks/bench_cold_start.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TEMPLATE = """<section id="{i}">
+  <h2>{{{{title}}}} {i}</h2>
+  {{{{#IF user}}}}<p>Hello {{{{user.name}}}}</p>{{{{#ELSE}}}}<a href="/login">log in</a>{{{{/IF}}}}
+  <ul>
+  {{{{#EACH items AS item}}}}
+    <li class="{{{{item.kind}}}}">{{{{item.name}}}} {{{{#IF item.price}}}}{{{{item.price}}}}{{{{/IF}}}}</li>
+  {{{{/EACH}}}}
+  </ul>
+  <footer>{{{{now()}}}}</footer>
+</section>
+"""
+
+# Runs in a fresh interpreter and prints the seconds spent loading the
+# templates, after the package has been imported
+WORKER = """
+import os, sys, time
+from py_template_engine import TemplateEngine, TemplateLoader
+start = time.perf_counter()
+loader = TemplateLoader(cache_dir=sys.argv[2] or None)
+for name in sorted(os.listdir(sys.argv[1])):
+    TemplateEngine(template_path=os.path.join(sys.argv[1], name), loader=loader)
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(templates: str, cache_dir: str) -> float:
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    output = subprocess.check_output(
+        [sys.executable, "-c", WORKER, templates, cache_dir], env=env, text=True
+    )
+    return float(output)
+
+
+def main() -> None:
+    workdir = tempfile.mkdtemp()
+    try:
+        templates = os.path.join(workdir, "templates")
+        cache_dir = os.path.join(workdir, "cache")
+        os.makedirs(templates)
+        print(f"{'templates':>10} {'no cache':>10} {'filling':>10} {'cached':>10} {'speedup':>8}")
+        for count in (100, 500):
+            for i in range(count):
+                with open(os.path.join(templates, f"t{i:04}.html"), "w") as f:
+                    f.write(TEMPLATE.format(i=i) * 5)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            plain = min(cold_start(templates, "") for _ in range(3))
+            filling = cold_start(templates, cache_dir)
+            cached = min(cold_start(templates, cache_dir) for _ in range(3))
+            print(
+                f"{count:>10} {plain * 1000:>8.0f}ms {filling * 1000:>8.0f}ms"
+                f" {cached * 1000:>8.0f}ms {plain / cached:>8.2f}"
+            )
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
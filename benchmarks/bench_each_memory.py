@@ -0,0 +1,38 @@
+"""
+Measures peak allocations of nested EACH loops as the render context grows.
+
+Loop variables are bound in the render context instead of copying it per
+item, so the peak should not depend on the number of context keys.
+Run with: python benchmarks/bench_each_memory.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+
+TEMPLATE = "{{#EACH rows AS row}}{{#EACH row.cells AS cell}}{{cell}}{{/EACH}}\n{{/EACH}}"
+
+
+def main() -> None:
+    rows = [{"cells": list(range(20))} for _ in range(500)]
+    print(f"{'keys':>8} {'backend':>12} {'peak KiB':>10} {'ms':>8}")
+    for keys in (10, 1000, 10000):
+        context = {f"extra{i}": i for i in range(keys)}
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=TEMPLATE, backend=backend)
+            tracemalloc.start()
+            start = time.perf_counter()
+            engine.render(rows=rows, **context)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{keys:>8} {backend:>12} {peak / 1024:>10.0f} {elapsed * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
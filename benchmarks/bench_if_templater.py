@@ -0,0 +1,32 @@
+"""
+Shows that IfTemplater.render grows linearly with the number of IF blocks.
+
+Run with: python benchmarks/bench_if_templater.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine.sub_engines.IfTemplater import IfTemplater  # noqa: E402
+
+BLOCK = "<p>{{#IF a}}{{#IF b}}both{{#ELSE}}only a{{/IF}}{{#ELSE}}none{{/IF}}</p>\n"
+
+
+def main() -> None:
+    templater = IfTemplater()
+    print(f"{'blocks':>8} {'seconds':>10} {'us/block':>10}")
+    for blocks in (500, 1000, 2000, 4000, 8000, 16000):
+        template = BLOCK * blocks
+        number = max(1, 20000 // blocks)
+        seconds = (
+            timeit.timeit(lambda: templater.render(template, a=True, b=False), number=number)
+            / number
+        )
+        print(f"{blocks * 2:>8} {seconds:>10.5f} {seconds / (blocks * 2) * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares serial EACH rendering with ParallelEach across worker counts.
+
+Each row calls a CPU bound function, so the process executor can use more
+than one core. Run with: python benchmarks/bench_parallel_each.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine.ParallelEach import ParallelEach  # noqa: E402
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+
+TEMPLATE = "{{#EACH rows AS row}}<tr><td>{{row.id}}</td><td>{{row.digest}}</td></tr>\n{{/EACH}}"
+
+
+class Row:
+    def __init__(self, id: int) -> None:
+        self.id = id
+
+    def __getitem__(self, key: str):
+        if key == "id":
+            return self.id
+        if key == "digest":
+            return sum(i * i for i in range(300 + self.id % 7))
+        raise KeyError(key)
+
+
+def measure(parallel, rows) -> float:
+    engine = TemplateEngine(template_string=TEMPLATE, parallel=parallel)
+    # Warm up the pool so worker start-up is not measured
+    engine.render(rows=rows[:2000])
+    start = time.perf_counter()
+    engine.render(rows=rows)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rows = [Row(i) for i in range(40000)]
+    serial = measure(None, rows)
+    print(f"cpu_count={os.cpu_count()} rows={len(rows)}")
+    print(f"{'executor':>10} {'workers':>8} {'seconds':>10} {'speedup':>8}")
+    print(f"{'serial':>10} {1:>8} {serial:>10.3f} {1.0:>8.2f}")
+    for executor in ParallelEach.EXECUTORS:
+        for workers in (1, 2, 4, 8):
+            with ParallelEach(executor, workers=workers, threshold=1000) as parallel:
+                seconds = measure(parallel, rows)
+            print(f"{executor:>10} {workers:>8} {seconds:>10.3f} {serial / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
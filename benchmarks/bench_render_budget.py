@@ -0,0 +1,43 @@
+"""
+Measures the cost of rendering with a RenderBudget.
+
+Governed renders walk the node tree with checks at node boundaries, codegen
+engines included; engines without a budget are not affected.
+Run with: python benchmarks/bench_render_budget.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine import RenderBudget  # noqa: E402
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+
+TEMPLATE = (
+    "<h1>{{title}}</h1><table>"
+    "{{#EACH rows AS row}}<tr>{{#EACH row.cells AS cell}}<td>{{cell}}</td>{{/EACH}}</tr>{{/EACH}}"
+    "</table>"
+)
+
+
+def main() -> None:
+    context = {
+        "title": "Report",
+        "rows": [{"cells": [f"{i}.{j}" for j in range(10)]} for i in range(200)],
+    }
+    budget = RenderBudget(max_output=10**7, max_depth=20, max_iterations=10**6, timeout=5)
+    print(f"{'backend':>12} {'no budget ms':>13} {'budget ms':>10}")
+    for backend in TemplateEngine.BACKENDS:
+        free = TemplateEngine(template_string=TEMPLATE, backend=backend)
+        governed = TemplateEngine(template_string=TEMPLATE, backend=backend, budget=budget)
+        assert free.render(**context) == governed.render(**context)
+        number = 100
+        plain = timeit.timeit(lambda: free.render(**context), number=number)
+        checked = timeit.timeit(lambda: governed.render(**context), number=number)
+        print(f"{backend:>12} {plain / number * 1000:>13.3f} {checked / number * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compares rendering to bytes with encoding the rendered str.
+
+render_bytes() encodes the template's text once when it is compiled, so
+only inserted values are encoded per render.
+Run with: python benchmarks/bench_render_bytes.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+
+TEMPLATE = (
+    "<html><head><title>{{title}}</title></head><body>"
+    + "<p>Static paragraph with some text that does not change between renders.</p>" * 20
+    + "{{#EACH rows AS row}}<tr><td>{{row.name}}</td><td>{{row.value}}</td></tr>{{/EACH}}"
+    + "</body></html>"
+)
+
+
+def main() -> None:
+    context = {
+        "title": "Report",
+        "rows": [{"name": f"row {i}", "value": i} for i in range(200)],
+    }
+    print(f"{'backend':>12} {'encode() ms':>12} {'bytes ms':>10} {'buffers ms':>11}")
+    for backend in TemplateEngine.BACKENDS:
+        engine = TemplateEngine(template_string=TEMPLATE, backend=backend)
+        assert engine.render_bytes(**context) == engine.render(**context).encode("utf-8")
+        number = 500
+        encoded = timeit.timeit(lambda: engine.render(**context).encode("utf-8"), number=number)
+        direct = timeit.timeit(lambda: engine.render_bytes(**context), number=number)
+        buffers = timeit.timeit(lambda: engine.render_buffers(**context), number=number)
+        print(
+            f"{backend:>12} {encoded / number * 1000:>12.3f}"
+            f" {direct / number * 1000:>10.3f} {buffers / number * 1000:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
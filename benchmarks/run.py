@@ -0,0 +1,252 @@
+"""
+Benchmark suite for the template engine.
+
+Every sub-engine is measured across template sizes, nesting depths and
+context sizes, through both engine backends and through the sub-engine's
+own string ``render`` ("templater"). Results are printed and can be written as
+JSON; two JSON files can be compared to flag regressions.
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --filter each --repeat 3
+    python benchmarks/run.py --compare baseline.json results.json --threshold 0.1
+
+--compare exits with status 1 when a case got slower than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Type
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from py_template_engine import __version__  # noqa: E402
+from py_template_engine.RenderError import RenderError  # noqa: E402
+from py_template_engine.sub_engines import (  # noqa: E402
+    EachTemplater,
+    FunctionTemplater,
+    IfTemplater,
+    IncludeTemplater,
+    RenderTemplater,
+    VariableTemplater,
+)
+from py_template_engine.TemplateEngine import TemplateEngine  # noqa: E402
+from py_template_engine.TemplaterInterface import TemplaterInterface  # noqa: E402
+
+# name, template, context
+Case = Tuple[str, str, Dict[str, Any]]
+
+
+def _nested(path: str, value: Any) -> Dict[str, Any]:
+    head, *rest = path.split(".")
+    return {head: _nested(".".join(rest), value) if rest else value}
+
+
+def variable_cases(workdir: str) -> Iterator[Case]:
+    for tags in (10, 100, 1000):
+        for context_size in (10, 1000):
+            context = {f"v{i}": str(i) for i in range(max(tags, context_size))}
+            template = " ".join(f"{{{{v{i}}}}}" for i in range(tags))
+            yield f"variable/tags={tags}/context={context_size}", template, context
+    for depth in (1, 4, 8):
+        path = ".".join(f"p{i}" for i in range(depth))
+        yield f"variable/path_depth={depth}", f"{{{{{path}}}}} " * 100, _nested(path, "x")
+
+
+def function_cases(workdir: str) -> Iterator[Case]:
+    for tags in (10, 100, 1000):
+        context = {f"f{i}": (lambda i=i: str(i)) for i in range(tags)}
+        template = " ".join(f"{{{{f{i}()}}}}" for i in range(tags))
+        yield f"function/tags={tags}", template, context
+    context = {"utils": {"format": {"now": lambda: "12:00"}}}
+    yield "function/path_depth=3", "{{utils.format.now()}} " * 100, context
+
+
+def if_cases(workdir: str) -> Iterator[Case]:
+    for blocks in (10, 100, 1000):
+        template = "{{#IF on}}yes{{#ELSE}}no{{/IF}} " * blocks
+        yield f"if/blocks={blocks}", template, {"on": True}
+    for depth in (1, 4, 16):
+        template = "{{#IF on}}" * depth + "x" + "{{#ELSE}}y{{/IF}}" * depth
+        yield f"if/depth={depth}", template * 50, {"on": True}
+
+
+def each_cases(workdir: str) -> Iterator[Case]:
+    for items in (10, 1000, 10000):
+        template = "{{#EACH items AS item}}<li>{{item.name}}</li>{{/EACH}}"
+        context = {"items": [{"name": i} for i in range(items)]}
+        yield f"each/items={items}", template, context
+    for depth in (1, 2, 3):
+        template = "x"
+        for level in reversed(range(depth)):
+            template = f"{{{{#EACH l{level} AS i{level}}}}}{template}{{{{/EACH}}}}"
+        context = {f"l{level}": list(range(20)) for level in range(depth)}
+        yield f"each/depth={depth}", template, context
+    for context_size in (10, 10000):
+        template = "{{#EACH items AS item}}{{item}}{{/EACH}}"
+        context = {f"extra{i}": i for i in range(context_size)}
+        context["items"] = list(range(1000))
+        yield f"each/context={context_size}", template, context
+
+
+def _write(workdir: str, name: str, content: str) -> str:
+    path = os.path.join(workdir, name)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+def include_cases(workdir: str) -> Iterator[Case]:
+    for size in (100, 10000):
+        path = _write(workdir, f"include_{size}.html", "x" * size)
+        for tags in (1, 10, 100):
+            yield f"include/tags={tags}/size={size}", f"{{{{#INCLUDE {path}}}}}" * tags, {}
+
+
+def render_cases(workdir: str) -> Iterator[Case]:
+    path = _write(workdir, "render.html", "<p>{{title}} {{#IF on}}{{body}}{{/IF}}</p>")
+    for tags in (1, 10, 100):
+        context = {"title": "T", "on": True, "body": "B"}
+        yield f"render/tags={tags}", f"{{{{#RENDER {path}}}}}" * tags, context
+    for depth in (1, 4, 8):
+        path = _write(workdir, f"render_0_{depth}.html", "{{leaf}}")
+        for level in range(1, depth):
+            path = _write(workdir, f"render_{level}_{depth}.html", f"<{level}>{{{{#RENDER {path}}}}}")
+        yield f"render/depth={depth}", f"{{{{#RENDER {path}}}}}", {"leaf": "x"}
+
+
+SUITES: List[Tuple[Type[TemplaterInterface], Callable[[str], Iterator[Case]]]] = [
+    (VariableTemplater, variable_cases),
+    (FunctionTemplater, function_cases),
+    (IfTemplater, if_cases),
+    (EachTemplater, each_cases),
+    (IncludeTemplater, include_cases),
+    (RenderTemplater, render_cases),
+]
+MODES = TemplateEngine.BACKENDS + ("templater",)
+
+
+def measure(function: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Time ``function``, calling it often enough per sample to last ``min_time``."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return {"min": min(samples), "median": statistics.median(samples), "number": number}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    workdir = tempfile.mkdtemp()
+    try:
+        for templater_class, suite in SUITES:
+            for name, template, context in suite(workdir):
+                for mode in args.mode:
+                    case = f"{name}/{mode}"
+                    if args.filter and args.filter not in case:
+                        continue
+                    start = time.perf_counter()
+                    if mode == "templater":
+                        templater = templater_class()
+                        render = lambda: templater.render(template, **context)  # noqa: E731
+                    else:
+                        engine = TemplateEngine(template_string=template, backend=mode)
+                        render = lambda: engine.render(**context)  # noqa: E731
+                    compile_time = time.perf_counter() - start
+                    try:
+                        result = measure(render, args.repeat, args.min_time)
+                    except RenderError as e:
+                        # The string pipeline cannot pair nested EACH blocks
+                        print(f"{case:<50} {'skipped':>12} ({e})")
+                        continue
+                    result["compile"] = compile_time
+                    results[case] = result
+                    print(f"{case:<50} {result['min'] * 1e6:>12.1f} us")
+    finally:
+        shutil.rmtree(workdir)
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'case':<50} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for case in sorted(set(baseline) & set(current)):
+        before, after = baseline[case]["min"], current[case]["min"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{case:<50} {before * 1e6:>12.1f} {after * 1e6:>12.1f} {change:>+8.1%}{flag}")
+    for case in sorted(set(baseline) ^ set(current)):
+        print(f"{case:<50} only in {'baseline' if case in baseline else 'current'}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=MODES,
+        help="engine backend or 'templater' to measure, may be repeated (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="minimum seconds per sample"
+    )
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="slowdown flagged as regression (0.1 = 10%%)"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    args.mode = args.mode or list(MODES)
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+from typing import Any, Dict
+
+from py_template_engine.RenderError import RenderError
+
+
+class BudgetExceeded(RenderError):
+    """Raised when a render goes over a limit of its RenderBudget.
+
+    ``limit`` names the limit and ``stats`` holds what the render had used
+    when it was stopped.
+    """
+
+    def __init__(self, limit: str, stats: Dict[str, Any]) -> None:
+        super().__init__(f"Render budget exceeded: {limit} ({stats})")
+        self.limit = limit
+        self.stats = stats
+
+    def __reduce__(self) -> Any:
+        return (type(self), (self.limit, self.stats))
@@ -0,0 +1,300 @@
+import codecs
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .nodes.EachNode import EachNode
+from .nodes.FunctionNode import FunctionNode
+from .nodes.IfNode import IfNode, trim_output
+from .nodes.IncludeNode import IncludeNode
+from .nodes.LoopScope import LoopScope
+from .nodes.Node import Node
+from .nodes.RenderNode import RenderNode
+from .nodes.TextNode import TextNode
+from .nodes.VariableNode import VariableNode
+from .Escaper import Escaper
+from .Memo import call
+from .PathAccessor import PathAccessor, resolve, resolve_expression
+
+RenderFunction = Callable[[Dict[str, Any]], str]
+BuffersFunction = Callable[[Dict[str, Any]], List[bytes]]
+
+
+class CodeGenerator:
+    """Turns a compiled node tree into the source of a Python render function.
+
+    The generated ``render(ctx)`` appends to a single list and joins it once.
+    Loop variables become local variables, so lookups below an EACH do not go
+    through a copied context. INCLUDE and RENDER files that were compiled
+    with the template are inlined. Nodes without a dedicated translation are
+    called through their own ``render`` method.
+
+    With an ``encoding`` the function returns the list of encoded buffers
+    instead: text is encoded here, once, and only inserted values are encoded
+    when rendering.
+    """
+
+    def __init__(self, function_name: str = "render", encoding: Optional[str] = None) -> None:
+        self.function_name = function_name
+        self.encoding = encoding
+
+    def generate(self, nodes: Sequence[Node]) -> Tuple[str, Dict[str, Any]]:
+        """Return the function source and the globals it needs."""
+        self._lines: List[str] = []
+        self._globals: Dict[str, Any] = {
+            "_resolve": resolve,
+            "_LoopScope": LoopScope,
+            "_call": call,
+            "_trim": trim_output,
+        }
+        self._counter = 0
+
+        self._emit(0, f"def {self.function_name}(ctx):")
+        self._emit(1, "_out = []")
+        self._emit(1, "_append = _out.append")
+        self._nodes(nodes, 1, "ctx", {})
+        self._emit(1, "return _out" if self.encoding else 'return "".join(_out)')
+        return "\n".join(self._lines) + "\n", self._globals
+
+    def compile(self, nodes: Sequence[Node]) -> RenderFunction:
+        function: RenderFunction = self._compile(nodes)
+        return function
+
+    def compile_buffers(self, nodes: Sequence[Node]) -> BuffersFunction:
+        """compile() for a generator with an ``encoding``."""
+        if not self.encoding:
+            raise ValueError("Rendering buffers needs an encoding")
+        function: BuffersFunction = self._compile(nodes)
+        return function
+
+    def _compile(self, nodes: Sequence[Node]) -> Any:
+        source, namespace = self.generate(nodes)
+        code = compile(source, f"<template {self.function_name}>", "exec")
+        exec(code, namespace)
+        return namespace[self.function_name]
+
+    def _emit(self, indent: int, line: str) -> None:
+        self._lines.append("    " * indent + line)
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"_{prefix}{self._counter}"
+
+    def _global(self, prefix: str, value: Any) -> str:
+        name = self._name(prefix)
+        self._globals[name] = value
+        return name
+
+    def _nodes(
+        self, nodes: Sequence[Node], indent: int, ctx: str, scope: Dict[str, str]
+    ) -> None:
+        if not nodes:
+            self._emit(indent, "pass")
+        for node in nodes:
+            self._node(node, indent, ctx, scope)
+
+    def _node(self, node: Node, indent: int, ctx: str, scope: Dict[str, str]) -> None:
+        if isinstance(node, TextNode):
+            text = node.text.encode(self.encoding) if self.encoding else node.text
+            self._emit(indent, f"_append({text!r})")
+        elif isinstance(node, VariableNode):
+            self._variable(node, indent, ctx, scope)
+        elif isinstance(node, FunctionNode):
+            self._function(node, indent, ctx, scope)
+        elif isinstance(node, IfNode):
+            self._if(node, indent, ctx, scope)
+        elif isinstance(node, EachNode) and node.templater.parallel is None:
+            self._each(node, indent, ctx, scope)
+        elif isinstance(node, IncludeNode) and node.body is not None:
+            self._nodes(node.body, indent, ctx, scope)
+        elif isinstance(node, RenderNode) and node.target is not None:
+            self._nodes(node.target, indent, ctx, scope)
+        else:
+            self._generic(node, indent, ctx)
+
+    def _generic(self, node: Node, indent: int, ctx: str) -> None:
+        name = self._global("n", node)
+        if not self.encoding:
+            self._emit(indent, f"{name}.render({ctx}, _out)")
+            return
+        rendered = self._name("r")
+        self._emit(indent, f"{rendered} = []")
+        self._emit(indent, f"{name}.render({ctx}, {rendered})")
+        joined = f'"".join({rendered})'
+        self._emit(indent, f"_append({self._encode(joined)})")
+
+    def _encode(self, value: str) -> str:
+        """The expression for the str ``value`` as it is appended to the output."""
+        if not self.encoding:
+            return value
+        if codecs.lookup(self.encoding).name == "utf-8":
+            # The default codec skips the lookup of the encoding by name
+            return f"{value}.encode()"
+        return f"{value}.encode({self.encoding!r})"
+
+    def _on_error(self, indent: int, templater: Any, arguments: Tuple[str, ...]) -> None:
+        """Emit the handling of the lookup error ``_e``."""
+        call = ", ".join([*map(repr, arguments), "_e"])
+        fallback = f"{self._global('t', templater)}.on_error({call})"
+        self._emit(indent, f"_append({self._encode(fallback)})")
+
+    def _lookup(
+        self,
+        target: str,
+        accessor: PathAccessor,
+        indent: int,
+        ctx: str,
+        scope: Dict[str, str],
+    ) -> None:
+        """Emit the statements that store the value of ``accessor`` in ``target``."""
+        head = accessor.head
+        value = scope[head] if head in scope else f"{ctx}[{head!r}]"
+        self._emit(indent, f"{target} = {value}")
+        for part in accessor.rest:
+            self._emit(indent, f"{target} = {resolve_expression(target, part)}")
+
+    def _insert(self, indent: int, value: str, templater: Any) -> None:
+        if templater.escape is not None:
+            text = f"{self._escaper(templater.escape)}({value})"
+        elif self.encoding:
+            text = f"({value} if type({value}) is str else str({value}))"
+        else:
+            text = f"{value} if type({value}) is str else str({value})"
+        self._emit(indent, f"_append({self._encode(text)})")
+
+    def _escaper(self, escaper: Escaper) -> str:
+        """The global name of ``escaper`` in the generated code."""
+        for name, value in self._globals.items():
+            if value is escaper:
+                return name
+        return self._global("esc", escaper)
+
+    def _variable(
+        self, node: VariableNode, indent: int, ctx: str, scope: Dict[str, str]
+    ) -> None:
+        value = self._name("v")
+        self._emit(indent, "try:")
+        self._lookup(value, node.accessor, indent + 1, ctx, scope)
+        self._emit(indent, "except KeyError as _e:")
+        self._on_error(indent + 1, node.templater, (node.name,))
+        self._emit(indent, "else:")
+        self._insert(indent + 1, value, node.templater)
+
+    def _function(
+        self, node: FunctionNode, indent: int, ctx: str, scope: Dict[str, str]
+    ) -> None:
+        value = self._name("v")
+        self._emit(indent, "try:")
+        self._lookup(value, node.accessor, indent + 1, ctx, scope)
+        self._emit(indent + 1, f"{value} = _call({value}, {node.templater.memoize!r})")
+        self._emit(indent, "except (KeyError, TypeError) as _e:")
+        self._on_error(indent + 1, node.templater, (node.name,))
+        self._emit(indent, "else:")
+        self._insert(indent + 1, value, node.templater)
+
+    def _if(
+        self,
+        node: IfNode,
+        indent: int,
+        ctx: str,
+        scope: Dict[str, str],
+        marked: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        value = self._name("v")
+        self._emit(indent, "try:")
+        self._lookup(value, node.accessor, indent + 1, ctx, scope)
+        self._emit(indent, "except (KeyError, TypeError):")
+        self._emit(indent + 1, f"{value} = False")
+        self._emit(indent, f"if {value}:")
+        self._branch(node, node.body, indent + 1, ctx, scope, marked)
+        if node.else_body:
+            self._emit(indent, "else:")
+            self._branch(node, node.else_body, indent + 1, ctx, scope, marked)
+
+    def _branch(
+        self,
+        node: IfNode,
+        branch: Sequence[Node],
+        indent: int,
+        ctx: str,
+        scope: Dict[str, str],
+        marked: Optional[Tuple[str, str]],
+    ) -> None:
+        """Emit an IF branch; ``marked`` names the lists of an enclosing IF
+        trimming its branch, see Node.render_marked()."""
+        if marked is None and not node.trim:
+            self._nodes(branch, indent, ctx, scope)
+            return
+        if not branch:
+            self._emit(indent, "pass")
+            return
+        if marked is None:
+            marks, values = self._name("marks"), self._name("values")
+            self._emit(indent, f"{marks} = [len(_out)]")
+            self._emit(indent, f"{values} = []")
+            trimmed = f"{marks}, {values}"
+        else:
+            marks, values = marked
+            if node.trim:
+                start = self._name("start")
+                self._emit(indent, f"{start} = len({values})")
+                trimmed = f"{marks}[{start}:], {values}[{start}:]"
+        for child in branch:
+            self._marked(child, indent, ctx, scope, (marks, values))
+        if node.trim:
+            self._emit(indent, f"_trim(_out, {trimmed})")
+
+    def _marked(
+        self, node: Node, indent: int, ctx: str, scope: Dict[str, str], marked: Tuple[str, str]
+    ) -> None:
+        if isinstance(node, IfNode):
+            self._if(node, indent, ctx, scope, marked)
+        elif isinstance(node, IncludeNode) and node.body is not None:
+            for child in node.body:
+                self._marked(child, indent, ctx, scope, marked)
+        else:
+            marks, values = marked
+            self._node(node, indent, ctx, scope)
+            self._emit(indent, f"{marks}.append(len(_out))")
+            self._emit(indent, f"{values}.append({node.inserts_value!r})")
+
+    def _each(self, node: EachNode, indent: int, ctx: str, scope: Dict[str, str]) -> None:
+        items = self._name("items")
+        item = self._name("item")
+        self._emit(indent, "try:")
+        self._lookup(items, node.accessor, indent + 1, ctx, scope)
+        self._emit(indent, "except (KeyError, TypeError) as _e:")
+        self._on_error(indent + 1, node.templater, (node.list_name, node.source))
+        self._emit(indent, "else:")
+        indent += 1
+
+        body_scope = {**scope, node.item_name: item}
+        if self._needs_context(node.body):
+            # Nodes rendered through their own render() see the loop variable
+            # in the context, exactly like the interpreter provides it.
+            self._emit(indent, f"with _LoopScope({ctx}, {node.item_name!r}):")
+            self._emit(indent + 1, f"for {item} in {items}:")
+            self._emit(indent + 2, f"{ctx}[{node.item_name!r}] = {item}")
+            self._nodes(node.body, indent + 2, ctx, body_scope)
+        else:
+            self._emit(indent, f"for {item} in {items}:")
+            self._nodes(node.body, indent + 1, ctx, body_scope)
+
+    @classmethod
+    def _needs_context(cls, nodes: Sequence[Node]) -> bool:
+        for node in nodes:
+            if isinstance(node, IfNode):
+                if cls._needs_context(node.body) or cls._needs_context(
+                    node.else_body or ()
+                ):
+                    return True
+            elif isinstance(node, EachNode):
+                if node.templater.parallel is not None or cls._needs_context(node.body):
+                    return True
+            elif isinstance(node, IncludeNode) and node.body is not None:
+                if cls._needs_context(node.body):
+                    return True
+            elif isinstance(node, RenderNode) and node.target is not None:
+                if cls._needs_context(node.target):
+                    return True
+            elif not isinstance(node, (TextNode, VariableNode, FunctionNode)):
+                return True
+        return False
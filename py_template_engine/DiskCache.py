@@ -0,0 +1,130 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .nodes.Node import Node
+    from .TemplateParser import TemplateParser
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: Any, objects: Dict[int, Any]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._objects = objects
+
+    def persistent_id(self, obj: Any) -> Any:
+        return self._objects.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: Any, objects: Dict[Any, Any]) -> None:
+        super().__init__(file)
+        self._objects = objects
+
+    def persistent_load(self, pid: Any) -> Any:
+        try:
+            return self._objects[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}") from None
+
+
+class DiskCache:
+    """Stores compiled templates in a directory, like ``.pyc`` files.
+
+    Entries are keyed by template path, content hash, engine version and the
+    tags of the parser's templaters. The parser, its loader, templaters and
+    profiler are not stored but bound to the live objects when an entry is
+    loaded. The content hashes of the INCLUDE and RENDER files compiled into
+    an entry are stored with it, and a changed file makes the entry a miss.
+    Entries are written to a temporary file and renamed into place,
+    so processes sharing the directory never read a partial file. Unreadable
+    or unpicklable entries are treated as misses.
+    """
+
+    FORMAT = 2
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def load(
+        self, template_path: str, source: str, parser: "TemplateParser"
+    ) -> Optional[Tuple[Tuple["Node", ...], List[str]]]:
+        """Return the stored nodes and the files they were compiled from."""
+        try:
+            with open(self._file(template_path, source, parser), "rb") as file:
+                nodes, digests = _Unpickler(file, self._by_id(parser)).load()
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            TypeError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ):
+            self.misses += 1
+            return None
+        if any(parser.loader.digest(path) != digest for path, digest in digests.items()):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return nodes, list(digests)
+
+    def store(
+        self,
+        template_path: str,
+        source: str,
+        parser: "TemplateParser",
+        nodes: Tuple["Node", ...],
+    ) -> None:
+        path = self._file(template_path, source, parser)
+        loader = parser.loader
+        digests = {
+            dependency: loader.digest(dependency)
+            for dependency in loader.dependencies(template_path)
+        }
+        objects = {id(obj): pid for pid, obj in self._by_id(parser).items()}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                _Pickler(file, objects).dump((nodes, digests))
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            os.unlink(temp_path)
+            return
+        self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    @staticmethod
+    def _by_id(parser: "TemplateParser") -> Dict[Any, Any]:
+        objects: Dict[Any, Any] = {"parser": parser, "loader": parser.loader}
+        if parser.profiler is not None:
+            objects["profiler"] = parser.profiler
+        for index, templater in enumerate(parser.templaters):
+            objects[("templater", index)] = templater
+        return objects
+
+    def _file(self, template_path: str, source: str, parser: "TemplateParser") -> str:
+        from . import __version__
+
+        key = hashlib.sha256()
+        for part in (
+            str(self.FORMAT),
+            __version__,
+            "%d.%d" % sys.version_info[:2],
+            os.path.abspath(template_path),
+            hashlib.sha1(source.encode("utf-8")).hexdigest(),
+            parser.signature,
+        ):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return os.path.join(self.directory, key.hexdigest() + ".pickle")
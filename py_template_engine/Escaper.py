@@ -0,0 +1,60 @@
+import html
+from typing import Any, Callable, Dict, Union
+
+from .Lazy import Lazy
+from .Markup import Markup
+from .Memo import current_memo
+
+
+def escape_html(text: str) -> str:
+    return html.escape(text, quote=True)
+
+
+class Escaper:
+    """Escapes the values inserted by variables and functions.
+
+    Template text is never passed through here, it is trusted as written.
+    ``Markup`` and other objects implementing ``__html__`` are inserted as
+    they are, also when a ``Lazy`` value resolves to one. Within a render every distinct string is escaped once and then
+    served from a cache.
+    """
+
+    ESCAPERS: Dict[str, Callable[[str], str]] = {"html": escape_html}
+
+    def __init__(self, escape: Callable[[str], str]) -> None:
+        self.escape = escape
+
+    @classmethod
+    def create(cls, autoescape: Union[str, Callable[[str], str]]) -> "Escaper":
+        """An escaper for a name in ``ESCAPERS`` or for a function."""
+        if callable(autoescape):
+            return cls(autoescape)
+        try:
+            return cls(cls.ESCAPERS[autoescape])
+        except KeyError:
+            raise ValueError(
+                f"Unknown autoescape '{autoescape}', expected one of {tuple(cls.ESCAPERS)}"
+            ) from None
+
+    def __call__(self, value: Any) -> str:
+        cls = type(value)
+        if cls is Lazy:
+            # Its str() would turn a Markup value into a plain string
+            value = value.resolve()
+            cls = type(value)
+        if cls is not str:
+            if cls is Markup:
+                return value
+            if getattr(cls, "__html__", None) is not None:
+                return value.__html__()
+            value = str(value)
+        memo = current_memo()
+        if memo is None:
+            return self.escape(value)
+        cache = memo.get(self)
+        if cache is None:
+            cache = memo[self] = {}
+        escaped = cache.get(value)
+        if escaped is None:
+            escaped = cache[value] = self.escape(value)
+        return escaped
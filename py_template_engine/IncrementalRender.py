@@ -0,0 +1,144 @@
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from .Memo import memo_scope
+from .nodes.IfNode import IfNode, trim_output
+from .nodes.Node import Node
+
+if TYPE_CHECKING:
+    from .TemplateEngine import TemplateEngine
+
+
+class Region(NamedTuple):
+    """A top-level part of the output whose text changed.
+
+    ``slot`` is the position of its tag among the top-level tags, ``start``
+    its offset in the output.
+    """
+
+    slot: int
+    start: int
+    text: str
+
+
+class _Part:
+    """The kept output of a node; an IF also keeps the parts of its branch.
+
+    ``pieces`` and ``values`` split the text as Node.render_marked() does, so
+    an enclosing IF can trim it.
+    """
+
+    __slots__ = ("node", "reads", "text", "pieces", "values", "branch", "children")
+
+    def __init__(self, node: Node) -> None:
+        self.node = node
+        self.reads: Optional[FrozenSet[str]] = node.dependencies()
+        self.text = ""
+        self.pieces: List[str] = []
+        self.values: List[bool] = []
+        self.branch: Optional[Tuple[Node, ...]] = None
+        self.children: List["_Part"] = []
+
+
+class IncrementalRender:
+    """Keeps the output of a template and re-renders only what an update affects.
+
+    Every top-level node of the template is a region whose output is kept
+    together with the context keys it reads. ``update()`` re-renders the
+    regions that read one of the changed keys and reports those whose text
+    changed, so the cost follows the size of the change instead of the page.
+    IF blocks keep the output of every node in their branch, so a region
+    wrapping the page only renders the nested tags reading a changed key
+    again, unless the condition changes. Tags whose dependencies are unknown,
+    such as custom tags, are rendered on every update. Template functions are
+    only called again when their tag is.
+    """
+
+    def __init__(self, engine: "TemplateEngine", context: Dict[str, Any]) -> None:
+        if engine._nodes is None:
+            raise ValueError("Incremental rendering needs templaters that declare a tag")
+        self._nodes: List[Node] = list(engine._nodes)
+        self._static = engine._static
+        self._context = {**context, **self._static}
+        self._readers: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        with memo_scope():
+            self._parts = [self._build(node) for node in self._nodes]
+        for index, part in enumerate(self._parts):
+            if part.reads is None:
+                self._always.append(index)
+            else:
+                for name in part.reads:
+                    self._readers.setdefault(name, []).append(index)
+
+    @property
+    def output(self) -> str:
+        return "".join(part.text for part in self._parts)
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        return dict(self._context)
+
+    def update(self, **changes: Any) -> List[Region]:
+        """Apply ``changes`` to the context and return the changed regions,
+        ordered by position, with their offset in the new output."""
+        # Bound values take precedence, as in TemplateEngine.render()
+        changed = {name for name in changes if name not in self._static}
+        affected: Set[int] = set(self._always)
+        for name in changed:
+            self._context[name] = changes[name]
+            affected.update(self._readers.get(name, ()))
+
+        updated: List[int] = []
+        with memo_scope():
+            for index in sorted(affected):
+                if self._refresh(self._parts[index], changed):
+                    updated.append(index)
+        if not updated:
+            return []
+        starts = [0, *accumulate(len(part.text) for part in self._parts)]
+        return [Region(slot, starts[slot], self._parts[slot].text) for slot in updated]
+
+    def _build(self, node: Node) -> _Part:
+        part = _Part(node)
+        if isinstance(node, IfNode):
+            self._choose(part)
+        else:
+            self._render(part)
+        return part
+
+    def _refresh(self, part: _Part, changed: Set[str]) -> bool:
+        """Bring ``part`` up to date; returns whether its text changed."""
+        if part.reads is not None and part.reads.isdisjoint(changed):
+            return False
+        old = part.text
+        node = part.node
+        if not isinstance(node, IfNode):
+            self._render(part)
+        elif node.accessor.head in changed and node._branch(self._context) is not part.branch:
+            self._choose(part)
+        elif any([self._refresh(child, changed) for child in part.children]):
+            self._join(part)
+        return part.text != old
+
+    def _choose(self, part: _Part) -> None:
+        node: Any = part.node
+        part.branch = node._branch(self._context)
+        part.children = [self._build(child) for child in part.branch or ()]
+        self._join(part)
+
+    def _join(self, part: _Part) -> None:
+        part.pieces = [piece for child in part.children for piece in child.pieces]
+        part.values = [value for child in part.children for value in child.values]
+        if part.pieces and part.node.trim:  # type: ignore[attr-defined]
+            # Trimmed as IfNode.render() trims its output
+            trim_output(part.pieces, list(range(len(part.pieces) + 1)), part.values)
+        part.text = "".join(part.pieces)
+
+    def _render(self, part: _Part) -> None:
+        out: List[str] = []
+        marks = [0]
+        part.values = []
+        part.node.render_marked(self._context, out, marks, part.values)
+        part.pieces = ["".join(out[start:end]) for start, end in zip(marks, marks[1:])]
+        part.text = "".join(part.pieces)
@@ -0,0 +1,34 @@
+from typing import Any, Callable, Iterator
+
+from .Memo import call
+
+
+class Lazy:
+    """A context value computed by ``provider`` when a template first reads it.
+
+    Paths resolve through it (``{{user.name}}`` with ``user=Lazy(load_user)``)
+    and it renders, tests and iterates like its value, so values that only an
+    untaken IF branch reads are never computed. Within a render the value is
+    computed once; outside of one, every access calls the provider.
+    """
+
+    __slots__ = ("provider",)
+
+    def __init__(self, provider: Callable[[], Any]) -> None:
+        self.provider = provider
+
+    def resolve(self) -> Any:
+        return call(self.provider, True)
+
+    def __str__(self) -> str:
+        value = self.resolve()
+        return value if type(value) is str else str(value)
+
+    def __bool__(self) -> bool:
+        return bool(self.resolve())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.resolve())
+
+    def __repr__(self) -> str:
+        return f"Lazy({self.provider!r})"
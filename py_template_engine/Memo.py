@@ -0,0 +1,68 @@
+import inspect
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Results of the functions called during the current render, by callable
+_memo: ContextVar[Optional[Dict[Any, Any]]] = ContextVar("py_template_engine_memo", default=None)
+
+
+def pure(function: F) -> F:
+    """Mark a template function as pure: within one render it is called once
+    and its result reused, even if the engine does not memoize."""
+    function.__template_pure__ = True  # type: ignore[attr-defined]
+    return function
+
+
+@contextmanager
+def memo_scope(memo: Optional[Dict[Any, Any]] = None) -> Iterator[None]:
+    """Collect memoized results, in ``memo`` if given, until the block ends;
+    nested scopes share the outer one."""
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set({} if memo is None else memo)
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def stream_context() -> Context:
+    """A copy of the current context with a memo, for a render whose chunks
+    are produced through ``Context.run()`` so the code consuming them runs
+    outside of the render."""
+    context = copy_context()
+    if _memo.get() is None:
+        context.run(_memo.set, {})
+    return context
+
+
+def current_memo() -> Optional[Dict[Any, Any]]:
+    """The memo of the current render, None outside of one."""
+    return _memo.get()
+
+
+def call(function: Callable[[], Any], memoize: bool) -> Any:
+    """Call a template function, reusing its result within the current render
+    when ``memoize`` is set or the function is marked ``pure``.
+
+    Results are keyed by the callable, so a bound method is cached per
+    instance. Awaitables are never reused since they can be awaited once.
+    """
+    memo = _memo.get()
+    if memo is None or not (memoize or getattr(function, "__template_pure__", False)):
+        return function()
+    try:
+        return memo[function]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable callables are not memoized
+        return function()
+    value = function()
+    if not inspect.isawaitable(value):
+        memo[function] = value
+    return value
@@ -0,0 +1,186 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .CodeGenerator import CodeGenerator
+from .nodes.CacheNode import CacheNode
+from .nodes.EachNode import EachNode
+from .nodes.IncludeNode import IncludeNode
+from .nodes.Node import Node
+from .nodes.RenderNode import RenderNode
+from .TemplateParser import TemplateParser
+from .TemplateSyntaxError import TemplateSyntaxError
+
+_ERROR_MARKER = "\0error\0"
+
+
+class _MarkerError(KeyError):
+    def __str__(self) -> str:
+        return _ERROR_MARKER
+
+
+class ModuleGenerator(CodeGenerator):
+    """Compiles template files into the source of one importable module.
+
+    Every added template becomes a ``render_<name>(ctx)`` function. INCLUDE
+    files are inlined and RENDER targets become calls to their own function,
+    so the module never reads template files or uses the parser. Error
+    handling is baked in from each templater's ``on_error`` at compile time.
+    CACHE blocks keep their fragments in the module's ``FRAGMENT_CACHE``, a
+    MemoryFragmentCache that can be replaced by any FragmentCache.
+    """
+
+    HEADER = (
+        "from py_template_engine.Memo import call as _call, memo_scope as _memo_scope\n"
+        "from py_template_engine.nodes.IfNode import trim_output as _trim\n"
+        "from py_template_engine.nodes.LoopScope import LoopScope as _LoopScope\n"
+        "from py_template_engine.PathAccessor import resolve as _resolve\n"
+    )
+
+    def __init__(self, parser: TemplateParser) -> None:
+        super().__init__()
+        self.parser = parser
+        self._functions: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._templates: Dict[str, str] = {}
+        self._queue: List[str] = []
+        self._imports: Set[str] = set()
+        self._caches = False
+
+    def add(self, template_path: str, name: Optional[str] = None) -> str:
+        """Queue a template, listed in ``TEMPLATES`` as ``name`` (its path by
+        default), and return the name of its render function."""
+        path = os.path.abspath(template_path)
+        if path not in self._names:
+            name = name or template_path
+            self._templates[path] = name
+            base = "render_" + re.sub(r"\W", "_", name).strip("_")
+            function_name = base
+            counter = 1
+            while function_name in self._names.values():
+                counter += 1
+                function_name = f"{base}_{counter}"
+            self._names[path] = function_name
+            self._queue.append(path)
+        return self._names[path]
+
+    @property
+    def templates(self) -> List[str]:
+        return list(self._templates.values())
+
+    def generate_module(self, docstring: str = "") -> str:
+        """Return the module source; fails on the first template that does not compile."""
+        sources: List[str] = []
+        while self._queue:
+            path = self._queue.pop(0)
+            self.function_name = self._names[path]
+            try:
+                source, _ = self.generate(self.parser.parse_file(path))
+            except TemplateSyntaxError as e:
+                raise TemplateSyntaxError(f"{path}: {e}") from e
+            sources.append(source)
+
+        lines = [f'"""{docstring}"""\n'] if docstring else []
+        lines.append(self.HEADER + "".join(sorted(self._imports)))
+        if self._caches:
+            lines.append("FRAGMENT_CACHE = _MemoryFragmentCache()\n")
+        lines.extend(sources)
+        entries = "".join(
+            f"    {self._templates[path]!r}: {function_name},\n"
+            for path, function_name in self._names.items()
+        )
+        lines.append(f"TEMPLATES = {{\n{entries}}}\n")
+        lines.append(
+            # Positional-only, so any context key can be passed by name
+            "def render(template, /, **context):\n"
+            '    """Render ``template`` (a name in TEMPLATES) with ``context``."""\n'
+            "    with _memo_scope():\n"
+            "        return TEMPLATES[template](context)\n"
+        )
+        return "\n\n".join(lines)
+
+    def _node(self, node: Node, indent: int, ctx: str, scope: Dict[str, str]) -> None:
+        if isinstance(node, EachNode):
+            # Worker pools are a runtime choice, compiled loops always run serially
+            self._each(node, indent, ctx, scope)
+        elif isinstance(node, IncludeNode):
+            # A file that was missing when the template was parsed fails the build
+            body = node.body if node.body is not None else self.parser.parse_file(node.path)
+            self._nodes(body, indent, ctx, scope)
+        elif isinstance(node, RenderNode):
+            self._emit(indent, f"_append({self.add(node.path)}({ctx}))")
+        elif isinstance(node, CacheNode):
+            self._cache(node, indent, ctx, scope)
+        else:
+            super()._node(node, indent, ctx, scope)
+
+    def _cache(self, node: CacheNode, indent: int, ctx: str, scope: Dict[str, str]) -> None:
+        if not self._caches:
+            self._caches = True
+            self._imports.add(
+                "from py_template_engine.FragmentCache import"
+                " MemoryFragmentCache as _MemoryFragmentCache\n"
+            )
+        key = self._name("key")
+        fragment = self._name("fragment")
+        outer = self._name("out")
+        parts = [self._name("kv") for _ in node.accessors]
+        if parts:
+            self._emit(indent, "try:")
+            for part, accessor in zip(parts, node.accessors):
+                self._lookup(part, accessor, indent + 1, ctx, scope)
+            self._emit(indent, "except (KeyError, TypeError) as _e:")
+            # Without its key the block is rendered without the cache
+            try:
+                node.templater.on_error(node.name, node.source, _MarkerError())
+            except Exception:
+                self._on_error(indent + 1, node.templater, (node.name, node.source))
+            else:
+                self._emit(indent + 1, f"{key} = None")
+            self._emit(indent, "else:")
+            values = "".join(f", str({part})" for part in parts)
+            self._emit(indent + 1, f'{key} = "\\0".join([{node.name!r}{values}])')
+        else:
+            self._emit(indent, f"{key} = {node.name!r}")
+        self._emit(indent, f"{fragment} = None if {key} is None else FRAGMENT_CACHE.get({key})")
+        self._emit(indent, f"if {fragment} is None:")
+        # The body is rendered into an output list of its own
+        self._emit(indent + 1, f"{outer} = _out")
+        self._emit(indent + 1, "_out = []")
+        self._emit(indent + 1, "_append = _out.append")
+        self._nodes(node.body, indent + 1, ctx, scope)
+        self._emit(indent + 1, f'{fragment} = "".join(_out)')
+        self._emit(indent + 1, f"_out = {outer}")
+        self._emit(indent + 1, "_append = _out.append")
+        self._emit(indent + 1, f"if {key} is not None:")
+        self._emit(indent + 2, f"FRAGMENT_CACHE.set({key}, {fragment}, {node.ttl!r})")
+        self._emit(indent, f"_append({fragment})")
+
+    @classmethod
+    def _needs_context(cls, nodes: Sequence[Node]) -> bool:
+        # RENDER targets are separate functions that read the context
+        if any(isinstance(node, RenderNode) for node in nodes):
+            return True
+        return super()._needs_context(nodes)
+
+    def _escaper(self, escaper: Any) -> str:
+        raise ValueError("Autoescaping cannot be compiled ahead of time")
+
+    def _generic(self, node: Node, indent: int, ctx: str) -> None:
+        raise ValueError(f"{type(node).__name__} cannot be compiled ahead of time")
+
+    def _on_error(self, indent: int, templater: Any, arguments: Tuple[str, ...]) -> None:
+        try:
+            fallback = templater.on_error(*arguments, _MarkerError())
+        except Exception as error:
+            error_type = type(error)
+            self._imports.add(
+                f"from {error_type.__module__} import {error_type.__qualname__}\n"
+            )
+            prefix, _, suffix = str(error).partition(_ERROR_MARKER)
+            message = repr(prefix)
+            if _ERROR_MARKER in str(error):
+                message += " + str(_e)" + (f" + {suffix!r}" if suffix else "")
+            self._emit(indent, f"raise {error_type.__qualname__}({message}) from _e")
+        else:
+            self._emit(indent, f"_append({fallback!r})")
@@ -0,0 +1,115 @@
+import math
+import os
+import threading
+from collections.abc import Sequence, Sized
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from py_template_engine.Memo import memo_scope
+from py_template_engine.RenderBudget import current_usage
+
+if TYPE_CHECKING:
+    from py_template_engine.nodes.EachNode import EachNode
+
+
+# Set while a worker renders a chunk, so nested loops stay serial instead of
+# waiting on the pool they are running in.
+_worker = threading.local()
+
+
+def _render_chunk(node: "EachNode", context: Dict[str, Any], items: List[Any]) -> str:
+    out: List[str] = []
+    _worker.active = True
+    try:
+        # Threads share the caller's context, so each chunk binds its loop
+        # variable in a copy of its own. Process workers get a memo per chunk.
+        with memo_scope():
+            node.render_items(dict(context), items, out)
+    finally:
+        _worker.active = False
+    return "".join(out)
+
+
+class ParallelEach:
+    """Renders large EACH loops in a ``concurrent.futures`` worker pool.
+
+    Lists with at least ``threshold`` items are split into chunks that are
+    rendered by the pool's workers and concatenated in order; smaller lists
+    and iterables without a length are rendered serially. With the
+    ``"process"`` executor the loop body and the context are pickled for
+    every chunk, so they must not contain lambdas or other unpicklable values.
+
+    Thread workers render in a copy of the caller's context variables, so
+    memoized functions, Lazy values and a render budget apply as in a serial
+    loop. Process workers memoize per chunk, and a budget only counts their
+    items; its other limits are checked once the chunks are done.
+    """
+
+    EXECUTORS = ("process", "thread")
+
+    def __init__(
+        self,
+        executor: str = "process",
+        workers: Optional[int] = None,
+        threshold: int = 10000,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {self.EXECUTORS}")
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self._pool: Optional[Executor] = None
+
+    def accepts(self, items: Any) -> bool:
+        if getattr(_worker, "active", False):
+            return False
+        return isinstance(items, Sized) and len(items) >= self.threshold
+
+    def render(self, node: "EachNode", context: Dict[str, Any], items: Any) -> List[str]:
+        """Render the loop body of ``node`` once per item and return the chunk
+        outputs in order."""
+        if not isinstance(items, Sequence):
+            items = list(items)
+        chunk_size = self.chunk_size or math.ceil(len(items) / (self.workers * 4))
+        chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+        pool = self._get_pool()
+        if self.executor == "process":
+            usage = current_usage()
+            if usage is not None:
+                # Workers in other processes do not see the usage
+                usage.iterate(len(items))
+            futures = [pool.submit(_render_chunk, node, context, chunk) for chunk in chunks]
+        else:
+            futures = [
+                pool.submit(copy_context().run, _render_chunk, node, context, chunk)
+                for chunk in chunks
+            ]
+        return [future.result() for future in futures]
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ParallelEach":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The pool stays with the process that created it
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
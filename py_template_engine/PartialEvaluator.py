@@ -0,0 +1,135 @@
+import inspect
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+from .nodes.EachNode import EachNode
+from .nodes.FunctionNode import FunctionNode
+from .nodes.IfNode import IfNode, trim_output
+from .nodes.IncludeNode import IncludeNode
+from .nodes.Node import Node
+from .nodes.RenderNode import RenderNode
+from .nodes.TextNode import TextNode
+from .nodes.ValueNode import ValueNode
+from .nodes.VariableNode import VariableNode
+from .PathAccessor import PathAccessor
+
+
+class PartialEvaluator:
+    """Folds the parts of a node tree that only depend on a static context.
+
+    Variables, functions and IF conditions whose path starts at a static name
+    are evaluated once and replaced by their text or the chosen branch.
+    INCLUDE and RENDER files compiled with the template are inlined so their
+    tags are folded as well. Below an EACH the loop variable shadows a static
+    name of the same name. Lookups that fail are left to the render, where
+    their error handling applies as before.
+
+    The output does not change: folded values stay marked as values and a
+    chosen branch is trimmed as IfNode trims it, when folding or, if it has
+    dynamic tags at its edges, by keeping the IF.
+    """
+
+    def __init__(self, static: Dict[str, Any]) -> None:
+        self.static = static
+
+    def fold(self, nodes: Sequence[Node]) -> Tuple[Node, ...]:
+        return self._nodes(nodes, frozenset(), False)
+
+    def _nodes(
+        self, nodes: Sequence[Node], shadowed: FrozenSet[str], trimmed: bool
+    ) -> Tuple[Node, ...]:
+        """Fold ``nodes``; ``trimmed`` is set in IF branches, where text and
+        values are only merged with their own kind."""
+        folded: List[Node] = []
+        for node in nodes:
+            for result in self._node(node, shadowed, trimmed):
+                previous = folded[-1] if folded else None
+                if (
+                    isinstance(result, TextNode)
+                    and isinstance(previous, TextNode)
+                    and (not trimmed or type(result) is type(previous))
+                ):
+                    kind = type(result) if trimmed else TextNode
+                    folded[-1] = kind(previous.text + result.text)
+                else:
+                    folded.append(result)
+        return tuple(folded)
+
+    def _node(self, node: Node, shadowed: FrozenSet[str], trimmed: bool) -> Sequence[Node]:
+        if isinstance(node, VariableNode) and self._bound(node.accessor, shadowed):
+            try:
+                value = node.accessor.get(self.static)
+            except KeyError:
+                return (node,)
+            return (ValueNode(self._text(node, value)),)
+        if isinstance(node, FunctionNode) and self._bound(node.accessor, shadowed):
+            return self._function(node)
+        if isinstance(node, IfNode):
+            if self._bound(node.accessor, shadowed):
+                try:
+                    value = node.accessor.get(self.static)
+                except (KeyError, TypeError):
+                    value = False
+                return self._branch(node, bool(value), shadowed)
+            return (
+                IfNode(
+                    node.condition,
+                    self._nodes(node.body, shadowed, True),
+                    None
+                    if node.else_body is None
+                    else self._nodes(node.else_body, shadowed, True),
+                ),
+            )
+        if isinstance(node, EachNode):
+            body = self._nodes(node.body, shadowed | {node.item_name}, False)
+            return (EachNode(node.list_name, node.item_name, body, node.source, node.templater),)
+        if isinstance(node, IncludeNode) and node.body is not None:
+            return self._nodes(node.body, shadowed, trimmed)
+        if isinstance(node, RenderNode) and node.target is not None:
+            # Recursive RENDER tags are not linked and stay as they are
+            target = self._nodes(node.target, shadowed, False)
+            if trimmed:
+                # An IF trims the rendered file as a whole, values included
+                return (RenderNode(node.path, node.templater, node.parser, target),)
+            return target
+        return (node,)
+
+    def _branch(self, node: IfNode, value: bool, shadowed: FrozenSet[str]) -> Sequence[Node]:
+        """The chosen branch of an IF on a static value, trimmed as IfNode trims it."""
+        branch = self._nodes((node.body if value else node.else_body) or (), shadowed, True)
+        kept = IfNode(node.condition, branch) if value else IfNode(node.condition, (), branch)
+        if not branch or not kept.trim:
+            return branch
+        texts = [child for child in branch if isinstance(child, TextNode)]
+        if len(texts) == len(branch):
+            pieces = [child.text for child in texts]
+            marks = list(range(len(pieces) + 1))
+            trim_output(pieces, marks, [child.inserts_value for child in texts])
+            return tuple(type(child)(piece) for child, piece in zip(texts, pieces) if piece)
+        # The edges are only known when rendering; the bound value is in the
+        # render context, so the IF keeps choosing this branch
+        return (kept,)
+
+    def _function(self, node: FunctionNode) -> Sequence[Node]:
+        try:
+            function = node.accessor.get(self.static)
+        except (KeyError, TypeError):
+            return (node,)
+        if inspect.iscoroutinefunction(function):
+            # Awaitables are resolved by render_async()
+            return (node,)
+        try:
+            value = function()
+        except (KeyError, TypeError):
+            return (node,)
+        return (ValueNode(self._text(node, value)),)
+
+    @staticmethod
+    def _text(node: Any, value: Any) -> str:
+        """The text inserted for ``value``, escaped as the render would."""
+        escape = node.templater.escape
+        if escape is not None:
+            return escape(value)
+        return value if type(value) is str else str(value)
+
+    def _bound(self, accessor: PathAccessor, shadowed: FrozenSet[str]) -> bool:
+        return accessor.head in self.static and accessor.head not in shadowed
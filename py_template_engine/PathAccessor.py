@@ -0,0 +1,105 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from .Lazy import Lazy
+
+Getter = Callable[[Any, str], Any]
+
+
+def _get_item(value: Any, part: str) -> Any:
+    return value[part]
+
+
+def _get_attribute(value: Any, part: str) -> Any:
+    try:
+        return getattr(value, part)
+    except AttributeError:
+        raise KeyError(part) from None
+
+
+def _get_lazy(value: Lazy, part: str) -> Any:
+    return resolve(value.resolve(), part)
+
+
+# How a path segment is resolved on values of a type, decided once per type
+_getters: Dict[type, Getter] = {dict: _get_item, Lazy: _get_lazy}
+
+
+def _getter_for(cls: type) -> Getter:
+    getter = _getters.get(cls)
+    if getter is None:
+        if issubclass(cls, tuple) and hasattr(cls, "_fields"):
+            # namedtuples are indexed by position, their fields are attributes
+            getter = _get_attribute
+        elif hasattr(cls, "__getitem__"):
+            getter = _get_item
+        else:
+            getter = _get_attribute
+        _getters[cls] = getter
+    return getter
+
+
+def resolve(value: Any, part: str) -> Any:
+    """Resolve one path segment on ``value``.
+
+    Values with ``__getitem__`` are indexed, other objects (dataclasses,
+    namedtuples, ORM models...) are read by attribute. A missing attribute
+    raises KeyError like a missing key does. ``Lazy`` values are computed
+    first.
+    """
+    if type(value) is dict:
+        return value[part]
+    return _getter_for(type(value))(value, part)
+
+
+def resolve_expression(value: str, part: str) -> str:
+    """Python source resolving ``part`` on the local variable ``value``.
+
+    Plain dictionaries are indexed inline, everything else goes through
+    ``resolve``, which has to be available as ``_resolve``.
+    """
+    return f"{value}[{part!r}] if type({value}) is dict else _resolve({value}, {part!r})"
+
+
+class PathAccessor:
+    """A dotted path like ``user.address.city`` compiled once into a function.
+
+    Calling the accessor looks the first segment up in the render context and
+    resolves the others with ``resolve``.
+    """
+
+    __slots__ = ("path", "head", "rest", "get")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.head, *rest = path.split(".")
+        self.rest: Tuple[str, ...] = tuple(rest)
+        self.get: Callable[[Dict[str, Any]], Any] = self._build()
+
+    def _build(self) -> Callable[[Dict[str, Any]], Any]:
+        if not self.rest:
+            head = self.head
+            return lambda context: context[head]
+        lines = ["def get(context):", f"    value = context[{self.head!r}]"]
+        for part in self.rest:
+            lines.append(f"    value = {resolve_expression('value', part)}")
+        lines.append("    return value")
+        namespace: Dict[str, Any] = {"_resolve": resolve}
+        exec("\n".join(lines), namespace)
+        return namespace["get"]
+
+    def __call__(self, context: Dict[str, Any]) -> Any:
+        return self.get(context)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # The generated function is not picklable, the path is
+        return compile_path, (self.path,)
+
+    def __repr__(self) -> str:
+        return f"PathAccessor({self.path!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> PathAccessor:
+    """Return the shared accessor for ``path``."""
+    return PathAccessor(path)
@@ -0,0 +1,111 @@
+import threading
+from collections import defaultdict
+from contextvars import ContextVar, Token
+from typing import IO, Dict, List, NamedTuple, Optional, Tuple
+
+from .nodes.Node import Node
+from .nodes.ProfiledNode import ProfiledNode
+
+
+class ProfileKey(NamedTuple):
+    file: str
+    line: int
+    column: int
+    tag: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}:{self.column} {self.tag}"
+
+
+class ProfileEntry:
+    __slots__ = ("key", "calls", "total", "self_time")
+
+    def __init__(self, key: ProfileKey) -> None:
+        self.key = key
+        self.calls = 0
+        self.total = 0.0
+        self.self_time = 0.0
+
+
+class _Frame:
+    __slots__ = ("key", "children")
+
+    def __init__(self, key: ProfileKey) -> None:
+        self.key = key
+        self.children = 0.0
+
+
+class Profiler:
+    """Records render time and call count per template tag.
+
+    Pass it to ``TemplateEngine(profiler=...)``; tags are keyed by file, line
+    and column, including those of INCLUDE and RENDER files. ``report()``
+    lists the hot spots, ``write_collapsed()`` writes stacks for flamegraph
+    tools. Only ``render()`` and ``render_async()`` are measured; the stack
+    of open tags is a context variable, so concurrent async renders on one
+    event loop are kept apart.
+    """
+
+    MAX_TAG_LENGTH = 40
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stack: ContextVar[Tuple[_Frame, ...]] = ContextVar(
+            f"py_template_engine_profile_{id(self)}", default=()
+        )
+        self._entries: Dict[ProfileKey, ProfileEntry] = {}
+        self._stacks: Dict[Tuple[ProfileKey, ...], float] = defaultdict(float)
+
+    def wrap(self, node: Node, file: str, line: int, column: int, tag: str) -> Node:
+        if len(tag) > self.MAX_TAG_LENGTH:
+            tag = tag[: self.MAX_TAG_LENGTH - 3] + "..."
+        return ProfiledNode(node, ProfileKey(file, line, column, tag), self)
+
+    def enter(self, key: ProfileKey) -> "Token[Tuple[_Frame, ...]]":
+        """Open a frame for ``key``; pass the returned token to exit()."""
+        return self._stack.set(self._stack.get() + (_Frame(key),))
+
+    def exit(self, token: "Token[Tuple[_Frame, ...]]", elapsed: float) -> None:
+        stack = self._stack.get()
+        self._stack.reset(token)
+        frame = stack[-1]
+        self_time = elapsed - frame.children
+        if len(stack) > 1:
+            stack[-2].children += elapsed
+        path = tuple(f.key for f in stack)
+        with self._lock:
+            entry = self._entries.get(frame.key)
+            if entry is None:
+                entry = self._entries[frame.key] = ProfileEntry(frame.key)
+            entry.calls += 1
+            entry.total += elapsed
+            entry.self_time += self_time
+            self._stacks[path] += self_time
+
+    def entries(self) -> List[ProfileEntry]:
+        """All recorded tags, the most expensive (by self time) first."""
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda e: e.self_time, reverse=True)
+
+    def report(self, limit: Optional[int] = 20) -> str:
+        lines = [f"{'calls':>8} {'total ms':>10} {'self ms':>10} {'us/call':>9}  location"]
+        for entry in self.entries()[:limit]:
+            lines.append(
+                f"{entry.calls:>8} {entry.total * 1e3:>10.3f} {entry.self_time * 1e3:>10.3f}"
+                f" {entry.total / entry.calls * 1e6:>9.1f}  {entry.key}"
+            )
+        return "\n".join(lines)
+
+    def write_collapsed(self, fp: IO[str]) -> None:
+        """Write one ``frame;frame;frame microseconds`` line per call stack,
+        the format read by flamegraph.pl and speedscope."""
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        for path, seconds in stacks:
+            frames = ";".join(str(key).replace(";", ",") for key in path)
+            fp.write(f"{frames} {max(0, round(seconds * 1e6))}\n")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stacks.clear()
@@ -0,0 +1,126 @@
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from py_template_engine.TemplateEngine import TemplateEngine
+
+# The engine a worker process received once through the pool initializer
+_worker_engine: Optional["TemplateEngine"] = None
+
+
+def _init_worker(engine: "TemplateEngine") -> None:
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _render_contexts(
+    engine: Optional["TemplateEngine"], contexts: List[Dict[str, Any]]
+) -> List[str]:
+    engine = engine or _worker_engine
+    assert engine is not None
+    return [engine.render(**context) for context in contexts]
+
+
+class RenderBatch:
+    """Iterator over the results of ``TemplateEngine.render_many()``.
+
+    Contexts are read lazily and sent to the pool ``chunk_size`` at a time,
+    with a bounded number of chunks in flight. ``stats()`` reports the
+    throughput so far.
+    """
+
+    EXECUTORS = ("thread", "process")
+
+    def __init__(
+        self,
+        engine: "TemplateEngine",
+        contexts: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        executor: str = "thread",
+        ordered: bool = True,
+        chunk_size: int = 64,
+    ) -> None:
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {self.EXECUTORS}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.ordered = ordered
+        self.chunk_size = chunk_size
+        self.max_pending = self.workers * 2
+
+        self.rendered = 0
+        self.chunks = 0
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._contexts = iter(contexts)
+        self._results = self._run()
+
+    def __iter__(self) -> "RenderBatch":
+        return self
+
+    def __next__(self) -> str:
+        return next(self._results)
+
+    def stats(self) -> Dict[str, float]:
+        seconds = 0.0
+        if self._started is not None:
+            seconds = (self._finished or time.perf_counter()) - self._started
+        return {
+            "rendered": self.rendered,
+            "chunks": self.chunks,
+            "workers": self.workers,
+            "seconds": seconds,
+            "per_second": self.rendered / seconds if seconds else 0.0,
+        }
+
+    def _pool(self) -> Executor:
+        if self.executor == "process":
+            # The engine is pickled once per worker, not once per chunk
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.engine,)
+            )
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def _submit(self, pool: Executor, chunk: List[Dict[str, Any]]) -> "Future[List[str]]":
+        self.chunks += 1
+        engine = self.engine if self.executor == "thread" else None
+        return pool.submit(_render_contexts, engine, chunk)
+
+    def _run(self) -> Iterator[str]:
+        self._started = time.perf_counter()
+        with self._pool() as pool:
+            pending: List["Future[List[str]]"] = []
+            while True:
+                chunk = list(islice(self._contexts, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self._submit(pool, chunk))
+                while len(pending) >= self.max_pending:
+                    yield from self._collect(pending)
+            while pending:
+                yield from self._collect(pending)
+        self._finished = time.perf_counter()
+
+    def _collect(self, pending: List["Future[List[str]]"]) -> Iterator[str]:
+        if self.ordered:
+            future = pending.pop(0)
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            pending.remove(future)
+        results = future.result()
+        self.rendered += len(results)
+        yield from results
@@ -0,0 +1,149 @@
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .BudgetExceeded import BudgetExceeded
+
+# Usage of the governed render in progress
+_usage: ContextVar[Optional["BudgetUsage"]] = ContextVar(
+    "py_template_engine_budget", default=None
+)
+
+
+class RenderBudget:
+    """Limits what a single render may use.
+
+    Pass it to ``TemplateEngine(budget=...)``. ``max_output`` counts output
+    characters, ``max_depth`` nested INCLUDE and RENDER tags,
+    ``max_iterations`` EACH items over the whole render and ``timeout`` the
+    seconds since the render started. Limits are checked at node boundaries,
+    so a single slow function call is not interrupted. A render going over a
+    limit raises BudgetExceeded.
+    """
+
+    def __init__(
+        self,
+        max_output: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_iterations: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.max_output = max_output
+        self.max_depth = max_depth
+        self.max_iterations = max_iterations
+        self.timeout = timeout
+
+    def start(self, out: Optional[List[Any]] = None) -> "BudgetUsage":
+        """Begin a render writing to ``out``; streamed renders report their
+        chunks with ``add_output()`` instead."""
+        return BudgetUsage(self, out)
+
+
+class BudgetUsage:
+    """What one render has used of its budget."""
+
+    __slots__ = (
+        "budget",
+        "out",
+        "measured",
+        "output",
+        "depth",
+        "max_depth",
+        "iterations",
+        "started",
+        "deadline",
+    )
+
+    def __init__(self, budget: RenderBudget, out: Optional[List[Any]] = None) -> None:
+        self.budget = budget
+        # The output list of the render, measured up to ``measured`` so far
+        self.out = out
+        self.measured = 0
+        self.output = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.iterations = 0
+        self.started = time.perf_counter()
+        self.deadline = None if budget.timeout is None else self.started + budget.timeout
+
+    @contextmanager
+    def active(self) -> Iterator["BudgetUsage"]:
+        """Make this the usage the nodes rendered in the block report to."""
+        token = _usage.set(self)
+        try:
+            yield self
+        finally:
+            _usage.reset(token)
+
+    def attach(self, context: Context) -> None:
+        """Make this the usage of the nodes rendered through ``context.run()``."""
+        context.run(_usage.set, self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "output": self.output,
+            "depth": self.max_depth,
+            "iterations": self.iterations,
+            "elapsed": time.perf_counter() - self.started,
+        }
+
+    def check(self) -> None:
+        out = self.out
+        if out is not None and len(out) > self.measured:
+            self.add_output(self._size(out, self.measured))
+            self.measured = len(out)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded(f"timeout={self.budget.timeout}", self.stats())
+
+    def add_output(self, size: int) -> None:
+        self.output += size
+        limit = self.budget.max_output
+        if limit is not None and self.output > limit:
+            raise BudgetExceeded(f"max_output={limit}", self.stats())
+
+    def iterate(self, count: int = 1) -> None:
+        self.iterations += count
+        limit = self.budget.max_iterations
+        if limit is not None and self.iterations > limit:
+            raise BudgetExceeded(f"max_iterations={limit}", self.stats())
+        self.check()
+
+    def enter(self) -> None:
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+        limit = self.budget.max_depth
+        if limit is not None and self.depth > limit:
+            raise BudgetExceeded(f"max_depth={limit}", self.stats())
+        self.check()
+
+    def exit(self) -> None:
+        self.depth -= 1
+
+    @staticmethod
+    def _size(out: List[Any], start: int) -> int:
+        try:
+            return sum(map(len, out[start:]))
+        except TypeError:
+            # Pending placeholders of async renders are counted once resolved
+            return sum(len(value) for value in out[start:] if type(value) is str)
+
+
+def current_usage() -> Optional[BudgetUsage]:
+    """The usage of the governed render in progress, None outside of one."""
+    return _usage.get()
+
+
+@contextmanager
+def nested() -> Iterator[None]:
+    """Count the block as one INCLUDE or RENDER level of the current render."""
+    usage = _usage.get()
+    if usage is None:
+        yield
+        return
+    usage.enter()
+    try:
+        yield
+    finally:
+        usage.exit()
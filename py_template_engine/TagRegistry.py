@@ -0,0 +1,48 @@
+import re
+from typing import Dict, Sequence, Tuple
+
+from .TemplaterInterface import TemplaterInterface
+
+OPENING = "opening"
+SEPARATOR = "separator"
+CLOSING = "closing"
+
+
+class TagRegistry:
+    """Combines the tags declared by a set of templaters into one lexer.
+
+    Every tag becomes one alternative of a single precompiled regular
+    expression, so the template is tokenized in one pass no matter how many
+    templaters are registered. Earlier templaters take precedence.
+    """
+
+    def __init__(self, templaters: Sequence[TemplaterInterface]) -> None:
+        self.templaters = tuple(templaters)
+        self._roles: Dict[str, Tuple[TemplaterInterface, str]] = {}
+
+        alternatives = []
+        for index, templater in enumerate(self.templaters):
+            tag = templater.tag
+            if tag is None:
+                raise ValueError(f"{type(templater).__name__} does not declare a tag")
+            alternatives.append(self._alternative(f"t{index}", tag.opening, tag.argument))
+            self._roles[f"t{index}"] = (templater, OPENING)
+            for position, separator in enumerate(tag.separators):
+                alternatives.append(self._alternative(f"t{index}s{position}", separator))
+                self._roles[f"t{index}s{position}"] = (templater, SEPARATOR)
+            if tag.closing is not None:
+                alternatives.append(self._alternative(f"t{index}c", tag.closing))
+                self._roles[f"t{index}c"] = (templater, CLOSING)
+
+        self.pattern = re.compile("{{(?:" + "|".join(alternatives) + ")}}")
+
+    @staticmethod
+    def supports(templater: TemplaterInterface) -> bool:
+        return templater.tag is not None
+
+    @staticmethod
+    def _alternative(name: str, literal: str, argument: str = "") -> str:
+        return f"(?P<{name}>{re.escape(literal)}{argument})"
+
+    def role(self, group_name: str) -> Tuple[TemplaterInterface, str]:
+        return self._roles[group_name]
@@ -0,0 +1,35 @@
+import re
+from typing import Optional, Sequence, Tuple
+
+
+class TagSyntax:
+    """Declares how a templater's tag is written inside ``{{ }}``.
+
+    ``opening`` is the literal start of the tag and ``argument`` a regular
+    expression for the rest of it; its groups become the tag's arguments.
+    Block tags also name their ``closing`` tag and may allow ``separators``
+    (like ``#ELSE``) that split the block into branches.
+    """
+
+    def __init__(
+        self,
+        opening: str,
+        argument: str = "",
+        closing: Optional[str] = None,
+        separators: Sequence[str] = (),
+    ) -> None:
+        self.opening = opening
+        self.argument = argument
+        self.closing = closing
+        self.separators = tuple(separators)
+        self.pattern = re.compile(re.escape(opening) + argument, re.DOTALL)
+
+    @property
+    def is_block(self) -> bool:
+        return self.closing is not None
+
+    def arguments(self, content: str) -> Tuple[str, ...]:
+        match = self.pattern.fullmatch(content)
+        if match is None:
+            return ()
+        return tuple(group.strip() for group in match.groups() if group is not None)
@@ -1,19 +1,72 @@
+import copy
+from contextlib import nullcontext
 from functools import reduce
-from typing import Any, Optional, Dict
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from .CodeGenerator import BuffersFunction, CodeGenerator, RenderFunction
+from .Escaper import Escaper
+from .FragmentCache import FragmentCache
+from .IncrementalRender import IncrementalRender
+from .Memo import memo_scope, stream_context
+from .sub_engines.CacheTemplater import CacheTemplater
 from .sub_engines.EachTemplater import EachTemplater
 from .sub_engines.FunctionTemplater import FunctionTemplater
 from .sub_engines.IfTemplater import IfTemplater
 from .sub_engines.IncludeTemplater import IncludeTemplater
 from .sub_engines.RenderTemplater import RenderTemplater
 from .sub_engines.VariableTemplater import VariableTemplater
+from .nodes.Node import Node, iter_nodes, iter_nodes_async, render_nodes_async
+from .ParallelEach import ParallelEach
+from .PartialEvaluator import PartialEvaluator
+from .Profiler import Profiler
+from .RenderBatch import RenderBatch
+from .RenderBudget import RenderBudget
+from .TemplateLoader import TemplateLoader
+from .TemplateParser import TemplateParser
 from .TemplaterInterface import TemplaterInterface
 
 
 class TemplateEngine:
+    BACKENDS = ("interpreter", "codegen")
+    OUTPUT_ENCODING = "utf-8"
+
+    _shared_parser: Optional[TemplateParser] = None
+
     def __init__(
-        self, template_path: Optional[str] = None, template_string: Optional[str] = None
+        self,
+        template_path: Optional[str] = None,
+        template_string: Optional[str] = None,
+        backend: str = "interpreter",
+        loader: Optional[TemplateLoader] = None,
+        parallel: Optional[ParallelEach] = None,
+        profiler: Optional[Profiler] = None,
+        fragment_cache: Optional[FragmentCache] = None,
+        memoize: bool = False,
+        autoescape: Optional[Union[str, Callable[[str], str]]] = None,
+        budget: Optional[RenderBudget] = None,
     ) -> None:
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        self._backend = backend
+        self._loader = loader or TemplateLoader.default()
+        self._profiler = profiler
+        self._budget = budget
+        self._static: Dict[str, Any] = {}
+
+        self._template_path: Optional[str] = None
         if template_path:
             self._load_template(template_path)
         elif template_string:
@@ -21,32 +74,354 @@ class TemplateEngine:
         else:
             raise ValueError("Either template_path or template_string must be provided")
 
-        self._templaters: list[TemplaterInterface] = [
-            IncludeTemplater(),
-            RenderTemplater(),
-            EachTemplater(),
+        # Engines with the default setup share one parser, so the templates
+        # it compiled are found in the loader by every such engine.
+        self._parser: Optional[TemplateParser] = None
+        options = (loader, parallel, profiler, fragment_cache, autoescape)
+        if all(option is None for option in options) and not memoize:
+            self._parser = self._default_parser()
+            self._templaters: list[TemplaterInterface] = list(self._parser.templaters)
+        else:
+            self._templaters = self.default_templaters(
+                parallel=parallel,
+                fragment_cache=fragment_cache,
+                memoize=memoize,
+                escape=None if autoescape is None else Escaper.create(autoescape),
+                loader=loader,
+            )
+        self._compile()
+
+    @classmethod
+    def _default_parser(cls) -> TemplateParser:
+        if cls._shared_parser is None:
+            cls._shared_parser = TemplateParser(
+                cls.default_templaters(), TemplateLoader.default()
+            )
+        return cls._shared_parser
+
+    @staticmethod
+    def default_templaters(
+        parallel: Optional[ParallelEach] = None,
+        fragment_cache: Optional[FragmentCache] = None,
+        memoize: bool = False,
+        escape: Optional[Escaper] = None,
+        loader: Optional[TemplateLoader] = None,
+    ) -> List[TemplaterInterface]:
+        return [
+            IncludeTemplater(loader=loader),
+            RenderTemplater(loader=loader),
+            EachTemplater(parallel=parallel),
             IfTemplater(),
-            FunctionTemplater(),
-            VariableTemplater(),
+            CacheTemplater(cache=fragment_cache),
+            FunctionTemplater(memoize=memoize, escape=escape),
+            VariableTemplater(escape=escape),
         ]
 
+    def _compile(self) -> None:
+        """Parse the template once into a node tree.
+
+        Templaters that do not declare a ``tag`` only implement the string
+        based ``render`` pass, so their presence keeps the engine on that
+        pipeline.
+        """
+        self._nodes: Optional[Tuple[Node, ...]] = None
+        self._parsed: Optional[Tuple[Node, ...]] = None
+        self._render_function: Optional[RenderFunction] = None
+        self._buffers_function: Optional[BuffersFunction] = None
+        self._references: Set[str] = set()
+        self._digests: Dict[str, Optional[str]] = {}
+        if all(TemplateParser.supports(templater) for templater in self._templaters):
+            if self._parser is None:
+                self._parser = TemplateParser(
+                    self._templaters, self._loader, self._profiler
+                )
+            self._parse()
+
+    def _parse(self) -> None:
+        """Compile the template with the files it uses and remember their
+        content hashes, to notice when one of them changes."""
+        assert self._parser is not None
+        if self._template_path:
+            self._parsed = self._parser.parse_file(self._template_path)
+        else:
+            references: Set[str] = set()
+            self._parsed = self._parser.parse(self._template, references=references)
+            self._references = references
+        self._digests = {
+            path: self._loader.digest(path) for path in self.template_dependencies()
+        }
+        self._link()
+
+    def _link(self) -> None:
+        """Build what renders use from the compiled tree and the bound values."""
+        assert self._parsed is not None
+        nodes = self._parsed
+        if self._static:
+            nodes = PartialEvaluator(self._static).fold(nodes)
+        self._nodes = nodes
+        self._buffers_function = None
+        self._render_function = None
+        if self._backend == "codegen":
+            self._render_function = CodeGenerator().compile(nodes)
+
+    def _refresh(self) -> None:
+        """Recompile when a file used by INCLUDE or RENDER changed.
+
+        Files are checked as the loader's ``invalidation`` mode says: on every
+        render with ``"mtime"``, at most once per interval with ``"interval"``.
+        """
+        if self._parsed is None or self._loader.invalidation == "never":
+            return
+        if self._loader.is_current(self._digests):
+            return
+        try:
+            self._parse()
+        except FileNotFoundError:
+            # The template itself is gone, keep rendering what was compiled
+            pass
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Generated functions cannot be pickled; copies generate their own
+        state = self.__dict__.copy()
+        state["_render_function"] = None
+        state["_buffers_function"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self._backend == "codegen" and self._nodes is not None:
+            self._render_function = CodeGenerator().compile(self._nodes)
+
+    def bind(self, **static: Any) -> "TemplateEngine":
+        """Return a copy of the engine specialised for the ``static`` context.
+
+        Tags that only depend on the bound values are evaluated now and
+        folded into text, and INCLUDE and RENDER files are inlined, so renders
+        only evaluate the dynamic parts. Bound values take precedence over the
+        context passed to render(). When a file used by the template changes,
+        the bound engine folds the recompiled template again.
+        """
+        engine = copy.copy(self)
+        engine._templaters = list(self._templaters)
+        engine._static = {**self._static, **static}
+        if self._parsed is not None:
+            engine._link()
+        return engine
+
+    def template_dependencies(self) -> List[str]:
+        """The files used by the template's INCLUDE and RENDER tags, directly
+        or through other files."""
+        if self._template_path:
+            return self._loader.dependencies(self._template_path)
+        files = set(self._references)
+        for path in self._references:
+            files.update(self._loader.dependencies(path))
+        return sorted(files)
+
     def _load_template(self, template_path: str) -> None:
-        with open(template_path, "r") as file:
-            self._template = file.read()
+        self._template_path = template_path
+        self._template = self._loader.get_source(template_path)
 
     def render(self, **kwargs: Dict[str, Any]) -> str:
-        return reduce(
-            lambda acc, templater: templater.render(acc, **kwargs),
-            self._templaters,
-            self._template,
-        )
+        self._refresh()
+        if self._static:
+            kwargs = {**kwargs, **self._static}
+        with memo_scope():
+            if self._budget is not None:
+                return self._render_governed(kwargs)
+            if self._render_function is not None:
+                return self._render_function(kwargs)
+            if self._nodes is not None:
+                out: List[str] = []
+                for node in self._nodes:
+                    node.render(kwargs, out)
+                return "".join(out)
+            return reduce(
+                lambda acc, templater: templater.render(acc, **kwargs),
+                self._templaters,
+                self._template,
+            )
+
+    def _render_governed(self, kwargs: Dict[str, Any]) -> str:
+        """Walk the node tree checking the budget; generated code has no
+        checks, so codegen engines with a budget render like the interpreter."""
+        if self._nodes is None or self._budget is None:
+            raise ValueError("Render budgets need templaters that declare a tag")
+        out: List[str] = []
+        with self._budget.start(out).active() as usage:
+            for node in self._nodes:
+                node.render(kwargs, out)
+                usage.check()
+            return "".join(out)
+
+    def render_buffers(self, **kwargs: Dict[str, Any]) -> List[bytes]:
+        """Render the template as a list of UTF-8 encoded buffers, ready for
+        ``writelines()`` or ``socket.sendmsg()``.
+
+        The template's text is encoded once, when this is first called, so
+        only the inserted values are encoded on every render.
+        """
+        if self._nodes is None or self._budget is not None:
+            return [self.render(**kwargs).encode(self.OUTPUT_ENCODING)]
+        self._refresh()
+        if self._buffers_function is None:
+            generator = CodeGenerator("render_buffers", self.OUTPUT_ENCODING)
+            self._buffers_function = generator.compile_buffers(self._nodes)
+        if self._static:
+            kwargs = {**kwargs, **self._static}
+        with memo_scope():
+            return self._buffers_function(kwargs)
+
+    def render_bytes(self, **kwargs: Dict[str, Any]) -> bytes:
+        """Render the template to UTF-8 encoded bytes."""
+        return b"".join(self.render_buffers(**kwargs))
+
+    def render_iter(self, **kwargs: Dict[str, Any]) -> Iterator[str]:
+        """Render the template as a stream of chunks.
+
+        Blocks are rendered lazily while the stream is consumed, so the first
+        chunk is available before the last EACH item has been evaluated.
+        """
+        if self._nodes is None:
+            yield self.render(**kwargs)
+            return
+        self._refresh()
+        if self._static:
+            kwargs = {**kwargs, **self._static}
+        context = stream_context()
+        usage = None
+        if self._budget is not None:
+            usage = self._budget.start()
+            usage.attach(context)
+        chunks = iter_nodes(self._nodes, kwargs)
+        while True:
+            # Chunks are rendered in the render's own context, the consumer's
+            # code between them is not part of the render
+            chunk = context.run(next, chunks, None)
+            if chunk is None:
+                return
+            if usage is not None:
+                usage.add_output(len(chunk))
+                usage.check()
+            yield chunk
+
+    def render_to(
+        self, fp: IO[str], buffer_size: int = 8192, **kwargs: Dict[str, Any]
+    ) -> int:
+        """Stream the rendered template into ``fp``, writing ``buffer_size``
+        characters at a time, and return the number of characters written."""
+        written = 0
+        buffered: List[str] = []
+        size = 0
+        for chunk in self.render_iter(**kwargs):
+            buffered.append(chunk)
+            size += len(chunk)
+            if size >= buffer_size:
+                fp.write("".join(buffered))
+                written += size
+                buffered = []
+                size = 0
+        if buffered:
+            fp.write("".join(buffered))
+            written += size
+        return written
+
+    def render_many(
+        self,
+        contexts: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        executor: str = "thread",
+        ordered: bool = True,
+        chunk_size: int = 64,
+    ) -> RenderBatch:
+        """Render the template once per context in a worker pool.
+
+        Returns an iterator over the results, in the order of ``contexts``
+        unless ``ordered`` is False, whose ``stats()`` reports the throughput.
+        Process workers receive the compiled engine once and the contexts in
+        chunks of ``chunk_size``.
+        """
+        return RenderBatch(self, contexts, workers, executor, ordered, chunk_size)
+
+    def incremental(self, **kwargs: Dict[str, Any]) -> IncrementalRender:
+        """Render the template and return a handle that re-renders only the
+        parts of the output affected by later context updates."""
+        self._refresh()
+        return IncrementalRender(self, kwargs)
+
+    async def render_async(self, **kwargs: Dict[str, Any]) -> str:
+        """Render the template, awaiting what template functions return.
+
+        Awaitables returned by functions run concurrently, also across IF,
+        EACH, INCLUDE and RENDER blocks, and EACH also accepts asynchronous
+        iterables.
+        """
+        if self._nodes is None:
+            return self.render(**kwargs)
+        self._refresh()
+        if self._static:
+            kwargs = {**kwargs, **self._static}
+        out: List[Any] = []
+        with memo_scope():
+            if self._budget is None:
+                await render_nodes_async(self._nodes, kwargs, out)
+            else:
+                with self._budget.start(out).active() as usage:
+                    await render_nodes_async(self._nodes, kwargs, out)
+                    # Awaited values replaced placeholders that were not counted
+                    usage.measured = 0
+                    usage.output = 0
+                    usage.check()
+        return "".join(out)
+
+    async def render_async_iter(self, **kwargs: Dict[str, Any]) -> AsyncIterator[str]:
+        """Asynchronous counterpart of render_iter()."""
+        if self._nodes is None:
+            yield self.render(**kwargs)
+            return
+        self._refresh()
+        if self._static:
+            kwargs = {**kwargs, **self._static}
+        memo: Dict[Any, Any] = {}
+        usage = None if self._budget is None else self._budget.start()
+        chunks = iter_nodes_async(self._nodes, kwargs)
+        while True:
+            # The render's scopes are only active while a chunk is rendered
+            with memo_scope(memo), usage.active() if usage is not None else nullcontext():
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return
+                if usage is not None:
+                    usage.add_output(len(chunk))
+                    usage.check()
+            yield chunk
+
+    def register_templater(self, templater: TemplaterInterface) -> None:
+        """Add a templater that declares its ``tag`` to the engine's lexer.
+
+        It is placed ahead of the catch-all tags (functions and variables) so
+        its tag is recognised before them.
+        """
+        if not TemplateParser.supports(templater):
+            raise ValueError(f"{type(templater).__name__} does not declare a tag")
+        index = len(self._templaters)
+        for position, registered in enumerate(self._templaters):
+            if registered.tag is not None and registered.tag.opening == "":
+                index = position
+                break
+        self.add_templater(index, templater)
 
     def add_templater(self, index: int, templater: TemplaterInterface) -> None:
         if index < 0 or index > len(self._templaters):
             raise ValueError("Index out of range")
         self._templaters.insert(index, templater)
+        self._parser = None
+        self._compile()
 
     def remove_templater(self, index: int) -> None:
         if index < 0 or index >= len(self._templaters):
             raise ValueError("Index out of range")
         self._templaters.pop(index)
+        self._parser = None
+        self._compile()
@@ -0,0 +1,252 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .DiskCache import DiskCache
+
+T = TypeVar("T")
+
+
+class _Entry:
+    __slots__ = ("source", "digest", "stamp", "checked_at", "compiled")
+
+    def __init__(self, source: str, stamp: Tuple[int, int], checked_at: float) -> None:
+        self.source = source
+        self.digest = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        self.stamp = stamp
+        self.checked_at = checked_at
+        self.compiled: "OrderedDict[Any, Any]" = OrderedDict()
+
+
+class TemplateLoader:
+    """Bounded LRU cache of template files and of what was compiled from them.
+
+    ``invalidation`` decides when a cached file is checked against the disk:
+
+    * ``"never"``: files are read once and kept until evicted or invalidated
+    * ``"mtime"``: every access stats the file
+    * ``"interval"``: the file is stat'ed at most once per ``check_interval`` seconds
+
+    A file whose mtime changed but whose content hash did not keeps its
+    compiled templates. With a ``cache_dir`` compiled templates are also
+    stored on disk, so new processes load them instead of parsing. Files are
+    decoded with ``encoding``, independent of the locale.
+
+    The loader also keeps the graph of the files each template references.
+    A compiled template remembers the content hashes of those files, and a
+    change to one of them, directly or through other files, recompiles
+    exactly the templates that use it.
+    """
+
+    INVALIDATION_MODES = ("never", "mtime", "interval")
+    MAX_COMPILED_PER_FILE = 8
+
+    _default: Optional["TemplateLoader"] = None
+
+    def __init__(
+        self,
+        max_size: int = 128,
+        invalidation: str = "mtime",
+        check_interval: float = 1.0,
+        cache_dir: Optional[str] = None,
+        encoding: str = "utf-8",
+    ) -> None:
+        if invalidation not in self.INVALIDATION_MODES:
+            raise ValueError(
+                f"Unknown invalidation '{invalidation}', expected one of {self.INVALIDATION_MODES}"
+            )
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.invalidation = invalidation
+        self.check_interval = check_interval
+        self.encoding = encoding
+        self.disk_cache = DiskCache(cache_dir) if cache_dir else None
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._dependencies: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @classmethod
+    def default(cls) -> "TemplateLoader":
+        """The loader shared by every engine that was not given its own."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def get_source(self, template_path: str) -> str:
+        return self._entry(template_path).source
+
+    def get_compiled(
+        self, template_path: str, key: Any, compile: Callable[[str], T]
+    ) -> T:
+        """Return ``compile(source)``, cached per file and ``key``.
+
+        The key tells apart results built from the same file by different
+        compilers, for example parsers with different templaters.
+        """
+        entry = self._entry(template_path)
+        with self._lock:
+            cached = entry.compiled.get(key)
+            if cached is not None and self.is_current(cached[1]):
+                entry.compiled.move_to_end(key)
+                self.compiled_hits += 1
+                return cached[0]
+            self.compiled_misses += 1
+            compiled = compile(entry.source)
+            digests = {
+                dependency: self.digest(dependency)
+                for dependency in self.dependencies(template_path)
+            }
+            entry.compiled[key] = (compiled, digests)
+            if len(entry.compiled) > self.MAX_COMPILED_PER_FILE:
+                entry.compiled.popitem(last=False)
+            return compiled
+
+    def digest(self, template_path: str) -> Optional[str]:
+        """The content hash of a file, None if it does not exist."""
+        try:
+            return self._entry(template_path).digest
+        except FileNotFoundError:
+            return None
+
+    def set_dependencies(self, template_path: str, dependencies: Iterable[str]) -> None:
+        """Record the files referenced by the INCLUDE and RENDER tags of a template."""
+        with self._lock:
+            self._dependencies[os.path.abspath(template_path)] = frozenset(
+                os.path.abspath(path) for path in dependencies
+            )
+
+    def dependencies(self, template_path: str) -> List[str]:
+        """The files a template uses, directly or through other files."""
+        return self._walk(template_path, self._dependencies)
+
+    def dependents(self, template_path: str) -> List[str]:
+        """The templates that use a file, directly or through other files."""
+        with self._lock:
+            reverse: Dict[str, set] = {}
+            for path, dependencies in self._dependencies.items():
+                for dependency in dependencies:
+                    reverse.setdefault(dependency, set()).add(path)
+        return self._walk(template_path, reverse)
+
+    def _walk(self, template_path: str, edges: Dict[str, Any]) -> List[str]:
+        start = os.path.abspath(template_path)
+        seen = set()
+        pending = [start]
+        with self._lock:
+            while pending:
+                for path in edges.get(pending.pop(), ()):
+                    if path not in seen:
+                        seen.add(path)
+                        pending.append(path)
+        seen.discard(start)
+        return sorted(seen)
+
+    def is_current(self, digests: Dict[str, Optional[str]]) -> bool:
+        """Whether the files still have the content hashes in ``digests``;
+        files are checked as their ``invalidation`` mode says."""
+        return all(self.digest(path) == digest for path, digest in digests.items())
+
+    def invalidate(self, template_path: str) -> None:
+        """Drop a file and what was compiled from the templates using it."""
+        with self._lock:
+            if self._entries.pop(os.path.abspath(template_path), None) is not None:
+                self.invalidations += 1
+            for dependent in self.dependents(template_path):
+                entry = self._entries.get(dependent)
+                if entry is not None:
+                    entry.compiled.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dependencies.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "compiled_hits": self.compiled_hits,
+            "compiled_misses": self.compiled_misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies sent to worker processes start with an empty cache
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        state["_dependencies"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _entry(self, template_path: str) -> _Entry:
+        path = os.path.abspath(template_path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                try:
+                    fresh = self._is_fresh(path, entry)
+                except FileNotFoundError:
+                    self._entries.pop(path)
+                    self.invalidations += 1
+                    raise
+                if fresh:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry
+
+            self.misses += 1
+            stamp = self._stamp(path)
+            with open(path, "r", encoding=self.encoding) as file:
+                loaded = _Entry(file.read(), stamp, time.monotonic())
+            if entry is not None:
+                self.invalidations += 1
+                if entry.digest == loaded.digest:
+                    loaded.compiled = entry.compiled
+            self._entries[path] = loaded
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return loaded
+
+    def _is_fresh(self, path: str, entry: _Entry) -> bool:
+        if self.invalidation == "never":
+            return True
+        if self.invalidation == "interval":
+            now = time.monotonic()
+            if now - entry.checked_at < self.check_interval:
+                return True
+            entry.checked_at = now
+        return self._stamp(path) == entry.stamp
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,246 @@
+import os
+import threading
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .nodes.Node import Node
+from .nodes.TextNode import TextNode
+from .TagRegistry import CLOSING, OPENING, TagRegistry
+from .TemplateLoader import TemplateLoader
+from .TemplateSyntaxError import TemplateSyntaxError
+from .TemplaterInterface import TemplaterInterface
+
+if TYPE_CHECKING:
+    from .Profiler import Profiler
+
+
+class _Block:
+    """A block tag whose closing tag has not been seen yet."""
+
+    def __init__(
+        self,
+        templater: TemplaterInterface,
+        start: int,
+        arguments: Tuple[str, ...],
+        opening: str,
+    ) -> None:
+        self.templater = templater
+        self.start = start
+        self.arguments = arguments
+        self.opening = opening
+        self.branches: List[List[Node]] = [[]]
+
+    @property
+    def children(self) -> List[Node]:
+        return self.branches[-1]
+
+
+class _Frame:
+    """A template being compiled and the files it references."""
+
+    __slots__ = ("path", "inline", "references")
+
+    def __init__(self, path: Optional[str], inline: bool, references: Set[str]) -> None:
+        self.path = path
+        # Whether the template is compiled into its parent through INCLUDE
+        self.inline = inline
+        self.references = references
+
+
+class TemplateParser:
+    """Compiles a template string into an immutable tree of nodes.
+
+    Only the tags of the templaters that were handed in are recognised, so a
+    removed sub-engine leaves its tags untouched just like the string pipeline.
+    With a ``profiler`` every tag node is wrapped to record its render time.
+    The files referenced by INCLUDE and RENDER tags are compiled along with
+    the template and recorded in the loader's dependency graph.
+    """
+
+    def __init__(
+        self,
+        templaters: Sequence[TemplaterInterface],
+        loader: Optional[TemplateLoader] = None,
+        profiler: Optional["Profiler"] = None,
+    ) -> None:
+        self.registry = TagRegistry(templaters)
+        self.templaters = self.registry.templaters
+        self.loader = loader or TemplateLoader.default()
+        self.profiler = profiler
+        self._local = threading.local()
+
+    @property
+    def signature(self) -> str:
+        """Describes the tags this parser recognises, for caches outside the process."""
+        parts = []
+        for templater in self.templaters:
+            tag = templater.tag
+            assert tag is not None
+            name = f"{type(templater).__module__}.{type(templater).__qualname__}"
+            parts.append(f"{name}:{tag.pattern.pattern}:{tag.closing}:{tag.separators}")
+        parts.append(f"profiled={self.profiler is not None}")
+        return "|".join(parts)
+
+    @staticmethod
+    def supports(templater: TemplaterInterface) -> bool:
+        return TagRegistry.supports(templater)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def parse_file(self, template_path: str) -> Tuple[Node, ...]:
+        return self.loader.get_compiled(
+            template_path,
+            self,
+            lambda source: self._parse_file(template_path, source, False),
+        )
+
+    def parse_reference(self, template_path: str, inline: bool) -> Optional[Tuple[Node, ...]]:
+        """Compile a file referenced by the template being compiled.
+
+        ``inline`` tells INCLUDE apart from RENDER. A cycle made of INCLUDE
+        tags raises TemplateSyntaxError, while a file that is already being
+        compiled through a RENDER returns None, to be looked up on render.
+        """
+        path = os.path.abspath(template_path)
+        frames = self._frames()
+        if frames:
+            frames[-1].references.add(path)
+        for index, frame in enumerate(frames):
+            if frame.path == path:
+                if inline and all(entered.inline for entered in frames[index + 1 :]):
+                    chain = " -> ".join([*(f.path or "" for f in frames[index:]), path])
+                    raise TemplateSyntaxError(f"INCLUDE cycle: {chain}")
+                return None
+        return self.loader.get_compiled(
+            template_path,
+            self,
+            lambda source: self._parse_file(template_path, source, inline),
+        )
+
+    def _frames(self) -> List[_Frame]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def _parse_file(
+        self, template_path: str, source: str, inline: bool
+    ) -> Tuple[Node, ...]:
+        path = os.path.abspath(template_path)
+        frames = self._frames()
+        frame = _Frame(path, inline, set())
+        frames.append(frame)
+        try:
+            cache = self.loader.disk_cache
+            loaded = None if cache is None else cache.load(template_path, source, self)
+            if loaded is not None:
+                nodes, dependencies = loaded
+                frame.references.update(dependencies)
+            else:
+                nodes = self._parse(source, template_path)
+        finally:
+            frames.pop()
+        self.loader.set_dependencies(path, frame.references)
+        if cache is not None and loaded is None:
+            cache.store(template_path, source, self, nodes)
+        return nodes
+
+    def parse(
+        self,
+        template: str,
+        origin: str = "<string>",
+        references: Optional[Set[str]] = None,
+    ) -> Tuple[Node, ...]:
+        """Compile ``template``; ``origin`` names it in profiles and the files
+        its INCLUDE and RENDER tags reference are added to ``references``."""
+        frames = self._frames()
+        frames.append(_Frame(None, False, set() if references is None else references))
+        try:
+            return self._parse(template, origin)
+        finally:
+            frames.pop()
+
+    def _parse(self, template: str, origin: str) -> Tuple[Node, ...]:
+        newlines: Optional[List[int]] = None
+        if self.profiler is not None:
+            newlines = [i for i, char in enumerate(template) if char == "\n"]
+
+        def profiled(node: Node, start: int, tag: str) -> Node:
+            if newlines is None or self.profiler is None:
+                return node
+            line = bisect_right(newlines, start)
+            column = start - (newlines[line - 1] + 1 if line else 0)
+            return self.profiler.wrap(node, origin, line + 1, column + 1, tag)
+
+        root: List[Node] = []
+        stack: List[_Block] = []
+        children = root
+        pos = 0
+
+        for match in self.registry.pattern.finditer(template):
+            if match.start() > pos:
+                self._append_text(children, template[pos : match.start()])
+            pos = match.end()
+            group = match.lastgroup or ""
+            templater, role = self.registry.role(group)
+            tag = templater.tag
+            assert tag is not None
+
+            if role == OPENING:
+                arguments = tag.arguments(match.group(group))
+                if tag.is_block:
+                    stack.append(
+                        _Block(templater, match.start(), arguments, match.group(0))
+                    )
+                    children = stack[-1].children
+                else:
+                    node = templater.compile(arguments, (), match.group(0), self)
+                    children.append(profiled(node, match.start(), match.group(0)))
+                continue
+
+            if not stack or stack[-1].templater is not templater:
+                raise TemplateSyntaxError(
+                    f"Unexpected {match.group(0)} at position {match.start()}"
+                )
+            block = stack[-1]
+            if role == CLOSING:
+                stack.pop()
+                children = stack[-1].children if stack else root
+                node = templater.compile(
+                    block.arguments,
+                    tuple(tuple(branch) for branch in block.branches),
+                    template[block.start : match.end()],
+                    self,
+                )
+                children.append(profiled(node, block.start, block.opening))
+            elif len(block.branches) > len(tag.separators):
+                raise TemplateSyntaxError(
+                    f"Unexpected {match.group(0)} at position {match.start()}"
+                )
+            else:
+                block.branches.append([])
+                children = block.children
+
+        if stack:
+            raise TemplateSyntaxError(
+                f"Unclosed block at position {stack[-1].start}"
+            )
+        self._append_text(root, template[pos:])
+        return tuple(root)
+
+    @staticmethod
+    def _append_text(children: List[Node], text: str) -> None:
+        if not text:
+            return
+        last = children[-1] if children else None
+        if isinstance(last, TextNode):
+            children[-1] = TextNode(last.text + text)
+        else:
+            children.append(TextNode(text))
@@ -0,0 +1,5 @@
+from py_template_engine.RenderError import RenderError
+
+
+class TemplateSyntaxError(RenderError):
+    pass
@@ -1,11 +1,50 @@
-from abc import ABC, abstractmethod
-from typing import Any, Dict
+from abc import ABC
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from .TagSyntax import TagSyntax
+
+if TYPE_CHECKING:
+    from .nodes.Node import Node
+    from .TemplateParser import TemplateParser
 
 
 class TemplaterInterface(ABC):
+    # Templaters that declare their tag are compiled into the engine's node
+    # tree; the others only take part through the string based render() pass.
+    tag: Optional[TagSyntax] = None
+
+    # Renders one tag from its arguments, followed by the rendered branches of
+    # a block tag, and the context; called by the nodes the default compile()
+    # builds. Declared without a body, as every templater takes its own
+    # arguments.
+    process: Callable[..., Any]
+
     def __init__(self, raise_on_error: bool = False):
         self.raise_on_error = raise_on_error
 
-    @abstractmethod
     def render(self, template: str, **kwargs: Dict[str, Any]) -> str:
-        raise NotImplementedError
+        if self.tag is None:
+            raise NotImplementedError
+        # Import here to avoid circular import
+        from .TemplateParser import TemplateParser
+
+        out: list = []
+        for node in TemplateParser([self]).parse(template):
+            node.render(kwargs, out)
+        return "".join(out)
+
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple["Node", ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> "Node":
+        """Build the node for one occurrence of this templater's tag.
+
+        By default the node calls ``process`` with the tag's arguments,
+        followed by the rendered branches for block tags, and the context.
+        """
+        from .nodes.TagNode import TagNode
+
+        return TagNode(self, arguments, branches)
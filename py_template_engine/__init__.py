@@ -3,7 +3,20 @@ py-templater:
 A Python template engine with support for variables, functions, conditionals, loops, and includes
 """
 
+from .BudgetExceeded import BudgetExceeded
+from .Escaper import Escaper
+from .FragmentCache import FragmentCache, MemoryFragmentCache
+from .IncrementalRender import IncrementalRender, Region
+from .Lazy import Lazy
+from .Markup import Markup
+from .Memo import pure
+from .ParallelEach import ParallelEach
+from .Profiler import Profiler
+from .RenderBatch import RenderBatch
+from .RenderBudget import RenderBudget
+from .TagSyntax import TagSyntax
 from .TemplateEngine import TemplateEngine
+from .TemplateLoader import TemplateLoader
 from .TemplaterInterface import TemplaterInterface
 
 __version__ = "0.1.0"
@@ -12,8 +25,23 @@ __email__ = "yannick.zimmermann@proton.me"
 __description__ = "A Python template engine with support for variables, functions, conditionals, loops, and includes"
 
 __all__ = [
+    "BudgetExceeded",
+    "Escaper",
+    "FragmentCache",
+    "IncrementalRender",
+    "Lazy",
+    "Markup",
+    "MemoryFragmentCache",
+    "ParallelEach",
+    "Profiler",
+    "RenderBatch",
+    "RenderBudget",
+    "Region",
+    "TagSyntax",
     "TemplateEngine",
+    "TemplateLoader",
     "TemplaterInterface",
+    "pure",
     "__version__",
     "__author__",
     "__email__",
@@ -0,0 +1,84 @@
+"""
+Command line interface.
+
+    python -m py_template_engine compile templates/ -o rendered_templates.py
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+from typing import List, Optional
+
+from .ModuleGenerator import ModuleGenerator
+from .RenderError import RenderError
+from .TemplateEngine import TemplateEngine
+from .TemplateLoader import TemplateLoader
+from .TemplateParser import TemplateParser
+
+
+def compile_directory(
+    directory: str,
+    output: str,
+    pattern: str = "*",
+    raise_on_error: bool = False,
+    encoding: str = "utf-8",
+) -> List[str]:
+    """Compile every template below ``directory``, read with ``encoding``,
+    into the module ``output`` and return the template names it contains."""
+    loader = TemplateLoader(encoding=encoding)
+    templaters = TemplateEngine.default_templaters(loader=loader)
+    for templater in templaters:
+        templater.raise_on_error = raise_on_error
+    generator = ModuleGenerator(TemplateParser(templaters, loader))
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if fnmatch.fnmatch(file, pattern):
+                path = os.path.join(root, file)
+                generator.add(path, os.path.relpath(path, directory))
+
+    source = generator.generate_module(
+        f"Generated from {directory} by `python -m py_template_engine compile`."
+        " Do not edit."
+    )
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(source)
+    return generator.templates
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m py_template_engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser(
+        "compile", help="compile a template directory into a Python module"
+    )
+    compile_parser.add_argument("directory")
+    compile_parser.add_argument("-o", "--output", required=True, help="module file to write")
+    compile_parser.add_argument(
+        "--pattern", default="*", help="only compile files matching this glob (default: all)"
+    )
+    compile_parser.add_argument(
+        "--raise-on-error",
+        action="store_true",
+        help="raise RenderError for missing values instead of leaving the tag in the output",
+    )
+    compile_parser.add_argument(
+        "--encoding", default="utf-8", help="encoding of the template files (default: utf-8)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        names = compile_directory(
+            args.directory, args.output, args.pattern, args.raise_on_error, args.encoding
+        )
+    except (RenderError, ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"compiled {len(names)} template(s) into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
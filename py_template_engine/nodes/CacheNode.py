@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from py_template_engine.nodes.Node import Node, nodes_dependencies, render_nodes_async
+from py_template_engine.PathAccessor import compile_path
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.CacheTemplater import CacheTemplater
+
+
+class CacheNode(Node):
+    """Renders its body once per key and serves it from a FragmentCache."""
+
+    __slots__ = ("name", "accessors", "ttl", "body", "source", "templater")
+
+    def __init__(
+        self,
+        name: str,
+        paths: Tuple[str, ...],
+        ttl: Optional[float],
+        body: Tuple[Node, ...],
+        source: str,
+        templater: "CacheTemplater",
+    ) -> None:
+        self.name = name
+        self.accessors = tuple(compile_path(path) for path in paths)
+        self.ttl = ttl
+        self.body = body
+        self.source = source
+        self.templater = templater
+
+    def render(self, context: Dict[str, Any], out: List[Any]) -> None:
+        key = self._key(context)
+        if key is not None:
+            fragment = self.templater.cache.get(key)
+            if fragment is not None:
+                out.append(fragment)
+                return
+        rendered: List[str] = []
+        for node in self.body:
+            node.render(context, rendered)
+        fragment = "".join(rendered)
+        if key is not None:
+            self.templater.cache.set(key, fragment, self.ttl)
+        out.append(fragment)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        key = self._key(context)
+        if key is not None:
+            fragment = self.templater.cache.get(key)
+            if fragment is not None:
+                out.append(fragment)
+                return
+        rendered: List[Any] = []
+        await render_nodes_async(self.body, context, rendered)
+        fragment = "".join(rendered)
+        if key is not None:
+            self.templater.cache.set(key, fragment, self.ttl)
+        out.append(fragment)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        body = nodes_dependencies(self.body, visiting)
+        if body is None:
+            return None
+        return body | {accessor.head for accessor in self.accessors}
+
+    def _key(self, context: Dict[str, Any]) -> Optional[str]:
+        """The cache key, or None to render without the cache when a key path
+        is missing."""
+        try:
+            values = [accessor.get(context) for accessor in self.accessors]
+        except (KeyError, TypeError) as e:
+            self.templater.on_error(self.name, self.source, e)
+            return None
+        return "\0".join([self.name, *map(str, values)])
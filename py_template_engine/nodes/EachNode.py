@@ -0,0 +1,139 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from py_template_engine.nodes.Node import (
+    Node,
+    collect_nodes_async,
+    iter_nodes,
+    iter_nodes_async,
+    nodes_dependencies,
+)
+from py_template_engine.nodes.LoopScope import LoopScope
+from py_template_engine.PathAccessor import compile_path
+from py_template_engine.RenderBudget import current_usage
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.EachTemplater import EachTemplater
+
+
+class EachNode(Node):
+    __slots__ = ("list_name", "accessor", "item_name", "body", "source", "templater")
+
+    streams = True
+
+    def __init__(
+        self,
+        list_name: str,
+        item_name: str,
+        body: Tuple[Node, ...],
+        source: str,
+        templater: "EachTemplater",
+    ) -> None:
+        self.list_name = list_name
+        self.accessor = compile_path(list_name)
+        self.item_name = item_name
+        self.body = body
+        self.source = source
+        self.templater = templater
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        try:
+            items = self._items(context)
+        except (KeyError, TypeError) as e:
+            out.append(self.templater.on_error(self.list_name, self.source, e))
+            return
+        parallel = self.templater.parallel
+        if parallel is not None and parallel.accepts(items):
+            out.extend(parallel.render(self, context, items))
+        else:
+            self.render_items(context, items, out)
+
+    def render_items(self, context: Dict[str, Any], items: Any, out: List[str]) -> None:
+        """Render the body once per item with the loop variable bound in ``context``."""
+        item_name = self.item_name
+        body = self.body
+        usage = current_usage()
+        with LoopScope(context, item_name):
+            for item in items:
+                if usage is not None:
+                    usage.iterate()
+                context[item_name] = item
+                for node in body:
+                    node.render(context, out)
+
+    def render_iter(self, context: Dict[str, Any]) -> Iterator[str]:
+        try:
+            items = self._items(context)
+        except (KeyError, TypeError) as e:
+            yield self.templater.on_error(self.list_name, self.source, e)
+            return
+        usage = current_usage()
+        with LoopScope(context, self.item_name):
+            for item in items:
+                if usage is not None:
+                    usage.iterate()
+                context[self.item_name] = item
+                yield from iter_nodes(self.body, context)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        """Like render(), but also loops over asynchronous iterables."""
+        try:
+            items = self._items(context)
+        except (KeyError, TypeError) as e:
+            out.append(self.templater.on_error(self.list_name, self.source, e))
+            return
+        usage = current_usage()
+        with LoopScope(context, self.item_name):
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    if usage is not None:
+                        usage.iterate()
+                    context[self.item_name] = item
+                    await collect_nodes_async(self.body, context, out)
+            else:
+                for item in items:
+                    if usage is not None:
+                        usage.iterate()
+                    context[self.item_name] = item
+                    await collect_nodes_async(self.body, context, out)
+
+    async def render_async_iter(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        try:
+            items = self._items(context)
+        except (KeyError, TypeError) as e:
+            yield self.templater.on_error(self.list_name, self.source, e)
+            return
+        usage = current_usage()
+        with LoopScope(context, self.item_name):
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    if usage is not None:
+                        usage.iterate()
+                    context[self.item_name] = item
+                    async for chunk in iter_nodes_async(self.body, context):
+                        yield chunk
+            else:
+                for item in items:
+                    if usage is not None:
+                        usage.iterate()
+                    context[self.item_name] = item
+                    async for chunk in iter_nodes_async(self.body, context):
+                        yield chunk
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        body = nodes_dependencies(self.body, visiting)
+        if body is None:
+            return None
+        return (body - {self.item_name}) | {self.accessor.head}
+
+    def _items(self, context: Dict[str, Any]) -> Any:
+        return self.accessor.get(context)
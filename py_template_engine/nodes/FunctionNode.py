@@ -0,0 +1,60 @@
+import inspect
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from py_template_engine.Memo import call
+from py_template_engine.nodes.Node import Node, Pending
+from py_template_engine.PathAccessor import compile_path
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.FunctionTemplater import FunctionTemplater
+
+
+class FunctionNode(Node):
+    __slots__ = ("name", "accessor", "templater")
+
+    inserts_value = True
+
+    def __init__(self, name: str, templater: "FunctionTemplater") -> None:
+        self.name = name
+        self.accessor = compile_path(name)
+        self.templater = templater
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        try:
+            value = call(self.accessor.get(context), self.templater.memoize)
+        except (KeyError, TypeError) as e:
+            out.append(self.templater.on_error(self.name, e))
+            return
+        escape = self.templater.escape
+        if escape is not None:
+            out.append(escape(value))
+        else:
+            out.append(value if type(value) is str else str(value))
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        """Like render(), but a returned awaitable is left as a Pending value."""
+        try:
+            value = call(self.accessor.get(context), self.templater.memoize)
+        except (KeyError, TypeError) as e:
+            out.append(self.templater.on_error(self.name, e))
+            return
+        if inspect.isawaitable(value):
+            out.append(Pending(value, self._resolve))
+        else:
+            out.append(self._text(value))
+
+    def _resolve(self, value: Any) -> str:
+        if isinstance(value, (KeyError, TypeError)):
+            return self.templater.on_error(self.name, value)
+        if isinstance(value, BaseException):
+            raise value
+        return self._text(value)
+
+    def _text(self, value: Any) -> str:
+        escape = self.templater.escape
+        if escape is not None:
+            return escape(value)
+        return value if type(value) is str else str(value)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        return frozenset((self.accessor.head,))
@@ -0,0 +1,181 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from py_template_engine.nodes.Node import (
+    Node,
+    collect_nodes_async,
+    iter_nodes,
+    iter_nodes_async,
+    nodes_dependencies,
+    resolve_pending,
+)
+from py_template_engine.nodes.TextNode import TextNode
+from py_template_engine.PathAccessor import compile_path
+
+
+def trim_output(out: List[Any], marks: List[int], values: Sequence[bool]) -> None:
+    """Strip the whitespace around a rendered branch.
+
+    ``marks`` holds the output length before the branch and after every
+    piece Node.render_marked() reported, ``values`` tells the inserted
+    values apart, whose output is kept as it is.
+    """
+    for index, is_value in enumerate(values):
+        if is_value or _strip(out, range(marks[index], marks[index + 1]), True):
+            break
+    for index in range(len(values) - 1, -1, -1):
+        if values[index] or _strip(out, range(marks[index + 1] - 1, marks[index] - 1, -1), False):
+            break
+
+
+def _strip(out: List[Any], positions: range, left: bool) -> bool:
+    """Strip pieces until one keeps some text; returns whether one did."""
+    for position in positions:
+        piece = out[position].lstrip() if left else out[position].rstrip()
+        out[position] = piece
+        if piece:
+            return True
+    return False
+
+
+def _trimmed_edge(node: Node, strip: Callable[[str], str]) -> bool:
+    """Whether the output of ``node`` at a branch edge may need trimming."""
+    if node.inserts_value:
+        return False
+    if isinstance(node, TextNode):
+        return strip(node.text) != node.text
+    return True
+
+
+class IfNode(Node):
+    """Renders one of its branches, stripped of surrounding whitespace.
+
+    Whitespace of the branch's own text is stripped when it is compiled. A
+    branch starting or ending with a block, whose output is only known when
+    rendering, is trimmed after it was rendered, as the string pipeline
+    trimmed a branch after rendering the blocks inside it. Values inserted
+    at the edges, also through nested IFs and INCLUDEs, are kept as they are.
+    """
+
+    __slots__ = ("condition", "accessor", "body", "else_body", "trim")
+
+    streams = True
+
+    def __init__(
+        self,
+        condition: str,
+        body: Tuple[Node, ...],
+        else_body: Optional[Tuple[Node, ...]] = None,
+    ) -> None:
+        self.condition = condition
+        self.accessor = compile_path(condition)
+        self.body = body
+        self.else_body = else_body
+        self.trim = any(
+            _trimmed_edge(branch[0], str.lstrip) or _trimmed_edge(branch[-1], str.rstrip)
+            for branch in (body, else_body)
+            if branch
+        )
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        branch = self._branch(context)
+        if not branch:
+            return
+        if not self.trim:
+            for node in branch:
+                node.render(context, out)
+            return
+        self._render_marked(branch, context, out, [len(out)], [])
+
+    def render_iter(self, context: Dict[str, Any]) -> Iterator[str]:
+        if self.trim:
+            # The branch is trimmed as a whole, so it is not streamed
+            yield from super().render_iter(context)
+            return
+        branch = self._branch(context)
+        if branch:
+            yield from iter_nodes(branch, context)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        branch = self._branch(context)
+        if not branch:
+            return
+        if not self.trim:
+            await collect_nodes_async(branch, context, out)
+            return
+        await self._render_marked_async(branch, context, out, [len(out)], [])
+
+    async def render_async_iter(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        if self.trim:
+            async for chunk in super().render_async_iter(context):
+                yield chunk
+            return
+        branch = self._branch(context)
+        if branch:
+            async for chunk in iter_nodes_async(branch, context):
+                yield chunk
+
+    def render_marked(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        branch = self._branch(context)
+        if branch:
+            self._render_marked(branch, context, out, marks, values)
+
+    async def render_marked_async(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        branch = self._branch(context)
+        if branch:
+            await self._render_marked_async(branch, context, out, marks, values)
+
+    def _render_marked(
+        self,
+        branch: Tuple[Node, ...],
+        context: Dict[str, Any],
+        out: List[Any],
+        marks: List[int],
+        values: List[bool],
+    ) -> None:
+        start = len(values)
+        for node in branch:
+            node.render_marked(context, out, marks, values)
+        if self.trim:
+            trim_output(out, marks[start:], values[start:])
+
+    async def _render_marked_async(
+        self,
+        branch: Tuple[Node, ...],
+        context: Dict[str, Any],
+        out: List[Any],
+        marks: List[int],
+        values: List[bool],
+    ) -> None:
+        start = len(values)
+        for node in branch:
+            await node.render_marked_async(context, out, marks, values)
+        if self.trim:
+            # Trimming needs the text, so the branch's awaitables settle here
+            await resolve_pending(out, marks[start])
+            trim_output(out, marks[start:], values[start:])
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        body = nodes_dependencies(self.body + (self.else_body or ()), visiting)
+        return None if body is None else body | {self.accessor.head}
+
+    def _branch(self, context: Dict[str, Any]) -> Optional[Tuple[Node, ...]]:
+        try:
+            value = self.accessor.get(context)
+        except (KeyError, TypeError):
+            value = False
+        return self.body if value else self.else_body
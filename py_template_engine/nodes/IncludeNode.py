@@ -0,0 +1,128 @@
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from py_template_engine.nodes.Node import (
+    Node,
+    collect_nodes_async,
+    iter_nodes,
+    iter_nodes_async,
+    nodes_dependencies,
+)
+from py_template_engine.RenderBudget import nested
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.IncludeTemplater import IncludeTemplater
+    from py_template_engine.TemplateParser import TemplateParser
+
+
+class IncludeNode(Node):
+    """Inlines another file; its content is templated like the including file.
+
+    The file is compiled together with the including template. Only a file
+    that was missing at compile time is looked up again on every render.
+    """
+
+    __slots__ = ("path", "templater", "parser", "body")
+
+    streams = True
+
+    def __init__(
+        self,
+        path: str,
+        templater: "IncludeTemplater",
+        parser: "TemplateParser",
+        body: Optional[Tuple[Node, ...]] = None,
+    ) -> None:
+        self.path = path
+        self.templater = templater
+        self.parser = parser
+        self.body = body
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            out.append(self.templater.on_error(self.path, e))
+            return
+        with nested():
+            for node in nodes:
+                node.render(context, out)
+
+    def render_iter(self, context: Dict[str, Any]) -> Iterator[str]:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            yield self.templater.on_error(self.path, e)
+            return
+        with nested():
+            yield from iter_nodes(nodes, context)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            out.append(self.templater.on_error(self.path, e))
+            return
+        with nested():
+            await collect_nodes_async(nodes, context, out)
+
+    async def render_async_iter(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            yield self.templater.on_error(self.path, e)
+            return
+        with nested():
+            async for chunk in iter_nodes_async(nodes, context):
+                yield chunk
+
+    def render_marked(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        # The included text is templated like the including file, so its
+        # values are kept apart too
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError:
+            super().render_marked(context, out, marks, values)
+            return
+        with nested():
+            for node in nodes:
+                node.render_marked(context, out, marks, values)
+
+    async def render_marked_async(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError:
+            await super().render_marked_async(context, out, marks, values)
+            return
+        with nested():
+            for node in nodes:
+                await node.render_marked_async(context, out, marks, values)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        path = os.path.abspath(self.path)
+        if path in visiting:
+            return frozenset()
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError:
+            return frozenset()
+        return nodes_dependencies(nodes, (*visiting, path))
+
+    def _nodes(self) -> Tuple[Node, ...]:
+        if self.body is not None:
+            return self.body
+        return self.parser.parse_file(self.path)
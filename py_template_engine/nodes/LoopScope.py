@@ -0,0 +1,29 @@
+from typing import Any, Dict
+
+_MISSING = object()
+
+
+class LoopScope:
+    """Binds a loop variable in the render context while a loop runs.
+
+    The value the name had before is saved once and restored on exit, so
+    every item is a single assignment instead of a copy of the context.
+    Nested loops form a stack of saved values on the Python call stack.
+    """
+
+    __slots__ = ("context", "name", "previous")
+
+    def __init__(self, context: Dict[str, Any], name: str) -> None:
+        self.context = context
+        self.name = name
+        self.previous: Any = _MISSING
+
+    def __enter__(self) -> "LoopScope":
+        self.previous = self.context.get(self.name, _MISSING)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.previous is _MISSING:
+            self.context.pop(self.name, None)
+        else:
+            self.context[self.name] = self.previous
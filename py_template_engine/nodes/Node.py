@@ -0,0 +1,174 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+class Node(ABC):
+    """A single element of a compiled template tree.
+
+    Nodes are built once by the TemplateParser and never mutated afterwards,
+    so the same tree can be rendered any number of times.
+    """
+
+    __slots__ = ()
+
+    # Block nodes stream their content piece by piece in render_iter(); all
+    # other nodes are rendered in one go.
+    streams = False
+
+    # Variables and functions insert values, which an enclosing IF does not
+    # strip: the string pipeline substituted them after trimming the branch.
+    inserts_value = False
+
+    @abstractmethod
+    def render(self, context: Dict[str, Any], out: List[Any]) -> None:
+        raise NotImplementedError
+
+    def render_iter(self, context: Dict[str, Any]) -> Iterator[str]:
+        out: List[str] = []
+        self.render(context, out)
+        yield "".join(out)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        """Render into ``out``, which may receive ``Pending`` placeholders.
+
+        Block nodes leave the placeholders of their children in ``out`` too,
+        so they are awaited together with every other awaitable of the render
+        by render_nodes_async(). Only nodes that need the text, such as CACHE
+        and custom tags, await theirs early.
+        """
+        self.render(context, out)
+
+    async def render_async_iter(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        out: List[Any] = []
+        await render_nodes_async((self,), context, out)
+        yield "".join(out)
+
+    def render_marked(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        """Render for an IF trimming its branch.
+
+        Appends where the output of every inserted value and every other
+        piece ends to ``marks``, and whether it is a value to ``values``.
+        """
+        self.render(context, out)
+        marks.append(len(out))
+        values.append(self.inserts_value)
+
+    async def render_marked_async(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        await self.render_async(context, out)
+        marks.append(len(out))
+        values.append(self.inserts_value)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        """The names of the context keys the node reads, or None if unknown.
+
+        ``visiting`` holds the template files being analysed, so recursive
+        RENDER tags stop there.
+        """
+        return None
+
+
+def nodes_dependencies(
+    nodes: Sequence[Node], visiting: Tuple[str, ...] = ()
+) -> Optional[FrozenSet[str]]:
+    """The union of the dependencies of ``nodes``, None if one is unknown."""
+    names: FrozenSet[str] = frozenset()
+    for node in nodes:
+        dependencies = node.dependencies(visiting)
+        if dependencies is None:
+            return None
+        names |= dependencies
+    return names
+
+
+class Pending:
+    """An awaitable returned by a template function, awaiting its turn."""
+
+    __slots__ = ("awaitable", "resolve")
+
+    def __init__(self, awaitable: Awaitable[Any], resolve: Any) -> None:
+        self.awaitable = awaitable
+        # Turns the awaited value, or the exception it raised, into output
+        self.resolve = resolve
+
+
+def iter_nodes(nodes: Sequence[Node], context: Dict[str, Any]) -> Iterator[str]:
+    """Render nodes as a stream of chunks.
+
+    Consecutive leaf nodes are joined into one chunk, block nodes are
+    streamed through their own render_iter().
+    """
+    out: List[str] = []
+    for node in nodes:
+        if node.streams:
+            if out:
+                yield "".join(out)
+                out = []
+            yield from node.render_iter(context)
+        else:
+            node.render(context, out)
+    if out:
+        yield "".join(out)
+
+
+async def collect_nodes_async(
+    nodes: Sequence[Node], context: Dict[str, Any], out: List[Any]
+) -> None:
+    """Render nodes, leaving their pending values in ``out`` for the caller."""
+    for node in nodes:
+        await node.render_async(context, out)
+
+
+async def render_nodes_async(
+    nodes: Sequence[Node], context: Dict[str, Any], out: List[Any]
+) -> None:
+    """Render nodes and await all their pending values concurrently."""
+    start = len(out)
+    await collect_nodes_async(nodes, context, out)
+    await resolve_pending(out, start)
+
+
+async def resolve_pending(out: List[Any], start: int = 0) -> None:
+    indices = [index for index in range(start, len(out)) if type(out[index]) is Pending]
+    if not indices:
+        return
+    values = await asyncio.gather(
+        *(out[index].awaitable for index in indices), return_exceptions=True
+    )
+    for index, value in zip(indices, values):
+        out[index] = out[index].resolve(value)
+
+
+async def iter_nodes_async(
+    nodes: Sequence[Node], context: Dict[str, Any]
+) -> AsyncIterator[str]:
+    """Asynchronous counterpart of iter_nodes()."""
+    out: List[Any] = []
+    for node in nodes:
+        if node.streams:
+            if out:
+                await resolve_pending(out)
+                yield "".join(out)
+                out = []
+            async for chunk in node.render_async_iter(context):
+                yield chunk
+        else:
+            await node.render_async(context, out)
+    if out:
+        await resolve_pending(out)
+        yield "".join(out)
@@ -0,0 +1,65 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from py_template_engine.nodes.Node import Node
+
+if TYPE_CHECKING:
+    from py_template_engine.Profiler import ProfileKey, Profiler
+
+
+class ProfiledNode(Node):
+    """Wraps a node to report its render time to a Profiler.
+
+    Only parsers that were given a profiler produce these, so templates that
+    are not profiled keep their plain nodes.
+    """
+
+    __slots__ = ("node", "key", "profiler")
+
+    def __init__(self, node: Node, key: "ProfileKey", profiler: "Profiler") -> None:
+        self.node = node
+        self.key = key
+        self.profiler = profiler
+
+    def render(self, context: Dict[str, Any], out: List[Any]) -> None:
+        token = self.profiler.enter(self.key)
+        start = time.perf_counter()
+        try:
+            self.node.render(context, out)
+        finally:
+            self.profiler.exit(token, time.perf_counter() - start)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        token = self.profiler.enter(self.key)
+        start = time.perf_counter()
+        try:
+            await self.node.render_async(context, out)
+        finally:
+            self.profiler.exit(token, time.perf_counter() - start)
+
+    @property
+    def inserts_value(self) -> bool:  # type: ignore[override]
+        return self.node.inserts_value
+
+    def render_marked(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        token = self.profiler.enter(self.key)
+        start = time.perf_counter()
+        try:
+            self.node.render_marked(context, out, marks, values)
+        finally:
+            self.profiler.exit(token, time.perf_counter() - start)
+
+    async def render_marked_async(
+        self, context: Dict[str, Any], out: List[Any], marks: List[int], values: List[bool]
+    ) -> None:
+        token = self.profiler.enter(self.key)
+        start = time.perf_counter()
+        try:
+            await self.node.render_marked_async(context, out, marks, values)
+        finally:
+            self.profiler.exit(token, time.perf_counter() - start)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        return self.node.dependencies(visiting)
@@ -0,0 +1,102 @@
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from py_template_engine.nodes.Node import (
+    Node,
+    collect_nodes_async,
+    iter_nodes,
+    iter_nodes_async,
+    nodes_dependencies,
+)
+from py_template_engine.RenderBudget import nested
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.RenderTemplater import RenderTemplater
+    from py_template_engine.TemplateParser import TemplateParser
+
+
+class RenderNode(Node):
+    """Renders another template file with the current context.
+
+    The file is linked when the template is compiled. Recursive RENDER tags,
+    and files that were missing at compile time, are looked up on render.
+    """
+
+    __slots__ = ("path", "templater", "parser", "target")
+
+    streams = True
+
+    def __init__(
+        self,
+        path: str,
+        templater: "RenderTemplater",
+        parser: "TemplateParser",
+        target: Optional[Tuple[Node, ...]] = None,
+    ) -> None:
+        self.path = path
+        self.templater = templater
+        self.parser = parser
+        self.target = target
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            out.append(self.templater.on_error(self.path, e))
+            return
+        with nested():
+            for node in nodes:
+                node.render(context, out)
+
+    def render_iter(self, context: Dict[str, Any]) -> Iterator[str]:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            yield self.templater.on_error(self.path, e)
+            return
+        with nested():
+            yield from iter_nodes(nodes, context)
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            out.append(self.templater.on_error(self.path, e))
+            return
+        with nested():
+            await collect_nodes_async(nodes, context, out)
+
+    async def render_async_iter(self, context: Dict[str, Any]) -> AsyncIterator[str]:
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError as e:
+            yield self.templater.on_error(self.path, e)
+            return
+        with nested():
+            async for chunk in iter_nodes_async(nodes, context):
+                yield chunk
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        path = os.path.abspath(self.path)
+        if path in visiting:
+            return frozenset()
+        try:
+            nodes = self._nodes()
+        except FileNotFoundError:
+            return frozenset()
+        return nodes_dependencies(nodes, (*visiting, path))
+
+    def _nodes(self) -> Tuple[Node, ...]:
+        if self.target is not None:
+            return self.target
+        return self.parser.parse_file(self.path)
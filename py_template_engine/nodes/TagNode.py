@@ -0,0 +1,41 @@
+import inspect
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from py_template_engine.nodes.Node import Node, render_nodes_async
+
+if TYPE_CHECKING:
+    from py_template_engine.TemplaterInterface import TemplaterInterface
+
+
+class TagNode(Node):
+    """A tag of a custom templater, rendered through its ``process`` method."""
+
+    __slots__ = ("templater", "arguments", "branches")
+
+    def __init__(
+        self,
+        templater: "TemplaterInterface",
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...] = (),
+    ) -> None:
+        self.templater = templater
+        self.arguments = arguments
+        self.branches = branches
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        rendered = []
+        for branch in self.branches:
+            branch_out: List[str] = []
+            for node in branch:
+                node.render(context, branch_out)
+            rendered.append("".join(branch_out))
+        out.append(self.templater.process(*self.arguments, *rendered, **context))
+
+    async def render_async(self, context: Dict[str, Any], out: List[Any]) -> None:
+        rendered = []
+        for branch in self.branches:
+            branch_out: List[Any] = []
+            await render_nodes_async(branch, context, branch_out)
+            rendered.append("".join(branch_out))
+        value = self.templater.process(*self.arguments, *rendered, **context)
+        out.append(await value if inspect.isawaitable(value) else value)
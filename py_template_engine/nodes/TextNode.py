@@ -0,0 +1,16 @@
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from py_template_engine.nodes.Node import Node
+
+
+class TextNode(Node):
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        out.append(self.text)
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        return frozenset()
@@ -0,0 +1,13 @@
+from py_template_engine.nodes.TextNode import TextNode
+
+
+class ValueNode(TextNode):
+    """The text of a variable or function folded by bind().
+
+    It stays marked as a value, so an enclosing IF keeps its whitespace as it
+    keeps that of the tag it replaced.
+    """
+
+    __slots__ = ()
+
+    inserts_value = True
@@ -0,0 +1,33 @@
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+from py_template_engine.nodes.Node import Node
+from py_template_engine.PathAccessor import compile_path
+
+if TYPE_CHECKING:
+    from py_template_engine.sub_engines.VariableTemplater import VariableTemplater
+
+
+class VariableNode(Node):
+    __slots__ = ("name", "accessor", "templater")
+
+    inserts_value = True
+
+    def __init__(self, name: str, templater: "VariableTemplater") -> None:
+        self.name = name
+        self.accessor = compile_path(name)
+        self.templater = templater
+
+    def render(self, context: Dict[str, Any], out: List[str]) -> None:
+        try:
+            value = self.accessor.get(context)
+        except KeyError as e:
+            out.append(self.templater.on_error(self.name, e))
+            return
+        escape = self.templater.escape
+        if escape is not None:
+            out.append(escape(value))
+        else:
+            out.append(value if type(value) is str else str(value))
+
+    def dependencies(self, visiting: Tuple[str, ...] = ()) -> Optional[FrozenSet[str]]:
+        return frozenset((self.accessor.head,))
@@ -0,0 +1,32 @@
+"""
+Nodes of a compiled template tree.
+
+The TemplateParser turns a template string into a tuple of these nodes once,
+and the TemplateEngine renders that tuple on every call.
+"""
+
+from .CacheNode import CacheNode
+from .EachNode import EachNode
+from .FunctionNode import FunctionNode
+from .IfNode import IfNode
+from .IncludeNode import IncludeNode
+from .Node import Node
+from .ProfiledNode import ProfiledNode
+from .RenderNode import RenderNode
+from .TextNode import TextNode
+from .ValueNode import ValueNode
+from .VariableNode import VariableNode
+
+__all__ = [
+    "Node",
+    "TextNode",
+    "VariableNode",
+    "FunctionNode",
+    "IfNode",
+    "EachNode",
+    "IncludeNode",
+    "RenderNode",
+    "CacheNode",
+    "ProfiledNode",
+    "ValueNode",
+]
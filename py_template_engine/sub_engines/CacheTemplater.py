@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from py_template_engine.FragmentCache import FragmentCache, MemoryFragmentCache
+from py_template_engine.nodes.CacheNode import CacheNode
+from py_template_engine.nodes.Node import Node
+from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
+from py_template_engine.TemplaterInterface import TemplaterInterface
+
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
+
+
+class CacheTemplater(TemplaterInterface):
+    """``{{#CACHE name[:path...] [ttl]}}...{{/CACHE}}`` renders its body once per
+    key and keeps it for ``ttl`` seconds (forever by default).
+
+    The key is ``name`` plus the values of the colon separated context paths,
+    e.g. ``{{#CACHE tile:product.id 300}}``.
+    """
+
+    tag = TagSyntax("#CACHE", r"\s+([^\s}]+)(?:\s+(\d+(?:\.\d+)?))?\s*", closing="/CACHE")
+
+    def __init__(
+        self, raise_on_error: bool = False, cache: Optional[FragmentCache] = None
+    ):
+        super().__init__(raise_on_error)
+        self.cache = cache or MemoryFragmentCache.default()
+
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        name, *paths = arguments[0].split(":")
+        ttl = float(arguments[1]) if len(arguments) > 1 else None
+        return CacheNode(name, tuple(paths), ttl, branches[0], source, self)
+
+    def on_error(self, name: str, source: str, error: Exception) -> None:
+        """Called when a key path is missing; the block is then rendered
+        without the cache."""
+        if self.raise_on_error:
+            raise RenderError(f"Trying to cache {name} but could not find {error}")
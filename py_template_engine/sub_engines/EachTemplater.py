@@ -1,10 +1,29 @@
 import re
-from functools import reduce
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from py_template_engine.nodes.EachNode import EachNode
+from py_template_engine.nodes.Node import Node
+from py_template_engine.ParallelEach import ParallelEach
+from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
 from py_template_engine.TemplaterInterface import TemplaterInterface
 
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
+
 
 class EachTemplater(TemplaterInterface):
+    tag = TagSyntax("#EACH", r"\s+([^}]+)\s+AS\s+([^}]+)", closing="/EACH")
+    MAX_CACHED_BODIES = 128
+
+    def __init__(
+        self, raise_on_error: bool = False, parallel: Optional[ParallelEach] = None
+    ):
+        super().__init__(raise_on_error)
+        self.parallel = parallel
+        self._parser: Optional["TemplateParser"] = None
+        self._bodies: Dict[str, Tuple[Node, ...]] = {}
+
     def render(self, template: str, **kwargs) -> str:
         return re.sub(
             r"{{#EACH\s+([^}]+)\s+AS\s+([^}]+)}}([\s\S]*?){{/EACH}}",
@@ -14,19 +33,41 @@ class EachTemplater(TemplaterInterface):
             template,
         )
 
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        return EachNode(arguments[0], arguments[1], branches[0], source, self)
+
     def process(
         self, list_name: str, item_name: str, item_template: str, **kwargs
     ) -> str:
-        # Import here to avoid circular import
-        from py_template_engine.TemplateEngine import TemplateEngine
-
-        return "".join(
-            [
-                TemplateEngine(template_string=item_template).render(
-                    **{**kwargs, item_name: item}
-                )
-                for item in reduce(
-                    lambda acc, part: acc[part], list_name.split("."), kwargs
-                )
-            ]
-        )
+        source = f"{{{{#EACH {list_name} AS {item_name}}}}}{item_template}{{{{/EACH}}}}"
+        node = EachNode(list_name, item_name, self._compile_body(item_template), source, self)
+        out: List[str] = []
+        node.render(kwargs, out)
+        return "".join(out)
+
+    def _compile_body(self, item_template: str) -> Tuple[Node, ...]:
+        """Parse a loop body once and reuse the node tree for every item."""
+        body = self._bodies.get(item_template)
+        if body is None:
+            if self._parser is None:
+                # Import here to avoid circular import
+                from py_template_engine.TemplateEngine import TemplateEngine
+                from py_template_engine.TemplateParser import TemplateParser
+
+                self._parser = TemplateParser(TemplateEngine.default_templaters())
+            if len(self._bodies) >= self.MAX_CACHED_BODIES:
+                self._bodies.clear()
+            body = self._bodies[item_template] = self._parser.parse(item_template)
+        return body
+
+    def on_error(self, list_name: str, source: str, error: Exception) -> str:
+        if self.raise_on_error:
+            raise RenderError(f"Trying to loop over {list_name} but could not find {error}")
+        else:
+            return source
@@ -1,11 +1,33 @@
 import re
-from functools import reduce
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from py_template_engine.TemplaterInterface import TemplaterInterface
+from py_template_engine.nodes.FunctionNode import FunctionNode
+from py_template_engine.Escaper import Escaper
+from py_template_engine.nodes.Node import Node
+from py_template_engine.PathAccessor import compile_path
 from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
+from py_template_engine.TemplaterInterface import TemplaterInterface
+
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
 
 
 class FunctionTemplater(TemplaterInterface):
+    tag = TagSyntax("", r"(\w+(?:\.\w+)*)\(\)")
+
+    def __init__(
+        self,
+        raise_on_error: bool = False,
+        memoize: bool = False,
+        escape: Optional[Escaper] = None,
+    ):
+        super().__init__(raise_on_error)
+        # Reuse each function's result for the rest of a render
+        self.memoize = memoize
+        # Applied to every returned value when autoescaping
+        self.escape = escape
+
     def render(self, template: str, **kwargs) -> str:
         return re.sub(
             r"{{(\w+(\.\w+)*)\(\)}}",
@@ -13,11 +35,24 @@ class FunctionTemplater(TemplaterInterface):
             template,
         )
 
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        return FunctionNode(arguments[0], self)
+
     def process(self, function_name: str, **kwargs) -> str:
         try:
-            return reduce(lambda acc, part: acc[part], function_name.split("."), kwargs)()
+            value = compile_path(function_name)(kwargs)()
         except (KeyError, TypeError) as e:
-            if self.raise_on_error:
-                raise RenderError(f"Trying to insert function {function_name} but could not find {e}")
-            else:
-                return f"{{{{{function_name}()}}}}"
+            return self.on_error(function_name, e)
+        return value if self.escape is None else self.escape(value)
+
+    def on_error(self, function_name: str, error: Exception) -> str:
+        if self.raise_on_error:
+            raise RenderError(f"Trying to insert function {function_name} but could not find {error}")
+        else:
+            return f"{{{{{function_name}()}}}}"
@@ -1,135 +1,130 @@
 import re
-from functools import reduce
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
+from py_template_engine.nodes.IfNode import IfNode
+from py_template_engine.nodes.Node import Node
+from py_template_engine.nodes.TextNode import TextNode
+from py_template_engine.PathAccessor import compile_path
+from py_template_engine.TagSyntax import TagSyntax
 from py_template_engine.TemplaterInterface import TemplaterInterface
-from py_template_engine.RenderError import RenderError
 
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
 
-class IfTemplater(TemplaterInterface):
-    def render(self, template: str, **kwargs) -> str:
-        # Process nested IF blocks recursively by finding innermost blocks first
-        while "{{#IF" in template:
-            template = self._process_innermost_if_block(template, **kwargs)
-        return template
+IF_TAG_PATTERN = re.compile(r"{{#IF\s+([^}]+)}}|{{#ELSE}}|{{/IF}}")
 
-    def _process_innermost_if_block(self, template: str, **kwargs) -> str:
-        """Find and process the innermost IF block that has no nested IF blocks inside it."""
 
-        # Find all IF block starts
-        if_starts = []
-        pos = 0
-        while True:
-            pos = template.find("{{#IF", pos)
-            if pos == -1:
-                break
-            if_starts.append(pos)
-            pos += 5
-
-        if not if_starts:
-            return template
-
-        # For each IF start, find its matching END and check if it's innermost
-        for if_start in reversed(
-            if_starts
-        ):  # Start from the end to find innermost first
-            # Find the condition name
-            condition_match = re.match(r"{{#IF\s+([^}]+)}}", template[if_start:])
-            if not condition_match:
-                continue
+class _OpenIf:
+    """An IF block seen by the matcher whose {{/IF}} has not been reached yet."""
 
-            condition_name = condition_match.group(1).strip()
-            content_start = if_start + condition_match.end()
-
-            # Find matching {{/IF}} and check for {{#ELSE}}
-            depth = 1
-            pos = content_start
-            else_pos = None
-            if_content_end = None
-
-            while pos < len(template) and depth > 0:
-                # Check for nested IF
-                if template[pos:].startswith("{{#IF"):
-                    depth += 1
-                    pos += 5
-                # Check for closing IF
-                elif template[pos:].startswith("{{/IF}}"):
-                    depth -= 1
-                    if depth == 0:
-                        if_content_end = pos
-                        break
-                    pos += 7
-                # Check for ELSE at current depth level
-                elif (
-                    template[pos:].startswith("{{#ELSE}}")
-                    and depth == 1
-                    and else_pos is None
-                ):
-                    else_pos = pos
-                    pos += 9
-                else:
-                    pos += 1
-
-            if if_content_end is None:
-                continue
+    __slots__ = ("tag", "live", "condition", "if_parts", "else_parts")
 
-            # Check if this is an innermost block (no nested IF blocks in the content)
-            if else_pos is not None:
-                if_content = template[content_start:else_pos]
-                else_content = template[else_pos + 9 : if_content_end]
-            else:
-                if_content = template[content_start:if_content_end]
-                else_content = None
-
-            # Check if this IF block contains nested IF blocks
-            if "{{#IF" not in if_content and (
-                else_content is None or "{{#IF" not in else_content
-            ):
-                # This is an innermost block, process it
-                result = self.process(
-                    condition_name, if_content, else_content, **kwargs
-                )
-
-                # Replace this IF block with the result
-                end_pos = if_content_end + 7  # +7 for {{/IF}}
-                new_template = template[:if_start] + result + template[end_pos:]
-                return new_template
-
-        # If no innermost block found, there might be a parsing error
-        # Fall back to simple processing of the first IF block
-        match = re.search(r"{{#IF\s+([^}]+)}}(.*?){{/IF}}", template, re.DOTALL)
-        if match:
-            condition_name = match.group(1).strip()
-            content = match.group(2)
-
-            # Simple ELSE handling for fallback
-            if "{{#ELSE}}" in content:
-                parts = content.split("{{#ELSE}}", 1)
-                if_content = parts[0]
-                else_content = parts[1]
-            else:
-                if_content = content
-                else_content = None
+    def __init__(self, tag: str, live: bool, condition: bool) -> None:
+        self.tag = tag
+        self.live = live
+        self.condition = condition
+        self.if_parts: List[str] = []
+        self.else_parts: Optional[List[str]] = None
+
+    @property
+    def parts(self) -> List[str]:
+        return self.if_parts if self.else_parts is None else self.else_parts
+
+    @property
+    def taking_current_branch(self) -> bool:
+        return self.live and self.condition == (self.else_parts is None)
 
-            result = self.process(condition_name, if_content, else_content, **kwargs)
-            return template[: match.start()] + result + template[match.end() :]
 
-        return template
+class IfTemplater(TemplaterInterface):
+    tag = TagSyntax("#IF", r"\s+([^}]+)", closing="/IF", separators=("#ELSE",))
+
+    def render(self, template: str, **kwargs) -> str:
+        """Match IF/ELSE/END tags in one pass with a stack of open blocks.
+
+        Conditions are looked up when their block opens, so blocks inside a
+        branch that is not taken are never evaluated.
+        """
+        root: List[str] = []
+        stack: List[_OpenIf] = []
+        parts = root
+        pos = 0
+
+        for match in IF_TAG_PATTERN.finditer(template):
+            parts.append(template[pos : match.start()])
+            pos = match.end()
+            tag = match.group(0)
+
+            if match.group(1) is not None:
+                live = not stack or stack[-1].taking_current_branch
+                condition = live and self._condition(match.group(1).strip(), kwargs)
+                stack.append(_OpenIf(tag, live, condition))
+            elif not stack or (tag == "{{#ELSE}}" and stack[-1].else_parts is not None):
+                parts.append(tag)
+                continue
+            elif tag == "{{#ELSE}}":
+                stack[-1].else_parts = []
+            else:
+                block = stack.pop()
+                parts = stack[-1].parts if stack else root
+                if block.live:
+                    parts.append(self._branch(block))
+                continue
+            parts = stack[-1].parts
+
+        parts.append(template[pos:])
+        # Blocks without {{/IF}} are left as they are
+        while stack:
+            block = stack.pop()
+            parts = stack[-1].parts if stack else root
+            parts.append(block.tag + "".join(block.if_parts))
+            if block.else_parts is not None:
+                parts.append("{{#ELSE}}" + "".join(block.else_parts))
+        return "".join(root)
+
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        else_body = self._strip(branches[1]) if len(branches) > 1 else None
+        return IfNode(arguments[0], self._strip(branches[0]), else_body)
+
+    @staticmethod
+    def _strip(nodes: Tuple[Node, ...]) -> Tuple[Node, ...]:
+        """Branches are stripped of surrounding whitespace, as render() does."""
+        stripped = list(nodes)
+        if stripped and isinstance(stripped[0], TextNode):
+            stripped[0] = TextNode(stripped[0].text.lstrip())
+        if stripped and isinstance(stripped[-1], TextNode):
+            stripped[-1] = TextNode(stripped[-1].text.rstrip())
+        return tuple(
+            node for node in stripped if not isinstance(node, TextNode) or node.text
+        )
+
+    @staticmethod
+    def _branch(block: _OpenIf) -> str:
+        if block.condition:
+            return "".join(block.if_parts).strip()
+        elif block.else_parts is not None:
+            return "".join(block.else_parts).strip()
+        else:
+            return ""
+
+    @staticmethod
+    def _condition(condition_name: str, kwargs: Any) -> bool:
+        try:
+            return bool(compile_path(condition_name)(kwargs))
+        except (KeyError, TypeError):
+            return False
 
     def process(
         self, condition_name: str, if_content: str, else_content: str, **kwargs
     ) -> str:
-        try:
-            condition = reduce(
-                lambda acc, part: acc[part], condition_name.split("."), kwargs
-            )
-            if condition:
-                return if_content.strip() if if_content else ""
-            elif else_content is not None:
-                return else_content.strip()
-            else:
-                return ""
-        except (KeyError, TypeError):
-            if else_content is not None:
-                return else_content.strip()
-            else:
-                return ""
+        if self._condition(condition_name, kwargs):
+            return if_content.strip() if if_content else ""
+        elif else_content is not None:
+            return else_content.strip()
+        else:
+            return ""
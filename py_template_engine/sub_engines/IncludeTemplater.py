@@ -1,9 +1,28 @@
 import re
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from py_template_engine.TemplaterInterface import TemplaterInterface
+from py_template_engine.nodes.IncludeNode import IncludeNode
+from py_template_engine.nodes.Node import Node
 from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
+from py_template_engine.TemplateLoader import TemplateLoader
+from py_template_engine.TemplaterInterface import TemplaterInterface
+
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
+
 
 class IncludeTemplater(TemplaterInterface):
+    tag = TagSyntax("#INCLUDE ", r"(.*?)")
+
+    def __init__(
+        self, raise_on_error: bool = False, loader: Optional[TemplateLoader] = None
+    ):
+        super().__init__(raise_on_error)
+        # Read by the string based render() pass; compiled templates use
+        # their parser's loader
+        self.loader = loader or TemplateLoader.default()
+
     def render(self, template: str, **kwargs) -> str:
         return re.sub(
             r"{{#INCLUDE (.*?)}}",
@@ -11,12 +30,28 @@ class IncludeTemplater(TemplaterInterface):
             template,
         )
 
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        try:
+            body = parser.parse_reference(arguments[0], inline=True)
+        except FileNotFoundError:
+            # Looked up again on render, where on_error() handles it
+            body = None
+        return IncludeNode(arguments[0], self, parser, body)
+
     def process(self, include_path: str, **kwargs) -> str:
         try:
-            with open(include_path, "r") as file:
-                return file.read()
+            return self.loader.get_source(include_path)
         except FileNotFoundError as e:
-            if self.raise_on_error:
-                raise RenderError(f"Trying to include file but could not find path '{include_path}'")
-            else:
-                return f"{{{{#INCLUDE {include_path}}}}}"
+            return self.on_error(include_path, e)
+
+    def on_error(self, include_path: str, error: Exception) -> str:
+        if self.raise_on_error:
+            raise RenderError(f"Trying to include file but could not find path '{include_path}'")
+        else:
+            return f"{{{{#INCLUDE {include_path}}}}}"
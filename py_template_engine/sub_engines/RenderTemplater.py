@@ -1,10 +1,27 @@
 import re
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from py_template_engine.nodes.Node import Node
+from py_template_engine.nodes.RenderNode import RenderNode
 from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
+from py_template_engine.TemplateLoader import TemplateLoader
 from py_template_engine.TemplaterInterface import TemplaterInterface
 
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
+
 
 class RenderTemplater(TemplaterInterface):
+    tag = TagSyntax("#RENDER ", r"(.*?)")
+
+    def __init__(
+        self, raise_on_error: bool = False, loader: Optional[TemplateLoader] = None
+    ):
+        super().__init__(raise_on_error)
+        # Used by the string based render() pass, None is the shared loader
+        self.loader = loader
+
     def render(self, template: str, **kwargs) -> str:
         return re.sub(
             r"{{#RENDER (.*?)}}",
@@ -12,14 +29,32 @@ class RenderTemplater(TemplaterInterface):
             template,
         )
 
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        try:
+            target = parser.parse_reference(arguments[0], inline=False)
+        except FileNotFoundError:
+            # Looked up again on render, where on_error() handles it
+            target = None
+        return RenderNode(arguments[0], self, parser, target)
+
     def process(self, render_path: str, **kwargs) -> str:
         # Import here to avoid circular import
         from py_template_engine.TemplateEngine import TemplateEngine
 
         try:
-            return TemplateEngine(template_path=render_path).render(**kwargs)
+            engine = TemplateEngine(template_path=render_path, loader=self.loader)
+            return engine.render(**kwargs)
         except FileNotFoundError as e:
-            if self.raise_on_error:
-                raise RenderError(f"Trying to render template but could not find path '{render_path}'")
-            else:
-                return f"{{{{#RENDER {render_path}}}}}"
+            return self.on_error(render_path, e)
+
+    def on_error(self, render_path: str, error: Exception) -> str:
+        if self.raise_on_error:
+            raise RenderError(f"Trying to render template but could not find path '{render_path}'")
+        else:
+            return f"{{{{#RENDER {render_path}}}}}"
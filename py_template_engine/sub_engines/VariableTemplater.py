@@ -1,11 +1,26 @@
 import re
-from functools import reduce
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from py_template_engine.Escaper import Escaper
+from py_template_engine.nodes.Node import Node
+from py_template_engine.nodes.VariableNode import VariableNode
+from py_template_engine.PathAccessor import compile_path
 from py_template_engine.RenderError import RenderError
+from py_template_engine.TagSyntax import TagSyntax
 from py_template_engine.TemplaterInterface import TemplaterInterface
 
+if TYPE_CHECKING:
+    from py_template_engine.TemplateParser import TemplateParser
+
 
 class VariableTemplater(TemplaterInterface):
+    tag = TagSyntax("", r"(.*?)")
+
+    def __init__(self, raise_on_error: bool = False, escape: Optional[Escaper] = None):
+        super().__init__(raise_on_error)
+        # Applied to every inserted value when autoescaping
+        self.escape = escape
+
     def render(self, template: str, **kwargs) -> str:
         return re.sub(
             r"{{(.*?)}}",
@@ -13,11 +28,24 @@ class VariableTemplater(TemplaterInterface):
             template,
         )
 
+    def compile(
+        self,
+        arguments: Tuple[str, ...],
+        branches: Tuple[Tuple[Node, ...], ...],
+        source: str,
+        parser: "TemplateParser",
+    ) -> Node:
+        return VariableNode(arguments[0], self)
+
     def process(self, variable_name: str, **kwargs) -> str:
         try:
-            return reduce(lambda acc, part: acc[part], variable_name.split("."), kwargs)
+            value = compile_path(variable_name)(kwargs)
         except KeyError as e:
-            if self.raise_on_error:
-                raise RenderError(f"Trying to insert variable {variable_name} but could not find {e}")
-            else:
-                return f"{{{{{variable_name}}}}}"
+            return self.on_error(variable_name, e)
+        return value if self.escape is None else self.escape(value)
+
+    def on_error(self, variable_name: str, error: Exception) -> str:
+        if self.raise_on_error:
+            raise RenderError(f"Trying to insert variable {variable_name} but could not find {error}")
+        else:
+            return f"{{{{{variable_name}}}}}"
@@ -4,6 +4,7 @@ Sub-engines for the py-template-engine.
 This package contains the individual templating engines for different template features.
 """
 
+from .CacheTemplater import CacheTemplater
 from .EachTemplater import EachTemplater
 from .FunctionTemplater import FunctionTemplater
 from .IfTemplater import IfTemplater
@@ -18,4 +19,5 @@ __all__ = [
     "EachTemplater",
     "IncludeTemplater",
     "RenderTemplater",
+    "CacheTemplater",
 ]
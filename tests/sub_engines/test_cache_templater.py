@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.FragmentCache import MemoryFragmentCache
+from py_template_engine.RenderError import RenderError
+from py_template_engine.sub_engines.CacheTemplater import CacheTemplater
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"#{self.calls}"
+
+
+class TestCacheTemplater(TestCase):
+
+    def setUp(self):
+        self.cache = MemoryFragmentCache()
+        self.counter = Counter()
+
+    def render(self, template, backend="interpreter", **kwargs):
+        engine = TemplateEngine(
+            template_string=template, backend=backend, fragment_cache=self.cache
+        )
+        return engine.render(expensive=self.counter, **kwargs)
+
+    def test_fragment_is_rendered_once(self):
+        """Test that a cached block is served from the cache on later renders."""
+        template = "<nav>{{#CACHE nav}}{{expensive()}}{{/CACHE}}</nav>"
+        for backend in TemplateEngine.BACKENDS:
+            self.assertEqual(self.render(template, backend), "<nav>#1</nav>")
+        self.assertEqual(self.counter.calls, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_key_paths_inside_each(self):
+        """Test that context paths in the key give every loop item its own fragment."""
+        template = "{{#EACH products AS p}}[{{#CACHE tile:p.id}}{{p.name}}{{expensive()}}{{/CACHE}}]{{/EACH}}"
+        products = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1, "name": "a"}]
+        self.assertEqual(self.render(template, products=products), "[a#1][b#2][a#1]")
+        self.assertEqual(self.counter.calls, 2)
+
+    def test_ttl_expires(self):
+        """Test that a fragment is rendered again once its ttl passed."""
+        now = [0.0]
+        self.cache = MemoryFragmentCache(clock=lambda: now[0])
+        template = "{{#CACHE clock 60}}{{expensive()}}{{/CACHE}}"
+        self.assertEqual(self.render(template), "#1")
+        now[0] = 59
+        self.assertEqual(self.render(template), "#1")
+        now[0] = 61
+        self.assertEqual(self.render(template), "#2")
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_nested_render(self):
+        """Test that CACHE blocks work in templates pulled in with RENDER."""
+        with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False) as f:
+            f.write("{{#CACHE footer}}{{expensive()}}{{/CACHE}}")
+        try:
+            template = f"{{{{#RENDER {f.name}}}}}|{{{{#RENDER {f.name}}}}}"
+            self.assertEqual(self.render(template), "#1|#1")
+        finally:
+            os.unlink(f.name)
+
+    def test_missing_key_path(self):
+        """Test that a missing key path renders uncached, or raises with raise_on_error."""
+        template = "{{#CACHE user:user.id}}{{expensive()}}{{/CACHE}}"
+        self.assertEqual(self.render(template), "#1")
+        self.assertEqual(self.render(template), "#2")
+        with self.assertRaises(RenderError):
+            CacheTemplater(raise_on_error=True, cache=self.cache).render(template)
+
+
+class TestMemoryFragmentCache(TestCase):
+
+    def test_lru_eviction(self):
+        """Test that the least recently used fragment is evicted first."""
+        cache = MemoryFragmentCache(max_size=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["size"], 2)
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from py_template_engine.sub_engines.EachTemplater import EachTemplater
+from py_template_engine.RenderError import RenderError
 
 
 class TestEachTemplater(TestCase):
@@ -36,3 +37,28 @@ class TestEachTemplater(TestCase):
             template, member={"items": [{"text": "Hello"}, {"text": "World"}]}
         )
         self.assertEqual(result, "<li>Hello</li><li>World</li>")
+
+    def test_each_templating_body_parsed_once(self):
+        """Test that the loop body is compiled once and reused for every item."""
+        template = "{{#EACH items AS item}}<td>{{item}}</td>{{/EACH}}"
+        engine = EachTemplater()
+        result = engine.render(template, items=list(range(10000)))
+        self.assertEqual(result.count("<td>"), 10000)
+        self.assertEqual(len(engine._bodies), 1)
+
+        body = engine._bodies["<td>{{item}}</td>"]
+        engine.render(template, items=[1])
+        self.assertIs(engine._bodies["<td>{{item}}</td>"], body)
+
+    def test_each_templating_missing_list_dont_raise(self):
+        """Test that an EACH over a missing list is left as is."""
+        template = "{{#EACH items AS item}}<li>{{item}}</li>{{/EACH}}"
+        engine = EachTemplater()
+        self.assertEqual(engine.render(template), template)
+
+    def test_each_templating_missing_list_raise(self):
+        """Test that an EACH over a missing list raises with raise_on_error=True."""
+        template = "{{#EACH items AS item}}<li>{{item}}</li>{{/EACH}}"
+        engine = EachTemplater(raise_on_error=True)
+        with self.assertRaises(RenderError):
+            engine.render(template)
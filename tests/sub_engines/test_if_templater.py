@@ -158,4 +158,40 @@ class TestIfTemplater(TestCase):
         result2 = engine.render(template, a=True, b=True, c=False)
         self.assertEqual(result2, "")
 
+    def test_if_templating_untaken_branch_not_evaluated(self):
+        """Test that conditions inside a branch that is not taken are never looked up."""
+
+        class Conditions(dict):
+            looked_up = []
+
+            def __getitem__(self, key):
+                self.looked_up.append(key)
+                return super().__getitem__(key)
+
+        template = "{{#IF a}}{{#IF b.c}}x{{/IF}}{{#ELSE}}{{#IF d}}y{{/IF}}{{/IF}}"
+        engine = IfTemplater()
+        result = engine.render(template, a=Conditions(), d=True)
+        self.assertEqual(result, "y")
+        self.assertEqual(Conditions.looked_up, [])
+
+    def test_if_templating_unclosed_block_left_as_is(self):
+        """Test that an IF without {{/IF}} is left untouched."""
+        template = "{{#IF a}}{{#IF b}}x{{/IF}} never closed"
+        engine = IfTemplater()
+        result = engine.render(template, a=True, b=True)
+        self.assertEqual(result, "{{#IF a}}x never closed")
+
+    def test_if_templating_stray_tags_left_as_is(self):
+        """Test that ELSE and closing tags outside of a block are left untouched."""
+        template = "{{#ELSE}} {{/IF}}"
+        engine = IfTemplater()
+        self.assertEqual(engine.render(template), template)
+
+    def test_if_templating_thousands_of_blocks(self):
+        """Test many sibling and nested blocks in a single template."""
+        template = "{{#IF a}}<{{#IF b}}x{{#ELSE}}y{{/IF}}>{{/IF}}" * 5000
+        engine = IfTemplater()
+        result = engine.render(template, a=True, b=False)
+        self.assertEqual(result, "<y>" * 5000)
+
     # TODO: Test with missing variable and raise_on_error=True
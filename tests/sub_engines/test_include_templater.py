@@ -147,3 +147,14 @@ class TestIncludeTemplater(TestCase):
         template = f"Before{{{{#INCLUDE {empty_file}}}}}After"
         result = self.templater.render(template)
         self.assertEqual(result, "BeforeAfter")
+
+    def test_include_reads_through_given_loader(self):
+        """Test that included files are read through the templater's loader."""
+        from py_template_engine.TemplateLoader import TemplateLoader
+
+        loader = TemplateLoader()
+        templater = IncludeTemplater(loader=loader)
+        template = f"{{{{#INCLUDE {self.header_file}}}}}"
+        self.assertEqual(templater.render(template), "<header><h1>My Website</h1></header>")
+        self.assertEqual(loader.stats()["misses"], 1)
+        self.assertIs(IncludeTemplater().loader, TemplateLoader.default())
@@ -207,3 +207,15 @@ class TestRenderTemplater(TestCase):
         except KeyError:
             # If it raises KeyError for missing variables, that's expected
             pass
+
+    def test_render_reads_through_given_loader(self):
+        """Test that rendered files are read through the templater's loader."""
+        from py_template_engine.TemplateLoader import TemplateLoader
+
+        loader = TemplateLoader()
+        templater = RenderTemplater(loader=loader)
+        path = os.path.join(self.temp_dir, "loaded.html")
+        with open(path, "w") as f:
+            f.write("Hi {{name}}")
+        self.assertEqual(templater.render(f"{{{{#RENDER {path}}}}}", name="x"), "Hi x")
+        self.assertEqual(loader.stats()["misses"], 1)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase
+
+from py_template_engine.RenderError import RenderError
+from py_template_engine.sub_engines.FunctionTemplater import FunctionTemplater
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class TestAsyncRendering(IsolatedAsyncioTestCase):
+
+    async def test_awaitable_function(self):
+        """Test that a coroutine returned by a function is awaited."""
+
+        async def greeting():
+            await asyncio.sleep(0)
+            return "Hello"
+
+        engine = TemplateEngine(template_string="{{greeting()}}, {{name}}!")
+        result = await engine.render_async(greeting=greeting, name="World")
+        self.assertEqual(result, "Hello, World!")
+
+    async def test_awaitables_run_concurrently(self):
+        """Test that awaitables on the same level are gathered."""
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "x"
+
+        engine = TemplateEngine(template_string="{{a()}}{{b()}}{{c()}}{{d()}}")
+        started = time.monotonic()
+        result = await engine.render_async(a=slow, b=slow, c=slow, d=slow)
+        self.assertEqual(result, "xxxx")
+        self.assertLess(time.monotonic() - started, 0.15)
+
+    async def test_awaitables_in_blocks_run_concurrently(self):
+        """Test that awaitables inside IF and EACH blocks are gathered with the rest."""
+
+        async def slow(value="x"):
+            await asyncio.sleep(0.05)
+            return value
+
+        template = (
+            "{{#IF a}}{{slow()}}{{/IF}}{{#IF a}}{{slow()}}{{/IF}}{{#IF a}}{{slow()}}{{/IF}}"
+            "{{#EACH items AS item}}{{item.load()}}{{/EACH}}"
+        )
+        items = [{"load": lambda i=i: slow(str(i))} for i in range(10)]
+        engine = TemplateEngine(template_string=template)
+        started = time.monotonic()
+        result = await engine.render_async(a=True, slow=slow, items=items)
+        self.assertEqual(result, "xxx0123456789")
+        self.assertLess(time.monotonic() - started, 0.15)
+
+    async def test_async_iterable_in_each(self):
+        """Test that EACH consumes asynchronous iterables."""
+
+        async def rows():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield {"id": i}
+
+        async def label():
+            return "row"
+
+        template = "{{#EACH rows AS row}}<{{label()}} {{row.id}}>{{/EACH}}"
+        engine = TemplateEngine(template_string=template)
+        result = await engine.render_async(rows=rows(), label=label)
+        self.assertEqual(result, "<row 0><row 1><row 2>")
+
+    async def test_render_async_iter(self):
+        """Test the asynchronous stream of chunks."""
+
+        async def rows():
+            for i in range(3):
+                yield i
+
+        engine = TemplateEngine(template_string="<ul>{{#EACH rows AS i}}<li>{{i}}</li>{{/EACH}}</ul>")
+        chunks = [chunk async for chunk in engine.render_async_iter(rows=rows())]
+        self.assertEqual("".join(chunks), "<ul><li>0</li><li>1</li><li>2</li></ul>")
+        self.assertGreater(len(chunks), 3)
+
+    async def test_failing_awaitable_raise(self):
+        """Test that a KeyError raised while awaiting goes through on_error."""
+
+        async def broken():
+            raise KeyError("missing")
+
+        engine = TemplateEngine(template_string="{{broken()}}")
+        self.assertEqual(await engine.render_async(broken=broken), "{{broken()}}")
+
+        engine.remove_templater(4)
+        engine.add_templater(4, FunctionTemplater(raise_on_error=True))
+        with self.assertRaises(RenderError):
+            await engine.render_async(broken=broken)
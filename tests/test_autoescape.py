@@ -0,0 +1,97 @@
+import asyncio
+from unittest import TestCase
+
+from py_template_engine import Lazy, Markup
+from py_template_engine.Escaper import Escaper
+from py_template_engine.Memo import memo_scope
+from py_template_engine.ModuleGenerator import ModuleGenerator
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class Html:
+    def __html__(self):
+        return "<b>html</b>"
+
+
+class TestAutoescape(TestCase):
+
+    def test_values_are_escaped(self):
+        """Test that variables and function results are HTML escaped."""
+        template = "<p title='{{title}}'>{{body}}{{note()}}</p>"
+        context = {"title": "'a'", "body": "<script>", "note": lambda: "&"}
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend, autoescape="html")
+            self.assertEqual(
+                engine.render(**context),
+                "<p title='&#x27;a&#x27;'>&lt;script&gt;&amp;</p>",
+            )
+
+    def test_values_are_not_escaped_by_default(self):
+        """Test that engines without autoescape insert values as they are."""
+        engine = TemplateEngine(template_string="{{body}}")
+        self.assertEqual(engine.render(body="<b>"), "<b>")
+
+    def test_markup_is_inserted_as_it_is(self):
+        """Test that Markup and objects with __html__ are not escaped again."""
+        template = "{{safe}}{{html}}{{number}}{{#EACH items AS item}}{{item}}{{/EACH}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend, autoescape="html")
+            self.assertEqual(
+                engine.render(safe=Markup("<i>"), html=Html(), number=1, items=["<", Markup("<")]),
+                "<i><b>html</b>1&lt;<",
+            )
+
+    def test_lazy_markup_is_inserted_as_it_is(self):
+        """Test that a Lazy value resolving to Markup is not escaped."""
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string="{{v}}{{w}}", backend=backend, autoescape="html")
+            self.assertEqual(
+                engine.render(v=Lazy(lambda: Markup("<b>")), w=Lazy(lambda: "<")), "<b>&lt;"
+            )
+
+    def test_custom_escaper(self):
+        """Test that a function can be given as the escaper."""
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(
+                template_string="'{{name}}'", backend=backend, autoescape=lambda s: s.replace("'", "''")
+            )
+            self.assertEqual(engine.render(name="O'Brien"), "'O''Brien'")
+
+    def test_unknown_escaper(self):
+        """Test that an unknown escaper name is rejected."""
+        with self.assertRaisesRegex(ValueError, "Unknown autoescape 'xml'"):
+            TemplateEngine(template_string="x", autoescape="xml")
+
+    def test_all_render_methods_escape(self):
+        """Test that streaming, async and bytes rendering escape as well."""
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string="{{a}}é", backend=backend, autoescape="html")
+            self.assertEqual("".join(engine.render_iter(a="<")), "&lt;é")
+            self.assertEqual(asyncio.run(engine.render_async(a="<")), "&lt;é")
+            self.assertEqual(engine.render_bytes(a="<"), "&lt;é".encode("utf-8"))
+
+    def test_bound_values_are_escaped(self):
+        """Test that values folded by bind() are escaped like rendered ones."""
+        engine = TemplateEngine(template_string="{{a}}{{b}}", autoescape="html")
+        self.assertEqual(engine.bind(a="<", b=Markup("<")).render(), "&lt;<")
+
+    def test_escaped_values_are_cached_per_render(self):
+        """Test that a repeated value is only escaped once within a render."""
+        calls = []
+
+        def escape(text):
+            calls.append(text)
+            return text.upper()
+
+        escaper = Escaper(escape)
+        with memo_scope():
+            self.assertEqual([escaper("a"), escaper("a"), escaper("b")], ["A", "A", "B"])
+        self.assertEqual(calls, ["a", "b"])
+        escaper("a")
+        self.assertEqual(calls, ["a", "b", "a"])
+
+    def test_module_generator_rejects_autoescape(self):
+        """Test that ahead of time compilation refuses escaping templaters."""
+        engine = TemplateEngine(template_string="{{a}}", autoescape="html")
+        with self.assertRaisesRegex(ValueError, "Autoescaping cannot be compiled"):
+            ModuleGenerator(engine._parser).generate(engine._nodes)
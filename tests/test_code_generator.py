@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.CodeGenerator import CodeGenerator
+from py_template_engine.RenderError import RenderError
+from py_template_engine.sub_engines.EachTemplater import EachTemplater
+from py_template_engine.sub_engines.IfTemplater import IfTemplater
+from py_template_engine.sub_engines.RenderTemplater import RenderTemplater
+from py_template_engine.sub_engines.VariableTemplater import VariableTemplater
+from py_template_engine.TemplateParser import TemplateParser
+
+
+class TestCodeGenerator(TestCase):
+
+    def compile(self, template, raise_on_error=False):
+        parser = TemplateParser(
+            [
+                RenderTemplater(),
+                EachTemplater(),
+                IfTemplater(),
+                VariableTemplater(raise_on_error=raise_on_error),
+            ]
+        )
+        return CodeGenerator().compile(parser.parse(template))
+
+    def test_generated_source_is_plain_python(self):
+        """Test that loop variables become locals of the generated function."""
+        parser = TemplateParser([EachTemplater(), VariableTemplater()])
+        source, _ = CodeGenerator().generate(
+            parser.parse("{{#EACH items AS item}}{{item.name}}{{/EACH}}")
+        )
+        self.assertIn("for _item", source)
+        self.assertNotIn("{**ctx", source)
+
+    def test_nested_loops_and_conditions(self):
+        """Test nested EACH and IF blocks inside the generated function."""
+        render = self.compile(
+            "{{#EACH rows AS row}}{{#IF row.show}}{{#EACH row.cells AS c}}{{c}},{{/EACH}}{{#ELSE}}-{{/IF}}{{/EACH}}"
+        )
+        result = render({"rows": [{"show": True, "cells": [1, 2]}, {"show": False}]})
+        self.assertEqual(result, "1,2,-")
+
+    def test_render_inside_loop_sees_loop_variable(self):
+        """Test that RENDER inside an EACH gets the loop variable in its context."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False) as f:
+            f.write("<{{item}}>")
+            path = f.name
+        try:
+            render = self.compile(f"{{{{#EACH items AS item}}}}{{{{#RENDER {path}}}}}{{{{/EACH}}}}")
+            self.assertEqual(render({"items": ["a", "b"]}), "<a><b>")
+        finally:
+            os.unlink(path)
+
+    def test_missing_variable_dont_raise(self):
+        """Test that a missing variable is left as is."""
+        render = self.compile("Hello {{user.name}}!")
+        self.assertEqual(render({"user": {}}), "Hello {{user.name}}!")
+
+    def test_missing_variable_raise(self):
+        """Test that a missing variable raises with raise_on_error=True."""
+        render = self.compile("Hello {{name}}!", raise_on_error=True)
+        with self.assertRaises(RenderError):
+            render({})
@@ -1,6 +1,7 @@
 import re
 from unittest import TestCase
 
+from py_template_engine.TagSyntax import TagSyntax
 from py_template_engine.TemplateEngine import TemplateEngine
 from py_template_engine.TemplaterInterface import TemplaterInterface
 
@@ -23,3 +24,45 @@ class TestCustomTemplater(TestCase):
         engine.add_templater(0, CustomTemplater())
         result = engine.render(**{})
         self.assertEqual(result, "Processed: foo!")
+
+
+class TaggedTemplater(TemplaterInterface):
+    tag = TagSyntax("#SHOUT", r"\s+(.*?)")
+
+    def process(self, content: str, **kwargs) -> str:
+        return kwargs.get(content, content).upper()
+
+
+class WrapTemplater(TemplaterInterface):
+    tag = TagSyntax("#WRAP", r"\s+(\w+)", closing="/WRAP")
+
+    def process(self, element: str, content: str, **kwargs) -> str:
+        return f"<{element}>{content}</{element}>"
+
+
+class TestTaggedTemplater(TestCase):
+    def test_tagged_templater_is_compiled(self):
+        """Test that a templater declaring its tag is part of the node tree."""
+        engine = TemplateEngine(template_string="{{#SHOUT name}} and {{name}}")
+        engine.register_templater(TaggedTemplater())
+        self.assertIsNotNone(engine._nodes)
+        self.assertEqual(engine.render(name="world"), "WORLD and world")
+
+    def test_tagged_block_templater(self):
+        """Test a custom block tag that wraps its rendered content."""
+        engine = TemplateEngine(
+            template_string="{{#WRAP b}}{{#IF x}}{{name}}{{/IF}}{{/WRAP}}"
+        )
+        engine.register_templater(WrapTemplater())
+        self.assertEqual(engine.render(x=True, name="hi"), "<b>hi</b>")
+
+    def test_tagged_templater_string_render(self):
+        """Test the string based render() that comes with a declared tag."""
+        result = TaggedTemplater().render("{{#SHOUT a}} {{b}}", a="yes")
+        self.assertEqual(result, "YES {{b}}")
+
+    def test_register_requires_tag(self):
+        """Test that only templaters with a tag can be registered."""
+        engine = TemplateEngine(template_string="x")
+        with self.assertRaises(ValueError):
+            engine.register_templater(CustomTemplater())
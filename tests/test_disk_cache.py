@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+
+class TestDiskCache(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.row = self.write("row.html", "<li>{{item}}</li>")
+        self.page = self.write(
+            "page.html",
+            "<h1>{{title}}</h1>{{#EACH items AS item}}{{#RENDER " + self.row + "}}{{/EACH}}",
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def render(self, backend="interpreter"):
+        """Render with a new loader, as a freshly started process would."""
+        loader = TemplateLoader(cache_dir=self.cache_dir)
+        engine = TemplateEngine(template_path=self.page, loader=loader, backend=backend)
+        return engine, loader.disk_cache, engine.render(title="T", items=[1, 2])
+
+    def test_second_process_loads_from_disk(self):
+        """Test that compiled templates are written once and then loaded."""
+        _, cache, first = self.render()
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 2, "writes": 2})
+        for backend in TemplateEngine.BACKENDS:
+            _, cache, result = self.render(backend)
+            self.assertEqual(result, first)
+            # The RENDER target is stored within the page's entry
+            self.assertEqual(cache.stats(), {"hits": 1, "misses": 0, "writes": 0})
+        self.assertEqual(first, "<h1>T</h1><li>1</li><li>2</li>")
+
+    def test_loaded_nodes_use_live_templaters(self):
+        """Test that loaded nodes are bound to the templaters of the new parser."""
+        self.render()
+        engine, _, _ = self.render()
+        each = engine._nodes[-1]
+        self.assertIn(each.templater, engine._templaters)
+
+    def test_changed_content_is_a_miss(self):
+        """Test that editing a template does not load the stale entries using it."""
+        self.render()
+        self.write("row.html", "<p>{{item}}</p>")
+        _, cache, result = self.render()
+        self.assertEqual(result, "<h1>T</h1><p>1</p><p>2</p>")
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 2, "writes": 2})
+
+    def test_unchanged_dependencies_are_hits(self):
+        """Test that editing the page keeps the entries of the files it uses."""
+        self.render()
+        self.write("page.html", "<h2>{{title}}</h2>{{#RENDER " + self.row + "}}")
+        _, cache, result = self.render()
+        self.assertEqual(result, "<h2>T</h2><li>{{item}}</li>")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "writes": 1})
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that an unreadable entry is parsed again and replaced."""
+        self.render()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), "wb") as f:
+                f.write(b"not a pickle")
+        _, cache, result = self.render()
+        self.assertEqual(result, "<h1>T</h1><li>1</li><li>2</li>")
+        self.assertEqual(cache.stats()["writes"], 2)
+        self.assertFalse([n for n in os.listdir(self.cache_dir) if n.endswith(".tmp")])
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.IncrementalRender import Region
+from py_template_engine.TagSyntax import TagSyntax
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+from py_template_engine.TemplaterInterface import TemplaterInterface
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+class ShoutTemplater(TemplaterInterface):
+    tag = TagSyntax("#SHOUT", r"\s+(\w+)")
+
+    def render(self, template, **kwargs):
+        return template
+
+    def process(self, name, **kwargs):
+        return str(kwargs[name]).upper()
+
+
+class TestIncrementalRender(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_only_affected_regions_are_rendered(self):
+        """Test that an update re-renders the nodes reading the changed keys."""
+        counter = Counter()
+        engine = TemplateEngine(
+            template_string="<h1>{{title}}</h1>{{count()}}<p>{{user.name}}</p>"
+        )
+        handle = engine.incremental(title="A", count=counter, user={"name": "x"})
+        self.assertEqual(handle.output, "<h1>A</h1>1<p>x</p>")
+
+        regions = handle.update(user={"name": "yy"})
+        self.assertEqual(regions, [Region(5, 14, "yy")])
+        self.assertEqual((regions[0].slot, regions[0].start), (5, 14))
+        self.assertEqual(handle.output, "<h1>A</h1>1<p>yy</p>")
+        self.assertEqual(counter.calls, 1)
+
+        self.assertEqual(handle.update(title="A"), [])
+        self.assertEqual(handle.update(count=counter), [Region(3, 10, "2")])
+
+    def test_tags_inside_if_blocks_are_tracked(self):
+        """Test that an update inside an IF only renders the nested tags reading it."""
+        counter = Counter()
+        engine = TemplateEngine(
+            template_string="{{#IF page}}\n<h1>{{title}}</h1>{{count()}}\n{{#IF b}}x{{/IF}}\n{{/IF}}"
+        )
+        context = {"page": True, "title": "A", "count": counter, "b": False}
+        handle = engine.incremental(**context)
+        self.assertEqual(handle.output, "<h1>A</h1>1")
+
+        self.assertEqual(handle.update(title="B"), [Region(0, 0, "<h1>B</h1>1")])
+        self.assertEqual(handle.update(b=True), [Region(0, 0, "<h1>B</h1>1\nx")])
+        self.assertEqual(handle.update(page=1), [])
+        self.assertEqual(counter.calls, 1)
+
+        context["title"] = "B"
+        for changes in ({"b": False}, {"page": False}, {"page": True, "title": "C"}):
+            handle.update(**changes)
+            context.update(changes, count=lambda: counter.calls)
+            self.assertEqual(handle.output, engine.render(**context))
+        self.assertEqual(counter.calls, 2)
+
+    def test_loop_variables_are_not_dependencies(self):
+        """Test that EACH depends on its list and the unshadowed keys of its body."""
+        template = "{{#EACH items AS item}}{{item}}{{sep}}{{/EACH}}|{{item}}"
+        nodes = TemplateEngine(template_string=template)._nodes
+        self.assertEqual(nodes[0].dependencies(), {"items", "sep"})
+        self.assertEqual(nodes[-1].dependencies(), {"item"})
+
+        handle = TemplateEngine(template_string=template).incremental(
+            items=[1, 2], sep=",", item="i"
+        )
+        self.assertEqual(handle.update(sep=";"), [Region(0, 0, "1;2;")])
+        self.assertEqual(handle.update(item="j"), [Region(2, 5, "j")])
+        self.assertEqual(handle.output, "1;2;|j")
+
+    def test_if_and_render_dependencies(self):
+        """Test that IF branches and RENDER files contribute their keys."""
+        path = os.path.join(self.temp_dir, "row.html")
+        with open(path, "w") as f:
+            f.write("{{name}}{{#RENDER " + path + "}}")
+        engine = TemplateEngine(
+            template_string="{{#IF a}}{{b}}{{#ELSE}}{{c}}{{/IF}}{{#RENDER " + path + "}}",
+            loader=TemplateLoader(),
+        )
+        self.assertEqual(engine._nodes[0].dependencies(), {"a", "b", "c"})
+        self.assertEqual(engine._nodes[1].dependencies(), {"name"})
+
+    def test_unknown_dependencies_are_always_rendered(self):
+        """Test that custom tags are re-rendered on every update."""
+        engine = TemplateEngine(template_string="{{#SHOUT word}}{{other}}")
+        engine.register_templater(ShoutTemplater())
+        handle = engine.incremental(word="hi", other="o")
+        self.assertEqual(handle.output, "HIo")
+        self.assertEqual(handle.update(word="yo"), [Region(0, 0, "YO")])
+
+    def test_bound_values_win(self):
+        """Test that updates to bound keys are ignored."""
+        engine = TemplateEngine(template_string="{{a}}{{b}}").bind(a="s")
+        handle = engine.incremental(b="1")
+        self.assertEqual(handle.update(a="x", b="2"), [Region(1, 1, "2")])
+        self.assertEqual(handle.output, "s2")
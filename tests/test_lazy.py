@@ -0,0 +1,84 @@
+import asyncio
+from unittest import TestCase
+
+from py_template_engine import Lazy
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class Provider:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class TestLazy(TestCase):
+
+    def test_untaken_branch_is_not_computed(self):
+        """Test that a provider only read by an untaken IF branch is never called."""
+        orders = Provider([1, 2])
+        template = "{{#IF admin}}{{#EACH orders AS o}}{{o}}{{/EACH}}{{#ELSE}}none{{/IF}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend)
+            self.assertEqual(engine.render(admin=False, orders=Lazy(orders)), "none")
+            self.assertEqual(engine.render(admin=True, orders=Lazy(orders)), "12")
+        self.assertEqual(orders.calls, 2)
+
+    def test_value_is_computed_once_per_render(self):
+        """Test that paths through a Lazy value share one result within a render."""
+        user = Provider({"name": "Ada", "email": "ada@example.com"})
+        template = "{{#IF user}}{{user.name}} <{{user.email}}>{{/IF}}"
+        for backend in TemplateEngine.BACKENDS:
+            user.calls = 0
+            engine = TemplateEngine(template_string=template, backend=backend)
+            context = {"user": Lazy(user)}
+            self.assertEqual(engine.render(**context), "Ada <ada@example.com>")
+            self.assertEqual(user.calls, 1)
+            engine.render(**context)
+            self.assertEqual(user.calls, 2)
+
+    def test_value_is_computed_once_per_streamed_render(self):
+        """Test that render_iter() and render_async_iter() compute a Lazy value once."""
+        site = Provider("S")
+        engine = TemplateEngine(template_string="{{site}}{{#EACH items AS i}}{{site}}{{/EACH}}")
+        context = {"site": Lazy(site), "items": [1, 2]}
+        self.assertEqual("".join(engine.render_iter(**context)), "SSS")
+        self.assertEqual(site.calls, 1)
+
+        async def stream():
+            return [chunk async for chunk in engine.render_async_iter(**context)]
+
+        self.assertEqual("".join(asyncio.run(stream())), "SSS")
+        self.assertEqual(site.calls, 2)
+
+    def test_nested_lazy_values(self):
+        """Test that Lazy values deeper in a path are resolved as well."""
+        profile = Provider({"city": "Bern"})
+        context = {"page": {"user": Lazy(lambda: {"profile": Lazy(profile)})}}
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(
+                template_string="{{page.user.profile.city}}", backend=backend
+            )
+            self.assertEqual(engine.render(**context), "Bern")
+
+    def test_lazy_value_is_rendered_as_its_value(self):
+        """Test that a Lazy value at the end of a path renders, tests and iterates."""
+        template = "{{count}}{{#IF empty}}!{{/IF}}{{#EACH items AS i}}{{i}}{{/EACH}}"
+        context = {
+            "count": Lazy(lambda: 3),
+            "empty": Lazy(lambda: []),
+            "items": Lazy(lambda: "ab"),
+        }
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend)
+            self.assertEqual(engine.render(**context), "3ab")
+        self.assertEqual(engine.render_bytes(**context), b"3ab")
+        self.assertEqual(asyncio.run(engine.render_async(**context)), "3ab")
+
+    def test_missing_key_in_lazy_value(self):
+        """Test that a missing key below a Lazy value uses the normal error handling."""
+        engine = TemplateEngine(template_string="{{user.missing}}")
+        self.assertEqual(engine.render(user=Lazy(dict)), "{{user.missing}}")
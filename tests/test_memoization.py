@@ -0,0 +1,115 @@
+import asyncio
+from unittest import TestCase
+
+from py_template_engine import pure
+from py_template_engine.Memo import call, current_memo, memo_scope
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class User:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def display_name(self):
+        self.calls += 1
+        return self.name.title()
+
+
+class TestMemoization(TestCase):
+
+    def test_engine_memoizes_repeated_calls(self):
+        """Test that memoize=True calls each function once per render."""
+        template = "{{user.display_name()}} / {{user.display_name()}}"
+        for backend in TemplateEngine.BACKENDS:
+            user = User("ada")
+            engine = TemplateEngine(template_string=template, backend=backend, memoize=True)
+            self.assertEqual(engine.render(user=user), "Ada / Ada")
+            self.assertEqual(user.calls, 1)
+
+    def test_functions_are_called_every_time_by_default(self):
+        """Test that engines without memoize keep calling functions."""
+        user = User("ada")
+        engine = TemplateEngine(template_string="{{user.display_name()}}{{user.display_name()}}")
+        engine.render(user=user)
+        self.assertEqual(user.calls, 2)
+
+    def test_bound_methods_are_cached_per_instance(self):
+        """Test that the same path inside EACH is called once per item."""
+        template = "{{#EACH users AS u}}{{u.display_name()}}{{u.display_name()}},{{/EACH}}"
+        for backend in TemplateEngine.BACKENDS:
+            users = [User("ada"), User("bob")]
+            engine = TemplateEngine(template_string=template, backend=backend, memoize=True)
+            self.assertEqual(engine.render(users=users), "AdaAda,BobBob,")
+            self.assertEqual([user.calls for user in users], [1, 1])
+
+    def test_pure_functions_without_engine_memoize(self):
+        """Test that the pure decorator memoizes a single function."""
+        calls = []
+
+        @pure
+        def menu():
+            calls.append(1)
+            return "menu"
+
+        for backend in TemplateEngine.BACKENDS:
+            calls.clear()
+            engine = TemplateEngine(template_string="{{menu()}}{{menu()}}", backend=backend)
+            self.assertEqual(engine.render(menu=menu), "menumenu")
+            self.assertEqual(len(calls), 1)
+
+    def test_memo_is_discarded_between_renders(self):
+        """Test that a new render calls the function again."""
+        user = User("ada")
+        engine = TemplateEngine(template_string="{{user.display_name()}}", memoize=True)
+        engine.render(user=user)
+        engine.render(user=user)
+        self.assertEqual(user.calls, 2)
+
+    def test_async_render_does_not_reuse_awaitables(self):
+        """Test that coroutine results are not stored in the memo."""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return "data"
+
+        engine = TemplateEngine(template_string="{{fetch()}} {{fetch()}}", memoize=True)
+        self.assertEqual(asyncio.run(engine.render_async(fetch=fetch)), "data data")
+        self.assertEqual(len(calls), 2)
+
+    def test_call_outside_a_scope(self):
+        """Test that call() without an active scope does not memoize."""
+        calls = []
+
+        def function():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(call(function, True), 1)
+        self.assertEqual(call(function, True), 2)
+        with memo_scope():
+            self.assertEqual(call(function, True), 3)
+            self.assertEqual(call(function, True), 3)
+
+    def test_streaming_renders_memoize(self):
+        """Test that render_iter() and render_async_iter() keep one memo per render."""
+        user = User("ada")
+        engine = TemplateEngine(
+            template_string="{{user.display_name()}}{{#EACH items AS i}}{{user.display_name()}}{{/EACH}}",
+            memoize=True,
+        )
+        self.assertEqual("".join(engine.render_iter(user=user, items=[1, 2])), "AdaAdaAda")
+        self.assertEqual(user.calls, 1)
+
+        async def stream():
+            return [chunk async for chunk in engine.render_async_iter(user=user, items=[1, 2])]
+
+        self.assertEqual("".join(asyncio.run(stream())), "AdaAdaAda")
+        self.assertEqual(user.calls, 2)
+
+    def test_streaming_memo_is_not_active_between_chunks(self):
+        """Test that the consumer of render_iter() runs outside of the render's memo."""
+        engine = TemplateEngine(template_string="{{#EACH items AS i}}{{i}}{{/EACH}}")
+        for _ in engine.render_iter(items=[1, 2]):
+            self.assertIsNone(current_memo())
@@ -0,0 +1,117 @@
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+
+from py_template_engine.__main__ import main
+from py_template_engine.RenderError import RenderError
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class TestModuleGenerator(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.templates = os.path.join(self.temp_dir, "templates")
+        self.row = self.write(
+            "emails/row.html", "<li>{{user.name}} {{#IF user.admin}}(admin){{/IF}}</li>"
+        )
+        self.write("header.inc", "<header>{{title}}</header>")
+        self.page = self.write(
+            "page.html",
+            "{{#INCLUDE " + os.path.join(self.templates, "header.inc") + "}}"
+            "{{#EACH users AS user}}{{#RENDER " + self.row + "}}{{/EACH}}{{footer()}}{{missing}}",
+        )
+        self.output = os.path.join(self.temp_dir, "compiled.py")
+        self.context = {
+            "title": "T",
+            "users": [{"name": "a", "admin": True}, {"name": "b"}],
+            "footer": lambda: "<footer/>",
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.templates, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def compile(self, *options):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = main(["compile", self.templates, "-o", self.output, *options])
+        return status, stderr.getvalue()
+
+    def load(self):
+        spec = importlib.util.spec_from_file_location("compiled", self.output)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_compiled_module_matches_engine(self):
+        """Test that every template renders like the engine does."""
+        self.assertEqual(self.compile(), (0, ""))
+        module = self.load()
+        self.assertEqual(
+            sorted(module.TEMPLATES), ["emails/row.html", "header.inc", "page.html"]
+        )
+        expected = TemplateEngine(template_path=self.page).render(**self.context)
+        self.assertEqual(module.render("page.html", **self.context), expected)
+        self.assertIn("{{missing}}", expected)
+
+    def test_context_keys_do_not_clash_with_render(self):
+        """Test that context keys named like render()'s parameters are passed through."""
+        self.write("hello.html", "{{name}} {{template}}")
+        self.assertEqual(self.compile(), (0, ""))
+        module = self.load()
+        self.assertEqual(module.render("hello.html", name="x", template="t"), "x t")
+
+    def test_module_does_not_read_templates(self):
+        """Test that the module keeps working after the templates are gone."""
+        self.compile()
+        shutil.rmtree(self.templates)
+        module = self.load()
+        self.assertIn("<li>a (admin)</li>", module.render("page.html", **self.context))
+
+    def test_raise_on_error_is_baked_in(self):
+        """Test that --raise-on-error turns missing values into RenderError."""
+        self.compile("--raise-on-error")
+        module = self.load()
+        with self.assertRaisesRegex(RenderError, "variable missing"):
+            module.render("page.html", **self.context)
+
+    def test_cache_blocks_are_compiled(self):
+        """Test that CACHE blocks keep their fragments in the module's cache."""
+        self.write(
+            "tile.html",
+            "{{#CACHE tile:p.id 60}}<b>{{p.name}}</b>{{#IF p.id}} {{#IF no}}-{{/IF}} !{{/IF}}{{/CACHE}}",
+        )
+        self.assertEqual(self.compile(), (0, ""))
+        module = self.load()
+        self.assertEqual(module.render("tile.html", p={"id": 1, "name": "a"}), "<b>a</b>!")
+        self.assertEqual(module.render("tile.html", p={"id": 1, "name": "b"}), "<b>a</b>!")
+        self.assertEqual(module.render("tile.html", p={"id": 2, "name": "b"}), "<b>b</b>!")
+        self.assertEqual(module.render("tile.html", p={}), "<b>{{p.name}}</b>")
+        self.assertEqual(module.FRAGMENT_CACHE.stats()["hits"], 1)
+
+    def test_syntax_error_fails_the_build(self):
+        """Test that a malformed template fails with its path and no module is written."""
+        self.write("broken.html", "{{#IF x}}unclosed")
+        status, error = self.compile()
+        self.assertEqual(status, 1)
+        self.assertIn("broken.html", error)
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_include_cycle_fails_the_build(self):
+        """Test that an INCLUDE cycle is reported instead of recursing forever."""
+        loop = os.path.join(self.templates, "loop.html")
+        self.write("loop.html", "{{#INCLUDE " + loop + "}}")
+        status, error = self.compile()
+        self.assertEqual(status, 1)
+        self.assertIn("INCLUDE cycle", error)
@@ -0,0 +1,88 @@
+import pickle
+from unittest import TestCase
+
+from py_template_engine import Lazy
+from py_template_engine.ParallelEach import ParallelEach
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+TEMPLATE = "{{#EACH rows AS row}}<li>{{row.name}}: {{title}}</li>{{/EACH}}"
+
+
+class TestParallelEach(TestCase):
+
+    def setUp(self):
+        self.rows = [{"name": f"row{i}"} for i in range(50)]
+        self.expected = "".join(f"<li>row{i}: T</li>" for i in range(50))
+
+    def render(self, parallel, template=TEMPLATE, backend="interpreter", **kwargs):
+        with parallel:
+            engine = TemplateEngine(
+                template_string=template, backend=backend, parallel=parallel
+            )
+            return engine.render(**kwargs)
+
+    def test_thread_pool_keeps_order(self):
+        """Test that chunks rendered by threads are joined in order."""
+        parallel = ParallelEach("thread", workers=4, threshold=10, chunk_size=3)
+        self.assertEqual(self.render(parallel, rows=self.rows, title="T"), self.expected)
+
+    def test_process_pool_keeps_order(self):
+        """Test that chunks rendered by worker processes are joined in order."""
+        parallel = ParallelEach("process", workers=2, threshold=10)
+        self.assertEqual(self.render(parallel, rows=self.rows, title="T"), self.expected)
+
+    def test_codegen_backend(self):
+        """Test that the codegen backend hands parallel loops to the pool."""
+        parallel = ParallelEach("thread", workers=2, threshold=10)
+        template = "{{#EACH groups AS group}}[" + TEMPLATE + "]{{/EACH}}"
+        result = self.render(
+            parallel, template, backend="codegen", groups=[1, 2], rows=self.rows, title="T"
+        )
+        self.assertEqual(result, f"[{self.expected}][{self.expected}]")
+
+    def test_small_lists_stay_serial(self):
+        """Test that lists below the threshold never start a pool."""
+        parallel = ParallelEach("thread", threshold=100)
+        self.assertEqual(self.render(parallel, rows=self.rows, title="T"), self.expected)
+        self.assertIsNone(parallel._pool)
+
+    def test_nested_loops_stay_serial_in_workers(self):
+        """Test that a loop inside a parallel chunk does not wait on the pool."""
+        parallel = ParallelEach("thread", workers=1, threshold=2, chunk_size=1)
+        template = "{{#EACH rows AS row}}{{#EACH row AS cell}}{{cell}}{{/EACH}};{{/EACH}}"
+        result = self.render(parallel, template, rows=[[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(result, "12;34;56;")
+
+    def test_thread_workers_share_the_render_memo(self):
+        """Test that a Lazy value read by the loop body is not computed per item."""
+        calls = []
+
+        def load():
+            calls.append(1)
+            return "T"
+
+        parallel = ParallelEach("thread", workers=4, threshold=10, chunk_size=3)
+        template = "{{title}}" + TEMPLATE
+        result = self.render(parallel, template, rows=self.rows, title=Lazy(load))
+        self.assertEqual(result, "T" + self.expected)
+        self.assertEqual(len(calls), 1)
+
+    def test_unknown_executor(self):
+        """Test that an unknown executor is rejected."""
+        with self.assertRaises(ValueError):
+            ParallelEach("gpu")
+
+    def test_pickling_drops_pool_and_lock(self):
+        """Test that the pool and the loader lock are not sent to workers."""
+        parallel = ParallelEach("thread", threshold=1)
+        parallel._get_pool()
+        copy = pickle.loads(pickle.dumps(parallel))
+        self.assertIsNone(copy._pool)
+        parallel.shutdown()
+
+        loader = TemplateLoader()
+        copy = pickle.loads(pickle.dumps(loader))
+        self.assertEqual(copy.stats()["size"], 0)
+        with copy._lock:
+            pass
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.nodes.IfNode import IfNode
+from py_template_engine.nodes.TextNode import TextNode
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+
+class TestPartialEvaluation(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_static_tags_are_folded_into_text(self):
+        """Test that variables, functions and IFs on bound values become one text node."""
+        template = (
+            "<title>{{site.name}}</title>{{#IF flags.beta}}beta{{#ELSE}}stable{{/IF}}"
+            "{{year()}}"
+        )
+        engine = TemplateEngine(template_string=template).bind(
+            site={"name": "Shop"}, flags={"beta": False}, year=lambda: 2024
+        )
+        self.assertEqual(len(engine._nodes), 1)
+        self.assertIsInstance(engine._nodes[0], TextNode)
+        self.assertEqual(engine.render(), "<title>Shop</title>stable2024")
+
+    def test_dynamic_tags_are_kept(self):
+        """Test that tags on unbound values are still rendered per call."""
+        template = "{{#IF flags.beta}}Hi {{user}}{{/IF}}{{#IF user}}!{{/IF}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend)
+            bound = engine.bind(flags={"beta": True})
+            self.assertIsInstance(bound._nodes[-1], IfNode)
+            self.assertEqual(bound.render(user="ada"), "Hi ada!")
+            self.assertEqual(bound.render(user=""), "Hi ")
+            self.assertEqual(engine.render(user="ada", flags={}), "!")
+
+    def test_static_values_take_precedence(self):
+        """Test that bound values override the render context."""
+        engine = TemplateEngine(template_string="{{a}}{{#EACH items AS i}}{{a}}{{/EACH}}")
+        bound = engine.bind(a="s", items=[1, 2])
+        self.assertEqual(bound.render(a="d", items=[]), "sss")
+
+    def test_loop_variable_shadows_static_name(self):
+        """Test that an EACH variable named like a bound value is not folded."""
+        template = "{{item}}:{{#EACH items AS item}}{{item}}{{#IF item}}+{{/IF}}{{/EACH}}:{{item}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend).bind(item="x")
+            self.assertEqual(engine.render(items=[1, 0]), "x:1+0:x")
+
+    def test_includes_are_inlined(self):
+        """Test that INCLUDE and RENDER files are inlined and folded."""
+        header = os.path.join(self.temp_dir, "header.html")
+        with open(header, "w") as f:
+            f.write("<h1>{{site}}</h1>{{#IF debug}}debug{{/IF}}")
+        template = f"{{{{#INCLUDE {header}}}}}{{{{#RENDER {header}}}}}{{{{body}}}}"
+        engine = TemplateEngine(template_string=template, loader=TemplateLoader())
+        bound = engine.bind(site="S", debug=False)
+        self.assertIsInstance(bound._nodes[0], TextNode)
+        self.assertEqual(bound._nodes[0].text, "<h1>S</h1><h1>S</h1>")
+        self.assertEqual(bound.render(body="b"), "<h1>S</h1><h1>S</h1>b")
+
+    def test_missing_static_path_is_left_to_render(self):
+        """Test that failed lookups keep their error handling at render time."""
+        engine = TemplateEngine(template_string="{{site.missing}}").bind(site={})
+        self.assertEqual(engine.render(), "{{site.missing}}")
+
+    def test_bind_can_be_chained(self):
+        """Test that binding a bound engine adds to its static context."""
+        engine = TemplateEngine(template_string="{{a}}{{b}}{{c}}")
+        bound = engine.bind(a=1).bind(b=2)
+        self.assertEqual(bound.render(c=3), "123")
+        self.assertEqual(engine.render(a="a", b="b", c="c"), "abc")
+
+    def test_bound_output_matches_render(self):
+        """Test that bind(**static).render(**dynamic) equals render(**static, **dynamic)."""
+        templates = [
+            "{{#IF flag}}{{#EACH xs AS x}} {{x}} {{/EACH}}{{/IF}}|",
+            "{{#IF dyn}}{{brand}}{{/IF}}|",
+            "{{#IF dyn}} {{#IF flag}} {{brand}} {{/IF}} {{/IF}}|",
+            "{{#IF flag}}\n{{#IF dyn}}x{{/IF}}\n<p>{{brand}}</p>\n{{/IF}}",
+            "{{#IF off}}x{{#ELSE}} {{#EACH xs AS x}}-{{/EACH}} {{brand}}{{year()}} {{/IF}}",
+            "{{#IF dyn}}{{#IF flag}} {{#EACH xs AS x}} {{/EACH}} {{/IF}}{{brand}}{{/IF}}",
+        ]
+        static = {"flag": True, "off": False, "brand": "  X  ", "year": lambda: " 2024 "}
+        for template in templates:
+            for dynamic in ({"dyn": True, "xs": [1, 2]}, {"dyn": False, "xs": []}):
+                for backend in TemplateEngine.BACKENDS:
+                    engine = TemplateEngine(template_string=template, backend=backend)
+                    self.assertEqual(
+                        engine.bind(**static).render(**dynamic),
+                        engine.render(**static, **dynamic),
+                        (template, dynamic, backend),
+                    )
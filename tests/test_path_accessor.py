@@ -0,0 +1,61 @@
+import pickle
+from collections import namedtuple
+from dataclasses import dataclass
+from unittest import TestCase
+
+from py_template_engine.PathAccessor import PathAccessor, compile_path, resolve
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@dataclass
+class Order:
+    id: int
+    point: Point
+
+
+class Model:
+    def __init__(self):
+        self.orders = [Order(1, Point(2, 3))]
+
+    @property
+    def total(self):
+        return 42
+
+
+class TestPathAccessor(TestCase):
+
+    def test_dict_paths(self):
+        """Test that nested dictionaries are indexed."""
+        accessor = PathAccessor("user.address.city")
+        self.assertEqual(accessor({"user": {"address": {"city": "Paris"}}}), "Paris")
+
+    def test_attribute_paths(self):
+        """Test that objects, dataclasses and namedtuples are read by attribute."""
+        context = {"model": Model(), "order": Order(7, Point(1, 2))}
+        self.assertEqual(compile_path("model.total")(context), 42)
+        self.assertEqual(compile_path("order.id")(context), 7)
+        self.assertEqual(compile_path("order.point.y")(context), 2)
+
+    def test_missing_attribute_raises_key_error(self):
+        """Test that a missing attribute is reported like a missing key."""
+        with self.assertRaises(KeyError):
+            compile_path("model.missing")({"model": Model()})
+        with self.assertRaises(KeyError):
+            compile_path("missing")({})
+
+    def test_item_access_wins_over_attributes(self):
+        """Test that mappings are indexed even when an attribute has the same name."""
+        self.assertEqual(resolve({"keys": 1}, "keys"), 1)
+        with self.assertRaises(TypeError):
+            resolve("text", "upper")
+
+    def test_accessors_are_shared(self):
+        """Test that a path is compiled once."""
+        self.assertIs(compile_path("a.b"), compile_path("a.b"))
+        self.assertEqual(compile_path("a.b").rest, ("b",))
+
+    def test_pickling_recompiles_by_path(self):
+        """Test that a pickled accessor comes back as the shared accessor."""
+        accessor = compile_path("order.point.x")
+        self.assertIs(pickle.loads(pickle.dumps(accessor)), accessor)
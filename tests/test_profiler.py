@@ -0,0 +1,113 @@
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.nodes.ProfiledNode import ProfiledNode
+from py_template_engine.Profiler import Profiler
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class TestProfiler(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.row = os.path.join(self.temp_dir, "row.html")
+        with open(self.row, "w") as f:
+            f.write("<td>{{row}}</td>\n<td>{{format()}}</td>")
+        self.template = (
+            "<h1>{{title}}</h1>\n{{#EACH rows AS row}}\n  <tr>{{#RENDER "
+            + self.row
+            + "}}</tr>\n{{/EACH}}"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def render(self, profiler, backend="interpreter"):
+        engine = TemplateEngine(
+            template_string=self.template, backend=backend, profiler=profiler
+        )
+        return engine.render(title="T", rows=[1, 2, 3], format=lambda: "f")
+
+    def test_records_calls_per_location(self):
+        """Test that tags are keyed by file, line and column, including RENDER files."""
+        profiler = Profiler()
+        self.render(profiler)
+        calls = {
+            (e.key.file, e.key.line, e.key.column, e.key.tag): e.calls
+            for e in profiler.entries()
+        }
+        self.assertEqual(calls[("<string>", 1, 5, "{{title}}")], 1)
+        self.assertEqual(calls[("<string>", 2, 1, "{{#EACH rows AS row}}")], 1)
+        self.assertEqual(calls[(self.row, 1, 5, "{{row}}")], 3)
+        self.assertEqual(calls[(self.row, 2, 5, "{{format()}}")], 3)
+
+    def test_output_is_unchanged(self):
+        """Test that profiling does not change what is rendered, on both backends."""
+        expected = self.render(None)
+        for backend in TemplateEngine.BACKENDS:
+            self.assertEqual(self.render(Profiler(), backend), expected)
+
+    def test_self_time_excludes_children(self):
+        """Test that a block's self time does not include the time of its children."""
+        profiler = Profiler()
+        self.render(profiler)
+        each = next(e for e in profiler.entries() if e.key.tag.startswith("{{#EACH"))
+        self.assertLess(each.self_time, each.total)
+        self.assertIn("{{#EACH rows AS row}}", profiler.report())
+
+    def test_collapsed_stacks(self):
+        """Test that collapsed output lists nested frames separated by semicolons."""
+        profiler = Profiler()
+        self.render(profiler)
+        fp = io.StringIO()
+        profiler.write_collapsed(fp)
+        lines = fp.getvalue().splitlines()
+        nested = [line for line in lines if line.count(";") == 2]
+        self.assertTrue(any(f"{self.row}:1:5 {{{{row}}}}" in line for line in nested))
+        for line in lines:
+            self.assertTrue(line.rsplit(" ", 1)[1].isdigit())
+
+    def test_concurrent_async_renders_keep_their_stacks(self):
+        """Test that async renders interleaving on one event loop do not mix frames."""
+
+        async def rows():
+            for i in range(3):
+                await asyncio.sleep(0.001)
+                yield i
+
+        profiler = Profiler()
+        engine = TemplateEngine(
+            template_string="{{#IF a}}{{#EACH rows AS r}}{{r}}{{/EACH}}{{/IF}}", profiler=profiler
+        )
+
+        async def render_all():
+            return await asyncio.gather(
+                *(engine.render_async(a=True, rows=rows()) for _ in range(6))
+            )
+
+        self.assertEqual(asyncio.run(render_all()), ["012"] * 6)
+        entries = {entry.key.tag: entry for entry in profiler.entries()}
+        self.assertEqual(entries["{{#IF a}}"].calls, 6)
+        self.assertEqual(entries["{{r}}"].calls, 18)
+        for entry in entries.values():
+            self.assertGreaterEqual(entry.self_time, 0)
+        fp = io.StringIO()
+        profiler.write_collapsed(fp)
+        stacks = {line.rsplit(" ", 1)[0] for line in fp.getvalue().splitlines()}
+        self.assertEqual(len(stacks), 3)
+
+    def test_disabled_profiler_adds_no_nodes(self):
+        """Test that engines without a profiler keep plain nodes."""
+        engine = TemplateEngine(template_string=self.template)
+        self.assertFalse(any(isinstance(node, ProfiledNode) for node in engine._nodes))
+
+    def test_reset(self):
+        """Test that reset forgets everything recorded."""
+        profiler = Profiler()
+        self.render(profiler)
+        profiler.reset()
+        self.assertEqual(profiler.entries(), [])
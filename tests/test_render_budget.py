@@ -0,0 +1,132 @@
+import asyncio
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from py_template_engine import BudgetExceeded, ParallelEach, RenderBudget
+from py_template_engine.RenderError import RenderError
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+
+class TestRenderBudget(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def engine(self, template, backend="interpreter", **limits):
+        return TemplateEngine(
+            template_string=template, backend=backend, budget=RenderBudget(**limits)
+        )
+
+    def test_render_within_budget(self):
+        """Test that renders within every limit are unchanged."""
+        template = "{{#EACH items AS i}}{{i}}{{/EACH}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = self.engine(
+                template, backend, max_output=3, max_depth=1, max_iterations=3, timeout=5
+            )
+            self.assertEqual(engine.render(items=[1, 2, 3]), "123")
+            self.assertEqual("".join(engine.render_iter(items=[1, 2, 3])), "123")
+            self.assertEqual(asyncio.run(engine.render_async(items=[1, 2, 3])), "123")
+            self.assertEqual(engine.render_bytes(items=[1, 2, 3]), b"123")
+
+    def test_iterations_are_counted_over_the_render(self):
+        """Test that nested loops add up towards max_iterations."""
+        template = "{{#EACH rows AS row}}{{#EACH row AS cell}}{{cell}}{{/EACH}}{{/EACH}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = self.engine(template, backend, max_iterations=5)
+            self.assertEqual(engine.render(rows=[[1, 2], [3]]), "123")
+            with self.assertRaises(BudgetExceeded) as raised:
+                engine.render(rows=[[1, 2], [3, 4]])
+            self.assertEqual(raised.exception.limit, "max_iterations=5")
+            self.assertEqual(raised.exception.stats["iterations"], 6)
+
+    def test_output_size(self):
+        """Test that max_output stops a render producing too much text."""
+        engine = self.engine("{{#EACH items AS i}}<li>{{i}}</li>{{/EACH}}", max_output=50)
+        with self.assertRaises(BudgetExceeded) as raised:
+            engine.render(items=range(1000))
+        self.assertIsInstance(raised.exception, RenderError)
+        self.assertEqual(raised.exception.limit, "max_output=50")
+        self.assertLessEqual(raised.exception.stats["output"], 60)
+        with self.assertRaises(BudgetExceeded):
+            asyncio.run(engine.render_async(items=range(1000)))
+
+    def test_recursive_render_depth(self):
+        """Test that a self-RENDERing template stops at max_depth."""
+        tree = os.path.join(self.temp_dir, "tree.html")
+        with open(tree, "w") as f:
+            f.write("({{#RENDER " + tree + "}})")
+        engine = TemplateEngine(
+            template_path=tree, loader=TemplateLoader(), budget=RenderBudget(max_depth=10)
+        )
+        with self.assertRaises(BudgetExceeded) as raised:
+            engine.render()
+        self.assertEqual(raised.exception.stats["depth"], 11)
+        with self.assertRaises(BudgetExceeded):
+            list(engine.render_iter())
+
+    def test_include_depth(self):
+        """Test that INCLUDE levels count towards max_depth."""
+        inner = os.path.join(self.temp_dir, "inner.html")
+        outer = os.path.join(self.temp_dir, "outer.html")
+        with open(inner, "w") as f:
+            f.write("inner")
+        with open(outer, "w") as f:
+            f.write("{{#INCLUDE " + inner + "}}")
+        template = "{{#INCLUDE " + outer + "}}"
+        loader = TemplateLoader()
+        for max_depth, expected in ((2, "inner"), (1, None)):
+            engine = TemplateEngine(
+                template_string=template, loader=loader, budget=RenderBudget(max_depth=max_depth)
+            )
+            if expected is None:
+                with self.assertRaisesRegex(BudgetExceeded, "max_depth=1"):
+                    engine.render()
+            else:
+                self.assertEqual(engine.render(), expected)
+
+    def test_timeout(self):
+        """Test that a render running past its deadline is stopped between items."""
+        engine = self.engine("{{#EACH items AS i}}{{i}}{{wait()}}{{/EACH}}", timeout=0.01)
+        with self.assertRaisesRegex(BudgetExceeded, "timeout=0.01") as raised:
+            engine.render(items=range(100), wait=lambda: time.sleep(0.005))
+        self.assertLess(raised.exception.stats["iterations"], 10)
+
+    def test_streaming_stops_early(self):
+        """Test that render_iter() stops at the chunk going over the budget."""
+        engine = self.engine("{{#EACH items AS i}}{{i}}{{/EACH}}", max_iterations=10)
+        chunks = []
+        with self.assertRaises(BudgetExceeded):
+            for chunk in engine.render_iter(items=range(100)):
+                chunks.append(chunk)
+        self.assertEqual(chunks, [str(i) for i in range(10)])
+
+    def test_parallel_loops_count_their_items(self):
+        """Test that items rendered by workers count towards max_iterations."""
+        with ParallelEach("thread", workers=2, threshold=4) as parallel:
+            engine = TemplateEngine(
+                template_string="{{#EACH items AS i}}{{i}}{{/EACH}}",
+                parallel=parallel,
+                budget=RenderBudget(max_iterations=5),
+            )
+            self.assertEqual(engine.render(items=list(range(5))), "01234")
+            with self.assertRaises(BudgetExceeded):
+                engine.render(items=list(range(6)))
+
+    def test_other_renders_are_not_governed(self):
+        """Test that the budget only applies to the engine it was given to."""
+        engine = TemplateEngine(template_string="{{#EACH items AS i}}{{i}}{{/EACH}}")
+        self.assertEqual(len(engine.render(items=range(1000))), 2890)
+
+    def test_exception_can_be_pickled(self):
+        """Test that the exception survives process pools."""
+        error = pickle.loads(pickle.dumps(BudgetExceeded("max_depth=1", {"depth": 2})))
+        self.assertEqual((error.limit, error.stats), ("max_depth=1", {"depth": 2}))
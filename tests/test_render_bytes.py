@@ -0,0 +1,72 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.CodeGenerator import CodeGenerator
+from py_template_engine.ParallelEach import ParallelEach
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+
+class TestRenderBytes(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_bytes_match_encoded_str(self):
+        """Test that render_bytes() returns the UTF-8 encoding of render()."""
+        template = (
+            "<p>Grüße {{user.name}}</p>{{#EACH items AS item}}<li>{{item}} €</li>{{/EACH}}"
+            "{{#IF flag}}✓{{#ELSE}}✗{{/IF}}{{missing}}{{now()}}"
+        )
+        context = {"user": {"name": "Zoë"}, "items": [1, "ß"], "flag": True, "now": lambda: 7}
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend)
+            expected = engine.render(**context).encode("utf-8")
+            self.assertEqual(engine.render_bytes(**context), expected)
+
+    def test_buffers_can_be_written(self):
+        """Test that render_buffers() returns bytes for writelines()."""
+        engine = TemplateEngine(template_string="a{{b}}c")
+        buffers = engine.render_buffers(b="–")
+        self.assertTrue(all(type(buffer) is bytes for buffer in buffers))
+        out = io.BytesIO()
+        out.writelines(buffers)
+        self.assertEqual(out.getvalue(), "a–c".encode("utf-8"))
+
+    def test_text_is_encoded_at_compile_time(self):
+        """Test that static text is emitted as bytes constants."""
+        engine = TemplateEngine(template_string="<h1>é</h1>{{title}}")
+        source, _ = CodeGenerator("render", "utf-8").generate(engine._nodes)
+        self.assertIn(repr("<h1>é</h1>".encode("utf-8")), source)
+        self.assertIn("return _out", source)
+
+    def test_generic_nodes_are_encoded(self):
+        """Test that nodes rendered through render() are encoded as well."""
+        with ParallelEach(executor="thread", workers=2, threshold=1) as parallel:
+            engine = TemplateEngine(
+                template_string="{{#EACH items AS i}}ü{{i}}{{/EACH}}", parallel=parallel
+            )
+            self.assertEqual(engine.render_bytes(items=[1, 2]), "ü1ü2".encode("utf-8"))
+
+    def test_bound_engines(self):
+        """Test that bound values are used in bytes mode."""
+        engine = TemplateEngine(template_string="{{a}}{{b}}")
+        engine.render_bytes(a=1, b=2)
+        self.assertEqual(engine.bind(a="ä").render_bytes(b="b"), "äb".encode("utf-8"))
+
+    def test_loader_encoding(self):
+        """Test that template files are decoded with the loader's encoding."""
+        path = os.path.join(self.temp_dir, "latin.html")
+        with open(path, "wb") as f:
+            f.write("Grüße {{name}}".encode("latin-1"))
+        loader = TemplateLoader(encoding="latin-1")
+        engine = TemplateEngine(template_path=path, loader=loader)
+        self.assertEqual(engine.render_bytes(name="x"), "Grüße x".encode("utf-8"))
+        with self.assertRaises(UnicodeDecodeError):
+            TemplateEngine(template_path=path, loader=TemplateLoader())
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from py_template_engine.TemplateEngine import TemplateEngine
+
+TEMPLATE = "Dear {{name}},{{#IF items}}{{#EACH items AS item}} {{item}}{{/EACH}}{{/IF}}"
+
+
+class TestRenderMany(TestCase):
+    backend = "interpreter"
+
+    def setUp(self):
+        self.engine = TemplateEngine(template_string=TEMPLATE, backend=self.backend)
+        self.contexts = [{"name": f"user{i}", "items": list(range(i % 3))} for i in range(100)]
+        self.expected = [self.engine.render(**context) for context in self.contexts]
+
+    def test_threads_keep_order(self):
+        """Test that thread workers return results in context order."""
+        results = self.engine.render_many(self.contexts, workers=4, chunk_size=7)
+        self.assertEqual(list(results), self.expected)
+
+    def test_processes_keep_order(self):
+        """Test that process workers return results in context order."""
+        results = self.engine.render_many(
+            iter(self.contexts), workers=2, executor="process", chunk_size=16
+        )
+        self.assertEqual(list(results), self.expected)
+
+    def test_unordered(self):
+        """Test that unordered results contain every rendered context."""
+        results = self.engine.render_many(self.contexts, workers=3, ordered=False, chunk_size=5)
+        self.assertCountEqual(list(results), self.expected)
+
+    def test_stats(self):
+        """Test that the throughput stats count contexts and chunks."""
+        results = self.engine.render_many(self.contexts, workers=2, chunk_size=10)
+        list(results)
+        stats = results.stats()
+        self.assertEqual(stats["rendered"], 100)
+        self.assertEqual(stats["chunks"], 10)
+        self.assertGreater(stats["per_second"], 0)
+
+    def test_empty_contexts(self):
+        """Test that no contexts render nothing."""
+        self.assertEqual(list(self.engine.render_many([])), [])
+
+    def test_invalid_arguments(self):
+        """Test that unknown executors and empty chunks are rejected."""
+        with self.assertRaises(ValueError):
+            self.engine.render_many(self.contexts, executor="gpu")
+        with self.assertRaises(ValueError):
+            self.engine.render_many(self.contexts, chunk_size=0)
+
+
+class TestRenderManyCodegen(TestRenderMany):
+    backend = "codegen"
@@ -0,0 +1,49 @@
+import io
+from unittest import TestCase
+
+from py_template_engine.TemplateEngine import TemplateEngine
+
+
+class TestStreaming(TestCase):
+
+    def test_render_iter_matches_render(self):
+        """Test that the streamed chunks add up to the rendered template."""
+        template = "<ul>{{#EACH items AS item}}{{#IF item.on}}<li>{{item.name}}</li>{{/IF}}{{/EACH}}</ul>"
+        engine = TemplateEngine(template_string=template)
+        items = [{"on": i % 2, "name": i} for i in range(10)]
+        chunks = list(engine.render_iter(items=items))
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual("".join(chunks), engine.render(items=items))
+
+    def test_render_iter_is_lazy(self):
+        """Test that the first chunk is produced before later items are evaluated."""
+        evaluated = []
+
+        def items():
+            for i in range(3):
+                evaluated.append(i)
+                yield i
+
+        engine = TemplateEngine(template_string="<p>{{#EACH items AS i}}[{{i}}]{{/EACH}}")
+        stream = engine.render_iter(items=items())
+        self.assertEqual(next(stream), "<p>")
+        self.assertEqual(next(stream), "[0]")
+        self.assertEqual(evaluated, [0])
+
+    def test_render_to_writes_everything(self):
+        """Test that render_to writes the full output in buffered pieces."""
+
+        class Recorder(io.StringIO):
+            writes = 0
+
+            def write(self, s):
+                Recorder.writes += 1
+                return super().write(s)
+
+        engine = TemplateEngine(template_string="{{#EACH items AS i}}<td>{{i}}</td>{{/EACH}}")
+        fp = Recorder()
+        written = engine.render_to(fp, buffer_size=100, items=range(1000))
+        self.assertEqual(fp.getvalue(), engine.render(items=range(1000)))
+        self.assertEqual(written, len(fp.getvalue()))
+        self.assertGreater(Recorder.writes, 10)
+        self.assertLess(Recorder.writes, 1000)
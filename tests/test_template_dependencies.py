@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+from py_template_engine.TemplateParser import TemplateParser
+from py_template_engine.TemplateSyntaxError import TemplateSyntaxError
+
+
+class TestTemplateDependencies(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.loader = TemplateLoader()
+        self.logo = self.write("logo.html", "<img alt='{{site}}'>")
+        self.header = self.write("header.html", "<header>{{#INCLUDE " + self.logo + "}}</header>")
+        self.page = self.write("page.html", "{{#INCLUDE " + self.header + "}}<main>{{body}}</main>")
+        self.footer = self.write("footer.html", "<footer/>")
+        self.other = self.write("other.html", "{{#RENDER " + self.footer + "}}")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def engine(self, path, backend="interpreter"):
+        return TemplateEngine(template_path=path, loader=self.loader, backend=backend)
+
+    def test_includes_are_compiled_into_the_template(self):
+        """Test that rendering does not read or compile INCLUDE files again."""
+        for backend in TemplateEngine.BACKENDS:
+            engine = self.engine(self.page, backend)
+            misses = (self.loader.misses, self.loader.compiled_misses)
+            for _ in range(3):
+                self.assertEqual(
+                    engine.render(site="S", body="b"),
+                    "<header><img alt='S'></header><main>b</main>",
+                )
+            self.assertEqual((self.loader.misses, self.loader.compiled_misses), misses)
+
+    def test_live_engine_sees_changed_partials(self):
+        """Test that an engine built before a partial changed renders the new version."""
+        part = self.write("part.html", "[v1 {{n}}]")
+        main = self.write("main.html", "{{#RENDER " + part + "}}{{#INCLUDE " + part + "}}")
+        for backend in TemplateEngine.BACKENDS:
+            self.write("part.html", "[v1 {{n}}]")
+            engine = self.engine(main, backend)
+            bound = engine.bind(n=1)
+            streaming = TemplateEngine(
+                template_string="{{#INCLUDE " + part + "}}", loader=self.loader, backend=backend
+            )
+            self.assertEqual(engine.render(n=1), "[v1 1][v1 1]")
+            self.write("part.html", "[v2.0 {{n}}]")
+            self.assertEqual(engine.render(n=1), "[v2.0 1][v2.0 1]")
+            self.assertEqual(bound.render(), "[v2.0 1][v2.0 1]")
+            self.assertEqual("".join(streaming.render_iter(n=1)), "[v2.0 1]")
+
+    def test_never_invalidation_keeps_the_compiled_tree(self):
+        """Test that engines on a loader that never checks files are not recompiled."""
+        loader = TemplateLoader(invalidation="never")
+        engine = TemplateEngine(template_path=self.page, loader=loader)
+        self.write("logo.html", "changed")
+        self.assertEqual(engine.render(site="S", body=""), "<header><img alt='S'></header><main></main>")
+
+    def test_dependencies_are_listed(self):
+        """Test that the graph lists what a template uses and what uses a file."""
+        self.engine(self.page)
+        self.engine(self.other)
+        self.assertEqual(self.engine(self.page).template_dependencies(), [self.header, self.logo])
+        self.assertEqual(self.loader.dependents(self.logo), [self.header, self.page])
+        self.assertEqual(self.loader.dependencies(self.other), [self.footer])
+
+        engine = TemplateEngine(
+            template_string="{{#RENDER " + self.header + "}}", loader=self.loader
+        )
+        self.assertEqual(engine.template_dependencies(), [self.header, self.logo])
+
+    def test_change_recompiles_exactly_the_dependents(self):
+        """Test that editing a partial recompiles the templates using it, transitively."""
+        parser = TemplateParser(TemplateEngine.default_templaters(), self.loader)
+        parser.parse_file(self.page)
+        other = parser.parse_file(self.other)
+        misses = self.loader.compiled_misses
+        self.write("logo.html", "<img alt='{{site}}' class='new'>")
+
+        self.assertIs(parser.parse_file(self.other), other)
+        self.assertEqual(self.loader.compiled_misses, misses)
+        nodes = parser.parse_file(self.page)
+        self.assertEqual(self.loader.compiled_misses, misses + 3)
+        out = []
+        for node in nodes:
+            node.render({"site": "S", "body": ""}, out)
+        self.assertIn("class='new'", "".join(out))
+
+    def test_invalidate_drops_dependents(self):
+        """Test that invalidating a file drops what was compiled from its dependents."""
+        parser = TemplateParser(TemplateEngine.default_templaters(), self.loader)
+        parser.parse_file(self.page)
+        misses = self.loader.compiled_misses
+        self.loader.invalidate(self.logo)
+        parser.parse_file(self.page)
+        self.assertEqual(self.loader.compiled_misses, misses + 3)
+
+    def test_include_cycle_is_a_syntax_error(self):
+        """Test that an INCLUDE cycle fails at compile time instead of recursing."""
+        first = os.path.join(self.temp_dir, "first.html")
+        second = self.write("second.html", "{{#INCLUDE " + first + "}}")
+        self.write("first.html", "{{#INCLUDE " + second + "}}")
+        cycle = "INCLUDE cycle: .*first.html -> .*second.html -> .*first.html"
+        with self.assertRaisesRegex(TemplateSyntaxError, cycle):
+            self.engine(first)
+
+    def test_recursive_render_is_allowed(self):
+        """Test that RENDER can still render its own template."""
+        tree = os.path.join(self.temp_dir, "tree.html")
+        self.write(
+            "tree.html",
+            "{{node.name}}{{#EACH node.children AS node}}({{#RENDER " + tree + "}}){{/EACH}}",
+        )
+        leaf = {"name": "c", "children": []}
+        node = {"name": "a", "children": [{"name": "b", "children": [leaf]}]}
+        for backend in TemplateEngine.BACKENDS:
+            self.assertEqual(self.engine(tree, backend).render(node=node), "a(b(c))")
+        self.assertEqual(self.engine(tree).template_dependencies(), [])
+
+    def test_missing_include_is_resolved_on_render(self):
+        """Test that a file missing at compile time is still looked up on render."""
+        late = os.path.join(self.temp_dir, "late.html")
+        engine = TemplateEngine(template_string="{{#INCLUDE " + late + "}}", loader=self.loader)
+        self.assertEqual(engine.render(), "{{#INCLUDE " + late + "}}")
+        self.write("late.html", "here")
+        self.assertEqual(engine.render(), "here")
+        self.assertEqual(engine.template_dependencies(), [late])
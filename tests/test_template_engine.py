@@ -1,50 +1,74 @@
+import asyncio
 import os
+import pickle
 from unittest import TestCase
 
+from py_template_engine.sub_engines.IfTemplater import IfTemplater
 from py_template_engine.TemplateEngine import TemplateEngine
 
 
 class TestTemplateEngine(TestCase):
+    backend = "interpreter"
+
+    def create_engine(self, **kwargs):
+        return TemplateEngine(backend=self.backend, **kwargs)
 
     def test_variable_templating(self):
         """Test basic variable substitution."""
         template = "Hello {{name}}!"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(name="World")
         self.assertEqual(result, "Hello World!")
 
     def test_nested_variable_templating(self):
         """Test nested object variable substitution."""
         template = "Hello {{user.name}}!"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(user={"name": "Alice"})
         self.assertEqual(result, "Hello Alice!")
 
+    def test_attribute_templating(self):
+        """Test that dotted paths read attributes of objects and namedtuples."""
+        from collections import namedtuple
+        from dataclasses import dataclass
+
+        @dataclass
+        class User:
+            name: str
+            address: object
+
+        Address = namedtuple("Address", ["city"])
+        template = "{{user.name}} lives in {{user.address.city}}{{#IF user.address.city}}!{{/IF}}"
+        engine = self.create_engine(template_string=template)
+        result = engine.render(user=User("Alice", Address("Paris")))
+        self.assertEqual(result, "Alice lives in Paris!")
+        self.assertEqual(engine.render(user=User("Bob", None)), "Bob lives in {{user.address.city}}")
+
     def test_function_templating(self):
         """Test function execution in templates."""
         template = "Current time: {{get_time()}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(get_time=lambda: "12:00 PM")
         self.assertEqual(result, "Current time: 12:00 PM")
 
     def test_if_templating_true(self):
         """Test IF condition when true."""
         template = "{{#IF show_message}}<p>Hello!</p>{{/IF}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(show_message=True)
         self.assertEqual(result, "<p>Hello!</p>")
 
     def test_if_templating_false(self):
         """Test IF condition when false."""
         template = "{{#IF show_message}}<p>Hello!</p>{{/IF}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(show_message=False)
         self.assertEqual(result, "")
 
     def test_if_else_templating(self):
         """Test IF-ELSE conditions."""
         template = "{{#IF logged_in}}Welcome back!{{#ELSE}}Please log in{{/IF}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
 
         result_true = engine.render(logged_in=True)
         self.assertEqual(result_true, "Welcome back!")
@@ -52,13 +76,69 @@ class TestTemplateEngine(TestCase):
         result_false = engine.render(logged_in=False)
         self.assertEqual(result_false, "Please log in")
 
+    def test_if_branch_is_trimmed_after_nested_blocks(self):
+        """Test that a branch is stripped after its nested blocks rendered, as
+        the string pipeline does."""
+        templates = [
+            "{{#IF a}}\n{{#IF b}}x{{/IF}}\n<p>y</p>\n{{/IF}}",
+            "{{#IF a}}<p>y</p>\n{{#IF b}}x{{/IF}}\n{{#ELSE}}z{{/IF}}",
+            "{{#IF a}} {{#IF b}} {{#IF c}}x{{/IF}} {{/IF}} y {{/IF}}",
+            "{{#IF b}}x{{#ELSE}}\n{{#IF a}} {{/IF}}\n{{/IF}}",
+        ]
+        for template in templates:
+            for context in ({"a": True, "b": False}, {"a": True, "b": True, "c": False}):
+                expected = IfTemplater().render(template, **context)
+                for backend in TemplateEngine.BACKENDS:
+                    engine = TemplateEngine(template_string=template, backend=backend)
+                    self.assertEqual(engine.render(**context), expected, (template, context))
+                    self.assertEqual("".join(engine.render_iter(**context)), expected)
+
+        template = "{{#IF a}}\n{{#EACH items AS i}} {{i}} {{/EACH}}\n{{name}} {{/IF}}"
+        for backend in TemplateEngine.BACKENDS:
+            engine = TemplateEngine(template_string=template, backend=backend)
+            self.assertEqual(engine.render(a=True, items=[], name=" n"), " n")
+            self.assertEqual(engine.render(a=True, items=[1], name="n"), "1 \nn")
+
+    def test_values_at_nested_if_edges_are_kept(self):
+        """Test that values reaching a branch edge through nested IFs are not stripped."""
+        cases = [
+            ("[{{#IF a}}{{#IF b}}{{name}}{{/IF}}{{/IF}}]", "[ x ]"),
+            ("{{#IF a}}{{#IF a}}{{f()}}{{/IF}}{{/IF}}a", " F a"),
+            ("{{#IF a}} {{#IF b}} {{#EACH e AS i}}-{{/EACH}} {{name}}{{/IF}} {{/IF}}|", " x |"),
+            ("{{#IF a}}{{#IF c}}x{{/IF}} {{#IF b}}{{name}} {{/IF}} {{/IF}}|", " x |"),
+        ]
+        context = {"a": True, "b": True, "c": False, "e": [], "name": " x ", "f": lambda: " F "}
+        for template, expected in cases:
+            engine = self.create_engine(template_string=template)
+            self.assertEqual(engine.render(**context), expected, template)
+            self.assertEqual("".join(engine.render_iter(**context)), expected, template)
+            self.assertEqual(asyncio.run(engine.render_async(**context)), expected, template)
+
+    def test_trimmed_if_survives_pickling(self):
+        """Test that a node tree with trimmed IF branches renders after pickling."""
+        template = "{{#EACH xs AS x}}{{#IF x}}{{#IF x}}<{{x}}>{{/IF}} {{/IF}}{{/EACH}}"
+        engine = TemplateEngine(template_string=template)
+        engine._nodes = pickle.loads(pickle.dumps(engine._nodes))
+        self.assertEqual(engine.render(xs=[1, 0, 2]), "<1><2>")
+
     def test_each_templating(self):
         """Test EACH loop templating."""
         template = "{{#EACH items AS item}}<li>{{item}}</li>{{/EACH}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(items=["Apple", "Banana"])
         self.assertEqual(result, "<li>Apple</li><li>Banana</li>")
 
+    def test_each_restores_shadowed_variable(self):
+        """Test that a loop variable shadows an outer value only inside the loop."""
+        template = "{{item}}:{{#EACH items AS item}}{{item}}{{#INCLUDE missing.html}}{{/EACH}}:{{item}}"
+        engine = self.create_engine(template_string=template)
+        context = {"item": "outer", "items": ["a", "b"]}
+        result = engine.render(**context)
+        self.assertEqual(
+            result, "outer:a{{#INCLUDE missing.html}}b{{#INCLUDE missing.html}}:outer"
+        )
+        self.assertEqual(context, {"item": "outer", "items": ["a", "b"]})
+
     def test_complex_template(self):
         """Test a complex template with multiple features."""
         template = """
@@ -71,7 +151,7 @@ class TestTemplateEngine(TestCase):
             <p>Please log in</p>
         {{/IF}}
         """
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
 
         result = engine.render(user={"name": "Alice", "items": ["Book", "Pen"]})
 
@@ -83,7 +163,7 @@ class TestTemplateEngine(TestCase):
     def test_complex_template_with_nested_conditions(self):
         """Test a complex template with nested IF conditions in EACH loop."""
         template = """{{#EACH user.items AS item}}{{#IF item.name}}<p>Item: {{item.name}}</p>{{#ELSE}}<p>No item name</p>{{/IF}}{{/EACH}}"""
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render(user={"items": [{"name": "Book"}, {"name": ""}]})
         self.assertEqual(result, "<p>Item: Book</p><p>No item name</p>")
 
@@ -98,7 +178,7 @@ class TestTemplateEngine(TestCase):
 
         try:
             template = f"{{{{#INCLUDE {temp_file_path}}}}}"
-            engine = TemplateEngine(template_string=template)
+            engine = self.create_engine(template_string=template)
             result = engine.render()
             self.assertEqual(result, "<header>Welcome!</header>")
         finally:
@@ -116,7 +196,7 @@ class TestTemplateEngine(TestCase):
 
         try:
             template = f"{{{{#RENDER {temp_template_path}}}}}"
-            engine = TemplateEngine(template_string=template)
+            engine = self.create_engine(template_string=template)
             result = engine.render(name="World")
             self.assertEqual(result, "Hello World!")
         finally:
@@ -126,7 +206,7 @@ class TestTemplateEngine(TestCase):
     def test_nested_object_functions(self):
         """Test nested object function calls."""
         template = "Time: {{utils.get_time()}}"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
 
         utils = {"get_time": lambda: "14:30"}
 
@@ -136,7 +216,7 @@ class TestTemplateEngine(TestCase):
     def test_empty_template(self):
         """Test rendering template with minimal content."""
         template = " "  # Minimal whitespace content
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render()
         self.assertEqual(result, " ")
 
@@ -144,15 +224,24 @@ class TestTemplateEngine(TestCase):
         """Test that TemplateEngine constructor validates input properly."""
         # Test that empty string raises ValueError
         with self.assertRaises(ValueError):
-            TemplateEngine(template_string="")
+            self.create_engine(template_string="")
 
         # Test that None values raise ValueError
         with self.assertRaises(ValueError):
-            TemplateEngine()
+            self.create_engine()
 
     def test_template_with_no_directives(self):
         """Test template with just plain text."""
         template = "<h1>Static Content</h1>"
-        engine = TemplateEngine(template_string=template)
+        engine = self.create_engine(template_string=template)
         result = engine.render()
         self.assertEqual(result, "<h1>Static Content</h1>")
+
+
+class TestTemplateEngineCodegen(TestTemplateEngine):
+    backend = "codegen"
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            TemplateEngine(template_string="x", backend="jit")
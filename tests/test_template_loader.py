@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateLoader import TemplateLoader
+
+
+class TestTemplateLoader(TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.header = self.write("header.html", "<h1>{{title}}</h1>")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content, mtime=None):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_source_is_cached(self):
+        """Test that a file is read once and then served from the cache."""
+        loader = TemplateLoader()
+        self.assertEqual(loader.get_source(self.header), "<h1>{{title}}</h1>")
+        self.assertEqual(loader.get_source(self.header), "<h1>{{title}}</h1>")
+        self.assertEqual((loader.hits, loader.misses), (1, 1))
+
+    def test_mtime_invalidation(self):
+        """Test that a changed file is reloaded with mtime invalidation."""
+        loader = TemplateLoader(invalidation="mtime")
+        loader.get_source(self.header)
+        self.write("header.html", "<h2>changed</h2>", mtime=time.time() + 10)
+        self.assertEqual(loader.get_source(self.header), "<h2>changed</h2>")
+        self.assertEqual(loader.invalidations, 1)
+
+    def test_never_invalidation(self):
+        """Test that a cached file is kept with invalidation disabled."""
+        loader = TemplateLoader(invalidation="never")
+        loader.get_source(self.header)
+        self.write("header.html", "<h2>changed</h2>", mtime=time.time() + 10)
+        self.assertEqual(loader.get_source(self.header), "<h1>{{title}}</h1>")
+
+        loader.invalidate(self.header)
+        self.assertEqual(loader.get_source(self.header), "<h2>changed</h2>")
+
+    def test_interval_invalidation(self):
+        """Test that files are only checked once per interval."""
+        loader = TemplateLoader(invalidation="interval", check_interval=60)
+        loader.get_source(self.header)
+        self.write("header.html", "<h2>changed</h2>", mtime=time.time() + 10)
+        self.assertEqual(loader.get_source(self.header), "<h1>{{title}}</h1>")
+
+        loader.check_interval = 0
+        self.assertEqual(loader.get_source(self.header), "<h2>changed</h2>")
+
+    def test_unchanged_content_keeps_compiled(self):
+        """Test that touching a file without changing it keeps its compiled form."""
+        loader = TemplateLoader()
+        compiled = loader.get_compiled(self.header, "key", lambda source: [source])
+        os.utime(self.header, (time.time() + 10, time.time() + 10))
+        self.assertIs(loader.get_compiled(self.header, "key", lambda source: [source]), compiled)
+        self.assertEqual(loader.compiled_misses, 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used file is evicted first."""
+        loader = TemplateLoader(max_size=2)
+        footer = self.write("footer.html", "footer")
+        nav = self.write("nav.html", "nav")
+        loader.get_source(self.header)
+        loader.get_source(footer)
+        loader.get_source(self.header)
+        loader.get_source(nav)
+        self.assertEqual(loader.evictions, 1)
+
+        loader.get_source(self.header)
+        self.assertEqual(loader.misses, 3)
+
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            TemplateLoader().get_source(os.path.join(self.temp_dir, "missing.html"))
+
+    def test_unknown_invalidation(self):
+        """Test that an unknown invalidation mode is rejected."""
+        with self.assertRaises(ValueError):
+            TemplateLoader(invalidation="sometimes")
+
+    def test_render_inside_each_reads_file_once(self):
+        """Test that a RENDER inside an EACH is read and compiled once."""
+        loader = TemplateLoader()
+        engine = TemplateEngine(
+            template_string=f"{{{{#EACH rows AS title}}}}{{{{#RENDER {self.header}}}}}{{{{/EACH}}}}",
+            loader=loader,
+        )
+        result = engine.render(rows=["a", "b", "c"])
+        self.assertEqual(result, "<h1>a</h1><h1>b</h1><h1>c</h1>")
+        self.assertEqual(loader.misses, 1)
+        self.assertEqual(loader.compiled_misses, 1)
@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+from py_template_engine.nodes import EachNode, FunctionNode, IfNode, TextNode, VariableNode
+from py_template_engine.sub_engines.EachTemplater import EachTemplater
+from py_template_engine.sub_engines.FunctionTemplater import FunctionTemplater
+from py_template_engine.sub_engines.IfTemplater import IfTemplater
+from py_template_engine.sub_engines.VariableTemplater import VariableTemplater
+from py_template_engine.TemplateEngine import TemplateEngine
+from py_template_engine.TemplateParser import TemplateParser
+from py_template_engine.TemplateSyntaxError import TemplateSyntaxError
+
+
+class TestTemplateParser(TestCase):
+
+    def setUp(self):
+        self.parser = TemplateParser(
+            [EachTemplater(), IfTemplater(), FunctionTemplater(), VariableTemplater()]
+        )
+
+    def test_parse_node_types(self):
+        """Test that every tag is turned into the matching node."""
+        nodes = self.parser.parse(
+            "Hi {{name}} {{now()}}{{#IF a}}x{{/IF}}{{#EACH xs AS x}}{{x}}{{/EACH}}"
+        )
+        self.assertEqual(
+            [type(node) for node in nodes],
+            [TextNode, VariableNode, TextNode, FunctionNode, IfNode, EachNode],
+        )
+
+    def test_parse_if_else_branches(self):
+        """Test that IF branches are split at ELSE and stripped."""
+        (node,) = self.parser.parse("{{#IF a}} yes {{#ELSE}} no {{/IF}}")
+        self.assertEqual(node.body[0].text, "yes")
+        self.assertEqual(node.else_body[0].text, "no")
+
+    def test_parse_nested_each(self):
+        """Test that nested EACH blocks are matched to their own closing tag."""
+        template = "{{#EACH rows AS row}}[{{#EACH row AS cell}}{{cell}}{{/EACH}}]{{/EACH}}"
+        engine = TemplateEngine(template_string=template)
+        result = engine.render(rows=[[1, 2], [3]])
+        self.assertEqual(result, "[12][3]")
+
+    def test_render_is_repeatable(self):
+        """Test that one compiled tree renders different contexts."""
+        engine = TemplateEngine(template_string="{{#IF a}}{{b}}{{#ELSE}}-{{/IF}}")
+        self.assertEqual(engine.render(a=True, b="x"), "x")
+        self.assertEqual(engine.render(a=False), "-")
+        self.assertEqual(engine.render(a=True, b="y"), "y")
+
+    def test_removed_templater_leaves_tags(self):
+        """Test that tags of a removed templater are left untouched."""
+        engine = TemplateEngine(template_string="{{#IF a}}x{{/IF}} {{name}}")
+        engine.remove_templater(3)
+        result = engine.render(a=True, name="World")
+        self.assertEqual(result, "{{#IF a}}x{{/IF}} World")
+
+    def test_unclosed_block_raises(self):
+        """Test that an unclosed block is reported at compile time."""
+        with self.assertRaises(TemplateSyntaxError):
+            self.parser.parse("{{#IF a}}never closed")
+
+    def test_unexpected_closing_tag_raises(self):
+        """Test that a closing tag without its opening tag is reported."""
+        with self.assertRaises(TemplateSyntaxError):
+            self.parser.parse("{{#EACH xs AS x}}{{/IF}}{{/EACH}}")
+
+    def test_missing_list_leaves_block(self):
+        """Test that an EACH over a missing list is left as is."""
+        engine = TemplateEngine(template_string="{{#EACH xs AS x}}{{x}}{{/EACH}}")
+        self.assertEqual(engine.render(), "{{#EACH xs AS x}}{{x}}{{/EACH}}")